@@ -1,13 +1,75 @@
-from flask import Flask, render_template, request, jsonify
-from free_lead_verification import verify_lead
-from datetime import datetime
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from datetime import datetime, timezone
+import csv
+import hashlib
+import io
 import json
 import os
+import sys
+
+# Verification code and shared infrastructure live in free_api
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "free_api"))
+from free_lead_verification import verify_lead
+from verification_store import VerificationStore
+from job_store import JobStore
+from batch_jobs import BatchJobRunner
 
 app = Flask(__name__)
 
-# In-memory storage for verifications (replace with database in production)
-verifications = []
+# Verifications are stored in SQLite (VERIFICATION_DB_PATH), shared by all workers
+store = VerificationStore()
+
+# Page size for /api/history when no limit is given, and the most a client may ask for
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 500
+
+LEAD_FIELDS = ('first_name', 'last_name', 'phone', 'email')
+
+# How long a job event stream waits for new results before checking the job again,
+# and how often an idle stream sends a keep-alive comment
+JOB_EVENTS_POLL_SECONDS = 0.5
+JOB_EVENTS_KEEPALIVE_SECONDS = 15
+
+# A job that makes no progress for this long is assumed orphaned (e.g. its process
+# restarted), and its event stream ends with a "stalled" event instead of waiting forever
+JOB_EVENTS_MAX_IDLE_SECONDS = float(os.getenv('JOB_EVENTS_MAX_IDLE_SECONDS', '600'))
+
+def verification_status(result):
+    """
+    History status for a verification result. Leads whose only problems are
+    checks that timed out or hit a provider with an open circuit are 'risky'
+    rather than 'invalid'; their details list the missing checks and
+    unavailable providers so they can be verified again.
+    """
+    if result['phone_valid'] and result['email_valid'] and result['risk_score'] < 0.5:
+        return 'valid'
+    incomplete = {'provider_unavailable', 'checks_timed_out'}
+    if result['risk_factors'] and set(result['risk_factors']) <= incomplete:
+        return 'risky'
+    return 'invalid'
+
+def record_verification(data, result):
+    """Store a verification in the history and return the stored record"""
+    verification = {
+        'first_name': data['first_name'],
+        'last_name': data['last_name'],
+        'email': data['email'],
+        'phone': data['phone'],
+        'status': verification_status(result),
+        'risk_score': result['risk_score'],
+        'timestamp': datetime.now().isoformat(),
+        'details': result
+    }
+    return store.add(verification)
+
+def verify_batch_lead(lead, verifier):
+    """Verify one lead of a batch job and record it in the history"""
+    result = verify_lead(lead['first_name'], lead['last_name'], lead['phone'], lead['email'], verifier)
+    return record_verification(lead, result)
+
+# Batch jobs are tracked in the same database and processed in the background
+jobs = JobStore()
+job_runner = BatchJobRunner(jobs, verify_batch_lead, lambda verification: verification['status'] == 'valid')
 
 @app.route('/')
 def index():
@@ -23,49 +85,185 @@ def api_verify():
     result = verify_lead(data['first_name'], data['last_name'], data['phone'], data['email'])
     
     # Store verification result
-    verification = {
-        'id': len(verifications) + 1,
-        'first_name': data['first_name'],
-        'last_name': data['last_name'],
-        'email': data['email'],
-        'phone': data['phone'],
-        'status': 'valid' if result['phone_valid'] and result['email_valid'] and result['risk_score'] < 0.5 else 'invalid',
-        'risk_score': result['risk_score'],
-        'timestamp': datetime.now().isoformat(),
-        'details': result
-    }
-    verifications.append(verification)
+    record_verification(data, result)
     
     return jsonify(result)
 
+def _read_batch_leads():
+    """
+    Leads from a batch request: a CSV upload in the "file" field, or a JSON
+    array of objects. Returns (leads, error message).
+    """
+    if 'file' in request.files:
+        stream = io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig', newline='')
+        leads = list(csv.DictReader(stream))
+    else:
+        leads = request.get_json(silent=True)
+        if not isinstance(leads, list):
+            return None, 'Send a CSV file upload or a JSON array of leads'
+    
+    if not leads:
+        return None, 'No leads to verify'
+    for index, lead in enumerate(leads):
+        missing = [field for field in LEAD_FIELDS if not isinstance(lead, dict) or not lead.get(field)]
+        if missing:
+            return None, f"Lead {index + 1} is missing {', '.join(missing)}"
+    
+    return [{field: str(lead[field]).strip() for field in LEAD_FIELDS} for lead in leads], None
+
+@app.route('/api/verify/batch', methods=['POST'])
+def api_verify_batch():
+    """Start a background job verifying many leads and return its id"""
+    leads, error = _read_batch_leads()
+    if error:
+        return jsonify({'error': error}), 400
+    
+    job_id = job_runner.submit(leads)
+    return jsonify({'job_id': job_id, 'total': len(leads), 'status_url': f'/api/jobs/{job_id}'}), 202
+
+@app.route('/api/jobs/<job_id>')
+def api_job(job_id):
+    """
+    Progress, throughput and results so far for a batch job.
+    
+    Results are paged in completion order: pass after=<next_cursor> to
+    fetch the ones that arrived since the previous response.
+    """
+    job = jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    try:
+        after = int(request.args.get('after', 0))
+        limit = min(int(request.args.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'error': 'limit and after must be integers'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    
+    results = jobs.get_results(job_id, after, limit)
+    job['results'] = results
+    job['next_cursor'] = results[-1]['seq'] if results else after
+    return jsonify(job)
+
 @app.route('/api/history')
 def api_history():
+    """
+    Verifications, newest first, one page at a time.
+    
+    Query parameters: search, status, limit (page size), after (the
+    next_cursor of the previous page) and fields (comma-separated columns,
+    e.g. to leave out details). Responses carry an ETag and Last-Modified,
+    and a request whose If-None-Match still matches the ETag is answered
+    with 304. If-Modified-Since alone is not trusted: Last-Modified only has
+    one-second resolution, so a change in the same second would go unseen.
+    """
     search = request.args.get('search', '').lower()
     status = request.args.get('status', '')
+    fields = [field for field in request.args.get('fields', '').split(',') if field] or None
+    try:
+        limit = min(int(request.args.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE)
+        after = int(request.args['after']) if request.args.get('after') else None
+    except ValueError:
+        return jsonify({'error': 'limit and after must be integers'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
     
-    filtered = verifications
+    # Any change to the history bumps its version, so it identifies every page
+    state = store.state()
+    etag = hashlib.sha1(f"{state['version']}|{request.query_string.decode()}".encode()).hexdigest()
+    last_modified = datetime.fromtimestamp(state['modified_at'], timezone.utc)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        try:
+            verifications = store.search(search, status, limit + 1, after, fields, newest_first=True)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        response = jsonify({
+            'verifications': verifications[:limit],
+            'total': state['count'],
+            'next_cursor': verifications[limit - 1]['id'] if len(verifications) > limit else None
+        })
     
-    if search:
-        filtered = [v for v in filtered if 
-                   search in v['first_name'].lower() or 
-                   search in v['last_name'].lower() or 
-                   search in v['email'].lower() or 
-                   search in v['phone']]
-    
-    if status:
-        filtered = [v for v in filtered if v['status'] == status]
-    
-    return jsonify({
-        'verifications': filtered,
-        'total': len(verifications)
-    })
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/history/<int:id>')
 def api_history_detail(id):
-    verification = next((v for v in verifications if v['id'] == id), None)
+    verification = store.get(id)
     if verification:
         return jsonify(verification)
     return jsonify({'error': 'Verification not found'}), 404
 
+def _sse(event, data, event_id=None):
+    """Format one Server-Sent Event"""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+@app.route('/api/jobs/<job_id>/events')
+def api_job_events(job_id):
+    """
+    Server-Sent Events stream of a batch job's results as they complete.
+    
+    Each verified or flagged lead is sent as a "result" event whose id is its
+    seq, followed by a final "summary" event once the job has finished. A
+    job that stays queued or running without progress for
+    JOB_EVENTS_MAX_IDLE_SECONDS ends the stream with a "stalled" event
+    carrying the job instead. A reconnecting client sends Last-Event-ID (or
+    ?last_event_id=) and only receives results after that one.
+    """
+    if jobs.get_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0)
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID must be an integer'}), 400
+    
+    def stream(last_seq):
+        yield "retry: 2000\n\n"
+        idle = 0.0
+        # Time without the job changing status or finishing a lead
+        stalled = 0.0
+        progress = None
+        while True:
+            # Read the job before its results, so a finished job's results are all seen
+            job = jobs.get_job(job_id)
+            finished = job['status'] in ('completed', 'failed')
+            if finished:
+                results = jobs.get_results(job_id, last_seq, HISTORY_MAX_PAGE_SIZE)
+            else:
+                results = jobs.wait_for_results(job_id, last_seq, JOB_EVENTS_POLL_SECONDS, HISTORY_MAX_PAGE_SIZE)
+            for result in results:
+                last_seq = result['seq']
+                yield _sse('result', result, last_seq)
+            
+            if results:
+                idle = 0.0
+            elif finished:
+                yield _sse('summary', job)
+                return
+            else:
+                if (job['status'], job['processed']) != progress:
+                    progress = (job['status'], job['processed'])
+                    stalled = 0.0
+                else:
+                    stalled += JOB_EVENTS_POLL_SECONDS
+                    if stalled >= JOB_EVENTS_MAX_IDLE_SECONDS:
+                        yield _sse('stalled', job)
+                        return
+                idle += JOB_EVENTS_POLL_SECONDS
+                if idle >= JOB_EVENTS_KEEPALIVE_SECONDS:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+    
+    return Response(stream_with_context(stream(last_seq)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
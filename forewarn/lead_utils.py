@@ -1,43 +1,88 @@
 import csv
+import glob
 import json
 import os
+from collections import deque
+from itertools import islice
 import pandas as pd
-from lead_verification import process_new_leads, save_leads_to_json
+from lead_verification import iter_verified_leads, lead_output_dir, process_new_leads_batch
+from lead_sink import LeadSink
+from run_journal import JOURNAL_FILENAME, RunJournal, row_key
+from verification_cache import VerificationCache
 
-def load_leads_from_csv(csv_file):
+# .xlsx workbooks larger than this are streamed instead of loaded into a DataFrame
+EXCEL_STREAM_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+# Concurrent runs verify and journal this many rows at a time
+BATCH_CHUNK_SIZE = 500
+
+def detect_lead_columns(headers):
     """
-    Load leads from a CSV file.
-    CSV should have columns for name and phone number.
+    Pick the name and phone columns from a header row.
+    
+    Falls back to the first and second columns when no header mentions
+    "name" or "phone".
+    
+    Returns:
+        A tuple (name_col, phone_col)
+    """
+    name_col = next((col for col in headers if 'name' in str(col).lower()), headers[0])
+    phone_col = next((col for col in headers if 'phone' in str(col).lower()), headers[1])
+    return name_col, phone_col
+
+def iter_leads_from_csv(csv_file):
+    """
+    Stream leads from a CSV file one row at a time.
+    
+    Columns are detected once from the header, and only one row is held in
+    memory, so files of any size can be fed straight into verification.
     
     Args:
         csv_file: Path to CSV file with leads data
         
-    Returns:
-        A list of tuples (name, phone)
+    Yields:
+        Tuples (name, phone)
     """
-    leads = []
-    
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file)
+    with open(csv_file, 'r', newline='') as file:
+        reader = csv.reader(file)
+        headers = next(reader, None)
+        if not headers:
+            return
         
-        # Try to detect name and phone columns
-        headers = reader.fieldnames
-        name_col = next((col for col in headers if 'name' in col.lower()), headers[0])
-        phone_col = next((col for col in headers if 'phone' in col.lower()), headers[1])
+        name_col, phone_col = detect_lead_columns(headers)
+        name_idx = headers.index(name_col)
+        phone_idx = headers.index(phone_col)
+        width = max(name_idx, phone_idx)
         
         for row in reader:
-            name = row[name_col].strip()
-            phone = row[phone_col].strip()
+            if len(row) <= width:
+                continue
+            name = row[name_idx].strip()
+            phone = row[phone_idx].strip()
             
             if name and phone:  # Skip empty entries
-                leads.append((name, phone))
+                yield (name, phone)
+
+def load_leads_from_csv(csv_file):
+    """
+    Load leads from a CSV file.
+    CSV should have columns for name and phone number.
     
-    return leads
+    Args:
+        csv_file: Path to CSV file with leads data
+        
+    Returns:
+        A list of tuples (name, phone)
+    """
+    return list(iter_leads_from_csv(csv_file))
 
 def load_leads_from_excel(excel_file, sheet_name=0):
     """
     Load leads from an Excel file.
     
+    Only the detected name and phone columns are read, and cleaning is done
+    on whole columns at once rather than row by row.
+    
     Args:
         excel_file: Path to Excel file with leads data
         sheet_name: Sheet name or index (default is first sheet)
@@ -45,73 +90,229 @@ def load_leads_from_excel(excel_file, sheet_name=0):
     Returns:
         A list of tuples (name, phone)
     """
-    # Read Excel file
-    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    # Read just the header row to detect name and phone columns
+    headers = list(pd.read_excel(excel_file, sheet_name=sheet_name, nrows=0).columns)
+    name_col, phone_col = detect_lead_columns(headers)
     
-    # Try to detect name and phone columns
-    headers = df.columns
-    name_col = next((col for col in headers if 'name' in str(col).lower()), headers[0])
-    phone_col = next((col for col in headers if 'phone' in str(col).lower()), headers[1])
+    # Read only those two columns, as text
+    df = pd.read_excel(excel_file, sheet_name=sheet_name, usecols=[name_col, phone_col], dtype=str)
+    names = df[name_col].str.strip()
+    phones = df[phone_col].str.strip()
     
-    # Convert to list of tuples
-    leads = []
-    for _, row in df.iterrows():
-        name = str(row[name_col]).strip()
-        phone = str(row[phone_col]).strip()
+    # Skip empty entries
+    keep = names.notna() & phones.notna() & (names != "") & (phones != "") & (names != "nan") & (phones != "nan")
+    return list(zip(names[keep].tolist(), phones[keep].tolist()))
+
+def _excel_cell_text(value):
+    """Render a cell value the way pandas would read it as text"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def iter_leads_from_excel(excel_file, sheet_name=0):
+    """
+    Stream leads from an .xlsx workbook without loading it into a DataFrame.
+    
+    Uses openpyxl's read-only mode, which keeps memory flat for workbooks too
+    large to hold in memory.
+    
+    Args:
+        excel_file: Path to .xlsx file with leads data
+        sheet_name: Sheet name or index (default is first sheet)
         
-        if name and phone and name != "nan" and phone != "nan":  # Skip empty entries
-            leads.append((name, phone))
+    Yields:
+        Tuples (name, phone)
+    """
+    from openpyxl import load_workbook
     
-    return leads
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers:
+            return
+        
+        headers = list(headers)
+        name_col, phone_col = detect_lead_columns(headers)
+        name_idx = headers.index(name_col)
+        phone_idx = headers.index(phone_col)
+        width = max(name_idx, phone_idx)
+        
+        for row in rows:
+            if len(row) <= width:
+                continue
+            name = _excel_cell_text(row[name_idx])
+            phone = _excel_cell_text(row[phone_idx])
+            
+            if name and phone:  # Skip empty entries
+                yield (name, phone)
+    finally:
+        workbook.close()
+
+def _pending_leads(leads, journal, keys):
+    """Yield leads the journal has not seen, queueing each row's key in keys"""
+    for index, lead in enumerate(leads):
+        key = row_key(index, *lead)
+        if not journal.is_done(key):
+            keys.append(key)
+            yield lead
 
-def process_leads_file(input_file, output_dir=None, use_date_folder=True):
+def _resume_output_dir(output_dir, use_date_folder):
     """
-    Process leads from a file (CSV or Excel) and save results as JSON.
+    Output directory of the interrupted run to resume.
+    
+    With use_date_folder the run may have started on an earlier day, so the
+    most recent dated folder holding a run journal is used.
+    
+    Raises:
+        FileNotFoundError: If there is no interrupted run to resume
+    """
+    if use_date_folder:
+        journals = glob.glob(os.path.join(glob.escape(output_dir), "leads_*", JOURNAL_FILENAME))
+        if journals:
+            # Folders are named leads_YYYY-MM-DD, so the latest sorts last
+            return os.path.dirname(max(journals))
+    elif os.path.exists(os.path.join(output_dir, JOURNAL_FILENAME)):
+        return output_dir
+    raise FileNotFoundError(f"No interrupted run to resume in {output_dir}")
+
+def process_leads_file(input_file, output_dir=None, use_date_folder=True, max_workers=1, cache=None,
+                       compress=False, resume=False):
+    """
+    Process leads from a file (CSV or Excel) and save results as JSON Lines.
+    
+    Finished rows are recorded in a run journal next to the output. With
+    resume, rows an interrupted run already verified are skipped and their
+    results carried over. Resume with the same output options so the journal
+    is found; with use_date_folder, the latest dated folder that has one is
+    continued, even if it is from an earlier day. Resuming when there is no
+    journal raises FileNotFoundError rather than starting over. Leads that
+    could not be checked because Forewarn was unavailable are left out of
+    both files, and the journal is kept so a resumed run verifies them.
     
     Args:
         input_file: Path to CSV or Excel file with leads
-        output_dir: Directory to save JSON output (optional)
+        output_dir: Directory to save JSON Lines output (optional)
         use_date_folder: Whether to create a date-based folder for output
+        max_workers: Number of leads to verify at once (1 processes sequentially)
+        cache: Optional VerificationCache used to skip repeat lookups
+        compress: Whether to gzip the output files
+        resume: Whether to continue an interrupted run
         
     Returns:
-        Paths to the saved JSON files
+        Paths to the saved JSON Lines files
     """
-    # Determine file type and load leads
+    # Determine file type; CSV rows are streamed straight into verification
     if input_file.lower().endswith('.csv'):
-        leads = load_leads_from_csv(input_file)
+        leads = iter_leads_from_csv(input_file)
+    elif input_file.lower().endswith('.xlsx') and os.path.getsize(input_file) > EXCEL_STREAM_THRESHOLD_BYTES:
+        leads = iter_leads_from_excel(input_file)
     elif input_file.lower().endswith(('.xlsx', '.xls')):
         leads = load_leads_from_excel(input_file)
+        print(f"Loaded {len(leads)} leads from {input_file}")
     else:
         raise ValueError(f"Unsupported file format: {input_file}")
     
-    print(f"Loaded {len(leads)} leads from {input_file}")
-    
-    # Process the leads
-    verified, flagged = process_new_leads(leads)
-    
     # Generate output directory name based on input file if not specified
     if output_dir is None:
         base_name = os.path.splitext(os.path.basename(input_file))[0]
         output_dir = f"results_{base_name}"
+    if resume:
+        output_dir = _resume_output_dir(output_dir, use_date_folder)
+    else:
+        output_dir = lead_output_dir(output_dir, use_date_folder)
+    
+    journal = RunJournal(os.path.join(output_dir, JOURNAL_FILENAME), resume)
+    keys = deque()
+    pending = _pending_leads(leads, journal, keys)
+    processed = 0
+    # Leads Forewarn was unavailable for are left out of the output and the journal
+    unavailable = 0
     
-    # Save to JSON
-    return save_leads_to_json(verified, flagged, output_dir, use_date_folder)
+    try:
+        # Write each result as soon as it is verified instead of collecting them
+        with LeadSink(output_dir, compress) as sink:
+            for record, verified in journal.replay():
+                sink.add(record, verified)
+            if journal.resumed:
+                print(f"Resuming: {journal.resumed} leads already verified")
+            
+            if max_workers > 1:
+                while True:
+                    chunk = list(islice(pending, BATCH_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    verified_leads, _, summary = process_new_leads_batch(chunk, max_workers, cache)
+                    verified_set = set(verified_leads)
+                    unavailable_set = set(summary["unavailable"])
+                    for name, phone_number in chunk:
+                        key = keys.popleft()
+                        if (name, phone_number) in unavailable_set:
+                            unavailable += 1
+                            continue
+                        record = {"name": name, "phone": phone_number}
+                        verified = (name, phone_number) in verified_set
+                        sink.add(record, verified)
+                        journal.record(key, record, verified)
+                    processed += len(chunk)
+            else:
+                for name, phone_number, verified in iter_verified_leads(pending, cache):
+                    key = keys.popleft()
+                    processed += 1
+                    if verified is None:
+                        unavailable += 1
+                        continue
+                    record = {"name": name, "phone": phone_number}
+                    sink.add(record, verified)
+                    journal.record(key, record, verified)
+        
+        # Output is finalized, so the journal is no longer needed unless leads are left to retry
+        journal.close(remove=not unavailable)
+    finally:
+        journal.close()
+    
+    print(f"Processed {processed} leads from {input_file}")
+    if unavailable:
+        print(f"{unavailable} leads were not checked because Forewarn was unavailable; "
+              f"run again with --resume to verify them")
+    print(f"\nSaved verified leads to {sink.verified_path}")
+    print(f"Saved flagged leads to {sink.flagged_path}")
+    
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache hits: {stats['hits']}, misses: {stats['misses']}")
+    
+    return sink.verified_path, sink.flagged_path
 
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Process leads from a CSV or Excel file")
     parser.add_argument("input_file", help="Path to CSV or Excel file with leads data")
-    parser.add_argument("--output", "-o", help="Output directory for JSON files", default=None)
+    parser.add_argument("--output", "-o", help="Output directory for JSON Lines files", default=None)
     parser.add_argument("--no-date-folder", action="store_true", help="Don't create date-based folder")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Number of leads to verify concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the verification result cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="Ignore cached results and store fresh ones")
+    parser.add_argument("--gzip", action="store_true", help="Compress the output files")
+    parser.add_argument("--resume", action="store_true", help="Skip leads finished by an interrupted run")
     
     args = parser.parse_args()
     
+    cache = VerificationCache(bypass=args.no_cache, refresh=args.refresh_cache)
+    
     try:
         verified_path, flagged_path = process_leads_file(
             args.input_file, 
             args.output, 
-            not args.no_date_folder
+            not args.no_date_folder,
+            args.workers,
+            cache,
+            args.gzip,
+            args.resume
         )
         print(f"\nProcessing complete!")
         print(f"Verified leads: {verified_path}")
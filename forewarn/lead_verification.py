@@ -1,9 +1,19 @@
 import requests
 import json
 import os
+import sys
 import datetime
+from collections import OrderedDict
 from dotenv import load_dotenv
 
+# Shared provider infrastructure lives alongside the free API implementation
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "free_api"))
+from http_client import http_client
+from circuit_breaker import CircuitOpenError
+from batch_runner import run_batch
+from batch_planner import identity_key
+from lead_sink import LeadSink
+
 # Load environment variables from .env file if it exists
 load_dotenv()
 
@@ -15,10 +25,13 @@ API_KEY = os.getenv("FOREWARN_API_KEY", "your_forewarn_api_key")
 MOCK_API_URL = "http://localhost:5000/verify"
 REAL_API_URL = os.getenv("FOREWARN_API_URL", "https://api.forewarn.com/verify")  # Replace when you get the real URL
 
-def verify_lead(name, phone_number):
+# Distinct leads whose outcome iter_verified_leads keeps for repeated rows
+DEDUPE_WINDOW = int(os.getenv("FOREWARN_DEDUPE_WINDOW", "10000"))
+
+def _request_verification(name, phone_number):
     """
-    Verify a lead's name and phone number using either the real Forewarn API or mock API.
-    Returns True if valid, False if mismatched or fake.
+    Send a verification request to the Forewarn API (real or mock).
+    Returns the parsed API response; raises on HTTP or connection errors.
     """
     headers = {
         "Content-Type": "application/json"
@@ -37,13 +50,30 @@ def verify_lead(name, phone_number):
     # Select the appropriate API URL
     api_url = MOCK_API_URL if USE_MOCK_API else REAL_API_URL
     
+    # Send request to API
+    response = http_client.post("forewarn", api_url, headers=headers, data=json.dumps(payload))
+    response.raise_for_status()  # Raise an error for bad status codes
+    
+    # Parse the API response
+    return response.json()
+
+def verify_lead(name, phone_number, cache=None):
+    """
+    Verify a lead's name and phone number using either the real Forewarn API or mock API.
+    Returns True if valid, False if mismatched or fake, and None if Forewarn's
+    circuit is open, so the lead is neither verified nor flagged and can be
+    verified again later.
+    
+    Args:
+        name: Lead's full name
+        phone_number: Lead's phone number
+        cache: Optional VerificationCache; successful responses are reused
+    """
     try:
-        # Send request to API
-        response = requests.post(api_url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()  # Raise an error for bad status codes
-        
-        # Parse the API response
-        result = response.json()
+        if cache is None:
+            result = _request_verification(name, phone_number)
+        else:
+            result = cache.get_or_fetch("forewarn", identity_key(name, phone_number), lambda: _request_verification(name, phone_number))
         
         # Check if name matches the phone number in API's database
         if result.get("status") == "match":
@@ -51,42 +81,134 @@ def verify_lead(name, phone_number):
         else:
             return False
             
+    except CircuitOpenError as e:
+        # Forewarn is failing or too slow; skip the call instead of flagging a good lead
+        print(f"Forewarn unavailable for lead {name}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         print(f"Error verifying lead {name}: {e}")
         return False  # Assume invalid if API fails
 
-def process_new_leads(leads):
+def iter_verified_leads(leads, cache=None, stats=None):
+    """
+    Verify leads lazily, one at a time, as they are read.
+    
+    Leads may be any iterable (for example a streaming file reader), so nothing
+    has to be loaded up front. Repeated name + phone rows are only looked up once
+    while the lead is among the last DEDUPE_WINDOW distinct leads, so memory
+    stays bounded however long the input is. Leads Forewarn was unavailable
+    for are yielded with verified None and looked up again if they repeat.
+    
+    Args:
+        leads: Iterable of tuples (name, phone_number)
+        cache: Optional VerificationCache; successful responses are reused
+        stats: Optional dict updated with "rows" and "lookups" counts as leads are verified
+        
+    Yields:
+        Tuples (name, phone_number, verified), verified being True, False or None
+    """
+    outcomes = OrderedDict()
+    if stats is None:
+        stats = {}
+    stats.update(rows=0, lookups=0)
+    
+    for name, phone_number in leads:
+        key = identity_key(name, phone_number)
+        verified = outcomes.get(key)
+        if verified is None:
+            verified = verify_lead(name, phone_number, cache)
+            stats["lookups"] += 1
+            if verified is not None:
+                outcomes[key] = verified
+                if len(outcomes) > DEDUPE_WINDOW:
+                    outcomes.popitem(last=False)
+        stats["rows"] += 1
+        yield name, phone_number, verified
+
+def process_new_leads(leads, cache=None, unavailable=None):
     """
     Process a list of new leads and flag invalid ones.
-    Leads is a list of tuples: (name, phone_number).
+    Leads is a list (or any iterable) of tuples: (name, phone_number).
+    Repeated name + phone rows are only looked up once.
+    Pass a VerificationCache to reuse earlier Forewarn results.
+    Leads that could not be checked because Forewarn was unavailable are in
+    neither list; pass a list as unavailable to collect them for a retry.
     """
     verified_leads = []
     flagged_leads = []
+    stats = {}
     
-    for name, phone_number in leads:
-        if verify_lead(name, phone_number):
+    for name, phone_number, verified in iter_verified_leads(leads, cache, stats):
+        if verified is None:
+            if unavailable is not None:
+                unavailable.append((name, phone_number))
+            print(f"Lead not checked, Forewarn unavailable: {name} - {phone_number}")
+        elif verified:
             verified_leads.append((name, phone_number))
             print(f"Lead verified: {name} - {phone_number}")
         else:
             flagged_leads.append((name, phone_number))
             print(f"Lead flagged: {name} - {phone_number}")
     
+    if stats["rows"]:
+        print(f"Looked up {stats['lookups']} distinct leads for {stats['rows']} rows "
+              f"(dedup ratio {round(1 - stats['lookups'] / stats['rows'], 3)})")
+    
     return verified_leads, flagged_leads
 
-def save_leads_to_json(verified_leads, flagged_leads, output_dir=None, use_date_folder=False):
+def process_new_leads_batch(leads, max_workers=8, cache=None):
     """
-    Save verified and flagged leads to separate JSON files.
+    Process leads with several in flight at once.
+    
+    Calls to Forewarn are additionally capped by FOREWARN_MAX_CONCURRENCY,
+    and rows sharing a name + phone are looked up once.
     
     Args:
-        verified_leads: List of tuples (name, phone) with verified leads
-        flagged_leads: List of tuples (name, phone) with flagged leads
-        output_dir: Custom directory to save files (default is current directory)
-        use_date_folder: If True, creates a date-based subfolder (YYYY-MM-DD)
+        leads: List of tuples (name, phone_number)
+        max_workers: Number of leads verified at once
+        cache: Optional VerificationCache; successful responses are reused
+        
+    Returns:
+        A tuple (verified_leads, flagged_leads, summary), with leads kept in
+        input order and summary holding throughput, latency and
+        deduplication figures. Leads Forewarn was unavailable for are in
+        neither list but in summary["unavailable"].
     """
-    # Convert tuples to dictionaries for better JSON structure
-    verified_json = [{"name": name, "phone": phone} for name, phone in verified_leads]
-    flagged_json = [{"name": name, "phone": phone} for name, phone in flagged_leads]
+    leads = list(leads)
+    
+    # Verify each distinct name + phone once and fan the outcome back out
+    unique = {}
+    for name, phone_number in leads:
+        unique.setdefault(identity_key(name, phone_number), (name, phone_number))
+    results, summary = run_batch(list(unique.values()), lambda lead: verify_lead(lead[0], lead[1], cache), max_workers)
+    outcomes = dict(zip(unique.keys(), results))
     
+    summary["dedup"] = {
+        "rows": len(leads),
+        "lookups_planned": len(unique),
+        "dedup_ratio": round(1 - len(unique) / len(leads), 3) if leads else 0.0
+    }
+    summary["connection_pool"] = http_client.pool_stats()
+    if cache is not None:
+        summary["cache"] = cache.stats()
+    
+    verified_leads = [lead for lead in leads if outcomes[identity_key(*lead)]]
+    flagged_leads = [lead for lead in leads if outcomes[identity_key(*lead)] is False]
+    summary["unavailable"] = [lead for lead in leads if outcomes[identity_key(*lead)] is None]
+    
+    print(f"Processed {len(leads)} leads ({len(unique)} distinct) in {summary['elapsed_seconds']}s "
+          f"({summary['leads_per_second']} lookups/s)")
+    
+    return verified_leads, flagged_leads, summary
+
+def lead_output_dir(output_dir=None, use_date_folder=False):
+    """
+    Resolve the directory results are written to.
+    
+    Args:
+        output_dir: Custom directory to save files (default is current directory)
+        use_date_folder: If True, uses a date-based subfolder (YYYY-MM-DD)
+    """
     # Set default output directory if none specified
     if output_dir is None:
         output_dir = "."
@@ -96,23 +218,33 @@ def save_leads_to_json(verified_leads, flagged_leads, output_dir=None, use_date_
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         output_dir = os.path.join(output_dir, f"leads_{today}")
     
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Write to JSON files
-    verified_path = os.path.join(output_dir, "verified_leads.json")
-    flagged_path = os.path.join(output_dir, "flagged_leads.json")
+    return output_dir
+
+def save_leads_to_json(verified_leads, flagged_leads, output_dir=None, use_date_folder=False, compress=False):
+    """
+    Save verified and flagged leads to separate JSON Lines files
+    (verified_leads.jsonl and flagged_leads.jsonl).
     
-    with open(verified_path, "w") as f:
-        json.dump(verified_json, f, indent=2)
+    Args:
+        verified_leads: Iterable of tuples (name, phone) with verified leads
+        flagged_leads: Iterable of tuples (name, phone) with flagged leads
+        output_dir: Custom directory to save files (default is current directory)
+        use_date_folder: If True, creates a date-based subfolder (YYYY-MM-DD)
+        compress: If True, gzip the output files
+    """
+    output_dir = lead_output_dir(output_dir, use_date_folder)
     
-    with open(flagged_path, "w") as f:
-        json.dump(flagged_json, f, indent=2)
+    # Files are written to a partial path and moved into place once complete
+    with LeadSink(output_dir, compress) as sink:
+        for name, phone in verified_leads:
+            sink.add({"name": name, "phone": phone}, True)
+        for name, phone in flagged_leads:
+            sink.add({"name": name, "phone": phone}, False)
     
-    print(f"\nSaved verified leads to {verified_path}")
-    print(f"Saved flagged leads to {flagged_path}")
+    print(f"\nSaved verified leads to {sink.verified_path}")
+    print(f"Saved flagged leads to {sink.flagged_path}")
     
-    return verified_path, flagged_path
+    return sink.verified_path, sink.flagged_path
 
 # Example usage
 if __name__ == "__main__":
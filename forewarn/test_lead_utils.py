@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from lead_utils import iter_leads_from_csv, iter_leads_from_excel, load_leads_from_csv, load_leads_from_excel, process_leads_file
+from lead_sink import read_jsonl
+from run_journal import RunJournal, row_key
+
+class TestLeadUtils(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmpdir, "leads.csv")
+        with open(self.csv_path, "w") as f:
+            f.write("source,Full Name,Phone Number,email\n")
+            f.write("Zillow,John Doe,123-456-7890,john@example.com\n")
+            f.write("Referral,,555-555-5555,\n")
+            f.write("Website, Maria Garcia ,333-222-1111,maria@example.com\n")
+            f.write("Truncated\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_streams_leads_lazily(self):
+        leads = iter_leads_from_csv(self.csv_path)
+        self.assertIsInstance(leads, types.GeneratorType)
+        self.assertEqual(next(leads), ("John Doe", "123-456-7890"))
+        self.assertEqual(list(leads), [("Maria Garcia", "333-222-1111")])
+
+    def test_load_leads_from_csv(self):
+        self.assertEqual(load_leads_from_csv(self.csv_path), [
+            ("John Doe", "123-456-7890"),
+            ("Maria Garcia", "333-222-1111")
+        ])
+
+    def test_excel_loaders_agree(self):
+        excel_path = os.path.join(self.tmpdir, "leads.xlsx")
+        pd.DataFrame({
+            "source": ["Zillow", "Referral", "Website"],
+            "Full Name": ["John Doe", None, " Maria Garcia "],
+            "Phone Number": [1234567890, 5555555555, 3332221111]
+        }).to_excel(excel_path, index=False)
+
+        expected = [("John Doe", "1234567890"), ("Maria Garcia", "3332221111")]
+        self.assertEqual(load_leads_from_excel(excel_path), expected)
+        self.assertEqual(list(iter_leads_from_excel(excel_path)), expected)
+
+    @patch('lead_verification.verify_lead', side_effect=lambda name, phone, cache=None: name == "John Doe")
+    def test_process_leads_file_writes_jsonl(self, mock_verify):
+        output_dir = os.path.join(self.tmpdir, "out")
+        verified_path, flagged_path = process_leads_file(self.csv_path, output_dir, use_date_folder=False)
+
+        self.assertEqual(list(read_jsonl(verified_path)), [{"name": "John Doe", "phone": "123-456-7890"}])
+        self.assertEqual(list(read_jsonl(flagged_path)), [{"name": "Maria Garcia", "phone": "333-222-1111"}])
+
+    def test_resume_skips_finished_leads(self):
+        output_dir = os.path.join(self.tmpdir, "out")
+        calls = []
+
+        def crash_on_second_lead(name, phone, cache=None):
+            if calls:
+                raise KeyboardInterrupt
+            calls.append(name)
+            return True
+
+        with patch('lead_verification.verify_lead', side_effect=crash_on_second_lead):
+            with self.assertRaises(KeyboardInterrupt):
+                process_leads_file(self.csv_path, output_dir, use_date_folder=False)
+
+        with patch('lead_verification.verify_lead', return_value=False) as mock_verify:
+            verified_path, flagged_path = process_leads_file(self.csv_path, output_dir, use_date_folder=False,
+                                                             resume=True)
+
+        mock_verify.assert_called_once_with("Maria Garcia", "333-222-1111", None)
+        self.assertEqual(list(read_jsonl(verified_path)), [{"name": "John Doe", "phone": "123-456-7890"}])
+        self.assertEqual(list(read_jsonl(flagged_path)), [{"name": "Maria Garcia", "phone": "333-222-1111"}])
+        self.assertFalse(os.path.exists(os.path.join(output_dir, "run_journal.jsonl")))
+
+    def test_resume_finds_an_earlier_days_run(self):
+        output_dir = os.path.join(self.tmpdir, "out")
+        for day in ("2024-01-01", "2024-01-02"):
+            journal = RunJournal(os.path.join(output_dir, f"leads_{day}", "run_journal.jsonl"))
+            journal.record(row_key(0, "John Doe", "123-456-7890"), {"name": "John Doe", "phone": "123-456-7890"}, True)
+            journal.close()
+
+        with patch('lead_verification.verify_lead', return_value=False) as mock_verify:
+            verified_path, flagged_path = process_leads_file(self.csv_path, output_dir, resume=True)
+
+        mock_verify.assert_called_once_with("Maria Garcia", "333-222-1111", None)
+        self.assertEqual(os.path.dirname(verified_path), os.path.join(output_dir, "leads_2024-01-02"))
+        self.assertEqual(list(read_jsonl(verified_path)), [{"name": "John Doe", "phone": "123-456-7890"}])
+
+    def test_resume_without_a_journal_refuses(self):
+        output_dir = os.path.join(self.tmpdir, "out")
+        for use_date_folder in (True, False):
+            with self.subTest(use_date_folder=use_date_folder), \
+                    patch('lead_verification.verify_lead') as mock_verify:
+                with self.assertRaises(FileNotFoundError):
+                    process_leads_file(self.csv_path, output_dir, use_date_folder, resume=True)
+                mock_verify.assert_not_called()
+
+    def test_leads_forewarn_was_unavailable_for_are_retried_on_resume(self):
+        output_dir = os.path.join(self.tmpdir, "out")
+        with patch('lead_verification.verify_lead', side_effect=lambda name, phone, cache=None:
+                   None if name == "Maria Garcia" else True):
+            verified_path, flagged_path = process_leads_file(self.csv_path, output_dir, use_date_folder=False)
+        self.assertEqual(list(read_jsonl(verified_path)), [{"name": "John Doe", "phone": "123-456-7890"}])
+        self.assertEqual(list(read_jsonl(flagged_path)), [])
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "run_journal.jsonl")))
+
+        with patch('lead_verification.verify_lead', return_value=False) as mock_verify:
+            verified_path, flagged_path = process_leads_file(self.csv_path, output_dir, use_date_folder=False,
+                                                             resume=True)
+        mock_verify.assert_called_once_with("Maria Garcia", "333-222-1111", None)
+        self.assertEqual(list(read_jsonl(flagged_path)), [{"name": "Maria Garcia", "phone": "333-222-1111"}])
+        self.assertFalse(os.path.exists(os.path.join(output_dir, "run_journal.jsonl")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,12 @@
 import unittest
 import json
 from unittest.mock import patch, MagicMock
-from lead_verification import verify_lead, process_new_leads
+from lead_verification import verify_lead, iter_verified_leads, process_new_leads, process_new_leads_batch
+from circuit_breaker import circuit_breakers
 
 class TestLeadVerification(unittest.TestCase):
     
-    @patch('lead_verification.requests.post')
+    @patch('lead_verification.http_client.post')
     def test_verify_lead_success(self, mock_post):
         # Mock a successful API response
         mock_response = MagicMock()
@@ -29,7 +30,7 @@ class TestLeadVerification(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
     
-    @patch('lead_verification.requests.post')
+    @patch('lead_verification.http_client.post')
     def test_verify_lead_failure(self, mock_post):
         # Mock a failed API response (non-matching lead)
         mock_response = MagicMock()
@@ -52,7 +53,7 @@ class TestLeadVerification(unittest.TestCase):
         self.assertFalse(result)
         mock_post.assert_called_once()
     
-    @patch('lead_verification.requests.post')
+    @patch('lead_verification.http_client.post')
     def test_verify_lead_api_error(self, mock_post):
         # Mock an API error
         mock_post.side_effect = Exception("API error")
@@ -86,5 +87,66 @@ class TestLeadVerification(unittest.TestCase):
         self.assertIn(("Another Good Lead", "987-654-3210"), verified)
         self.assertIn(("Bad Lead", "555-555-5555"), flagged)
 
+    @patch('lead_verification.verify_lead')
+    def test_process_new_leads_batch(self, mock_verify_lead):
+        test_leads = [
+            ("Good Lead", "123-456-7890"),
+            ("Bad Lead", "555-555-5555"),
+            ("Another Good Lead", "987-654-3210")
+        ]
+        mock_verify_lead.side_effect = lambda name, phone, cache=None: name != "Bad Lead"
+        
+        verified, flagged, summary = process_new_leads_batch(test_leads, max_workers=3)
+        
+        # Input order is preserved even though leads run concurrently
+        self.assertEqual(verified, [("Good Lead", "123-456-7890"), ("Another Good Lead", "987-654-3210")])
+        self.assertEqual(flagged, [("Bad Lead", "555-555-5555")])
+        self.assertEqual(summary["leads"], 3)
+
+    @patch('lead_verification.verify_lead')
+    def test_iter_verified_leads_is_lazy(self, mock_verify_lead):
+        mock_verify_lead.return_value = True
+        leads = iter([("Good Lead", "123-456-7890"), ("Good Lead", "123-456-7890"), ("Other Lead", "987-654-3210")])
+        stats = {}
+        
+        results = iter_verified_leads(leads, stats=stats)
+        self.assertEqual(next(results), ("Good Lead", "123-456-7890", True))
+        self.assertEqual(mock_verify_lead.call_count, 1)
+        
+        # Duplicate rows reuse the earlier outcome
+        self.assertEqual(len(list(results)), 2)
+        self.assertEqual(mock_verify_lead.call_count, 2)
+        self.assertEqual(stats, {"rows": 3, "lookups": 2})
+
+    @patch('lead_verification.verify_lead', return_value=True)
+    def test_iter_verified_leads_forgets_old_outcomes(self, mock_verify_lead):
+        leads = [("Lead A", "123-456-7890"), ("Lead B", "987-654-3210"), ("Lead B", "987-654-3210"),
+                 ("Lead A", "123-456-7890")]
+        stats = {}
+        with patch('lead_verification.DEDUPE_WINDOW', 1):
+            list(iter_verified_leads(leads, stats=stats))
+        # Lead A fell out of the window when Lead B was looked up
+        self.assertEqual(stats, {"rows": 4, "lookups": 3})
+
+    @patch('requests.Session.request')
+    def test_open_circuit_neither_verifies_nor_flags(self, mock_request):
+        breaker = circuit_breakers.configure("forewarn", min_calls=1, cooldown=60)
+        self.addCleanup(circuit_breakers.configure, "forewarn")
+        breaker.record(False, 0.01, breaker.before_call())
+        leads = [("Good Lead", "123-456-7890"), ("Good Lead", "123-456-7890")]
+        
+        self.assertIsNone(verify_lead("Good Lead", "123-456-7890"))
+        unavailable = []
+        stats = {}
+        self.assertEqual(process_new_leads(leads, unavailable=unavailable), ([], []))
+        self.assertEqual(unavailable, leads)
+        # The outage is not reused for the duplicate row
+        self.assertEqual([verified for _, _, verified in iter_verified_leads(leads, stats=stats)], [None, None])
+        self.assertEqual(stats, {"rows": 2, "lookups": 2})
+        
+        verified, flagged, summary = process_new_leads_batch(leads, max_workers=2)
+        self.assertEqual((verified, flagged, summary["unavailable"]), ([], [], leads))
+        mock_request.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
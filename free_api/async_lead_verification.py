@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from free_lead_verification import LeadVerifier, check_timed_out, run_with_deadline
+
+class AsyncLeadVerifier:
+    """
+    Run the phone, email and background checks for a lead concurrently.
+
+    The provider clients in LeadVerifier use blocking `requests` calls, so each
+    check is dispatched to an executor and the three are awaited together. A lead
+    then costs the slowest provider round-trip instead of the sum of all three.
+    """
+
+    def __init__(self, verifier: Optional[LeadVerifier] = None, executor: Optional[Executor] = None):
+        """
+        Args:
+            verifier: LeadVerifier whose provider methods are used (default: a new one)
+            executor: Executor for the blocking calls (default: the event loop's executor)
+        """
+        self.verifier = verifier or LeadVerifier()
+        self.executor = executor
+
+    async def _run(self, func: Callable, *args) -> Dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def verify_lead(self, name: str, phone: str, email: str) -> Dict:
+        """
+        Verify a lead using all available services, with the checks running at once.
+        Checks still outstanding when the verifier's time budget runs out are
+        reported as timed out, as in LeadVerifier.verify_lead.
+        """
+        budget = self.verifier.time_budget if self.verifier.time_budget and self.verifier.time_budget > 0 else None
+        # Provider requests not sent by the end of the budget are dropped, as in LeadVerifier.verify_lead
+        deadline = time.monotonic() + budget if budget else None
+        tasks = {
+            "phone_verification": asyncio.ensure_future(
+                self._run(run_with_deadline, deadline, self.verifier.verify_phone, phone)),
+            "email_verification": asyncio.ensure_future(
+                self._run(run_with_deadline, deadline, self.verifier.verify_email, email)),
+            "background_check": asyncio.ensure_future(
+                self._run(run_with_deadline, deadline, self.verifier.check_background, name, phone, email))
+        }
+        await asyncio.wait(tasks.values(), timeout=budget)
+
+        results = {}
+        for check, task in tasks.items():
+            if task.done():
+                results[check] = task.result()
+            else:
+                task.cancel()
+                results[check] = check_timed_out(check, budget)
+        return self.verifier.build_result(results["phone_verification"], results["email_verification"],
+                                          results["background_check"])
+
+    async def verify_leads(self, leads: List[Tuple[str, str, str]]) -> List[Dict]:
+        """Verify several (name, phone, email) leads, returning results in input order"""
+        return await asyncio.gather(*(self.verify_lead(name, phone, email) for name, phone, email in leads))
+
+def verify_lead_concurrently(name: str, phone: str, email: str, verifier: Optional[LeadVerifier] = None) -> Dict:
+    """Synchronous entry point that runs AsyncLeadVerifier.verify_lead to completion"""
+    return asyncio.run(AsyncLeadVerifier(verifier).verify_lead(name, phone, email))
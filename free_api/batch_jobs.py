@@ -0,0 +1,83 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+from batch_planner import RequestCoalescer
+from free_lead_verification import LeadVerifier
+from job_store import JobStore
+from verification_cache import VerificationCache
+
+logger = logging.getLogger(__name__)
+
+# Jobs run at once, and leads verified at once within each job
+BATCH_JOB_CONCURRENCY = int(os.getenv("BATCH_JOB_CONCURRENCY", "2"))
+BATCH_JOB_WORKERS = int(os.getenv("BATCH_JOB_WORKERS", "8"))
+
+class BatchJobRunner:
+    """
+    Runs batch verification jobs on a background thread pool.
+
+    submit() records the job and returns its id straight away; leads are then
+    verified in the background and each result is written to the JobStore as
+    it completes, so progress and partial results can be read at any time.
+    Leads within a job share one RequestCoalescer, so repeated phones and
+    emails are looked up once. A lead whose verification raises is recorded
+    as a flagged {"error": ..., "lead": ...} result and the job carries on.
+    """
+
+    def __init__(self, jobs: JobStore, handle_lead: Callable[[Dict, LeadVerifier], Dict],
+                 is_verified: Callable[[Dict], bool], cache: Optional[VerificationCache] = None,
+                 max_jobs: int = BATCH_JOB_CONCURRENCY, max_workers: int = BATCH_JOB_WORKERS):
+        """
+        Args:
+            jobs: Where jobs and their results are recorded
+            handle_lead: Verifies one lead (a dict from the upload) and returns its result
+            is_verified: Whether a result counts as verified rather than flagged
+            cache: Optional VerificationCache shared by every job
+            max_jobs: Jobs processed at the same time; later ones wait their turn
+            max_workers: Leads in flight within each job
+        """
+        self.jobs = jobs
+        self.handle_lead = handle_lead
+        self.is_verified = is_verified
+        self.cache = cache
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="batch-job")
+
+    def submit(self, leads: List[Dict]) -> str:
+        """Queue a job for the given leads and return its id"""
+        job_id = self.jobs.create_job(len(leads))
+        self._executor.submit(self._run, job_id, leads)
+        return job_id
+
+    def _run(self, job_id: str, leads: List[Dict]) -> None:
+        self.jobs.start_job(job_id)
+        verifier = LeadVerifier(self.cache, RequestCoalescer())
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self.handle_lead, lead, verifier): index for index, lead in enumerate(leads)}
+                try:
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        try:
+                            result = future.result()
+                            verified = self.is_verified(result)
+                        except Exception as e:
+                            logger.error(f"Batch job {job_id} lead {index} failed: {e}")
+                            result, verified = {"error": str(e), "lead": leads[index]}, False
+                        self.jobs.add_result(job_id, index, result, verified)
+                except BaseException:
+                    # Don't start leads for a job that has already failed
+                    for future in futures:
+                        future.cancel()
+                    raise
+        except Exception as e:
+            logger.error(f"Batch job {job_id} failed: {e}")
+            self.jobs.finish_job(job_id, str(e))
+            return
+        self.jobs.finish_job(job_id)
+        logger.info(f"Batch job {job_id} finished {len(leads)} leads")
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
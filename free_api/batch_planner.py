@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from verification_cache import normalize_email_key, normalize_name_key, normalize_phone_key
+
+def background_key(name: str, phone: str, email: str) -> str:
+    """Canonical key for a background check (name + phone, plus email which MicroBilt also receives)"""
+    return "|".join([normalize_name_key(name), normalize_phone_key(phone), normalize_email_key(email)])
+
+def identity_key(name: str, phone: str) -> str:
+    """Canonical key for a name + phone lookup such as Forewarn"""
+    return f"{normalize_name_key(name)}|{normalize_phone_key(phone)}"
+
+class BatchPlan:
+    """
+    Groups the rows of a batch by the lookups they need.
+
+    Rows that share a normalized phone, email or name+phone need only one
+    provider lookup between them. The plan records which rows share each
+    lookup so a run can report how much work deduplication saved.
+    """
+
+    def __init__(self, leads: Iterable[Tuple[str, str, str]]):
+        self.leads = list(leads)
+        self.phones: Dict[str, List[int]] = {}
+        self.emails: Dict[str, List[int]] = {}
+        self.backgrounds: Dict[str, List[int]] = {}
+        for index, (name, phone, email) in enumerate(self.leads):
+            self.phones.setdefault(normalize_phone_key(phone), []).append(index)
+            self.emails.setdefault(normalize_email_key(email), []).append(index)
+            self.backgrounds.setdefault(background_key(name, phone, email), []).append(index)
+
+    @property
+    def lookups_required(self) -> int:
+        """Lookups needed if every row were verified independently"""
+        return 3 * len(self.leads)
+
+    @property
+    def lookups_planned(self) -> int:
+        """Distinct lookups after grouping"""
+        return len(self.phones) + len(self.emails) + len(self.backgrounds)
+
+    def report(self) -> Dict:
+        """Summary of how much the batch deduplicates"""
+        required = self.lookups_required
+        planned = self.lookups_planned
+        return {
+            "rows": len(self.leads),
+            "unique_phones": len(self.phones),
+            "unique_emails": len(self.emails),
+            "unique_backgrounds": len(self.backgrounds),
+            "lookups_required": required,
+            "lookups_planned": planned,
+            "dedup_ratio": round(1 - planned / required, 3) if required else 0.0
+        }
+
+class RequestCoalescer:
+    """
+    Runs each distinct (provider, key) lookup once for the lifetime of a batch.
+
+    The first caller for a key performs the lookup; callers that arrive while it
+    is in flight, or afterwards, receive the same result. Unlike the persistent
+    cache, error results are shared too, so a failing lookup is not retried
+    within the same batch. A lookup that raises (e.g. a request dropped at its
+    deadline before being sent) fails only the callers already waiting for it,
+    and the next caller runs it again.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries: Keep only this many of the most recent lookups, so an
+                         unbounded stream of leads does not grow memory (default: all)
+        """
+        self._results: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.performed = 0
+        self.coalesced = 0
+
+    def _add(self, provider: str, key: str, future: Future) -> None:
+        self._results[(provider, key)] = future
+        if self.max_entries is not None and len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def get_or_fetch(self, provider: str, key: str, fetch: Callable[[], Dict]) -> Dict:
+        with self._lock:
+            future = self._results.get((provider, key))
+            owner = future is None
+            if owner:
+                future = Future()
+                self._add(provider, key, future)
+                self.performed += 1
+            else:
+                self.coalesced += 1
+
+        if owner:
+            try:
+                future.set_result(fetch())
+            except BaseException as e:
+                with self._lock:
+                    if self._results.get((provider, key)) is future:
+                        del self._results[(provider, key)]
+                future.set_exception(e)
+        return future.result()
+
+    def prime(self, provider: str, key: str, result: Dict) -> None:
+        """Record a result obtained elsewhere (e.g. a bulk job) so later lookups reuse it"""
+        with self._lock:
+            if (provider, key) not in self._results:
+                future = Future()
+                future.set_result(result)
+                self._add(provider, key, future)
+
+    def stats(self) -> Dict:
+        return {"lookups_performed": self.performed, "lookups_coalesced": self.coalesced}
@@ -0,0 +1,68 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize_run(latencies: List[float], elapsed: float) -> Dict:
+    """Build a throughput and latency summary from per-item latencies in seconds"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "leads": count,
+        "elapsed_seconds": round(elapsed, 3),
+        "leads_per_second": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / count * 1000, 1) if count else 0.0,
+            "p50": round(_percentile(ordered, 50) * 1000, 1),
+            "p95": round(_percentile(ordered, 95) * 1000, 1),
+            "max": round(ordered[-1] * 1000, 1) if count else 0.0
+        }
+    }
+
+def run_batch(items: Iterable[T], func: Callable[[T], R], max_workers: int = 8) -> Tuple[List[R], Dict]:
+    """
+    Apply func to every item using a pool of worker threads.
+
+    Results are returned in input order together with a run summary. Provider
+    specific caps are enforced inside the provider clients (see provider_limits),
+    so max_workers only bounds the total number of leads in flight.
+
+    Args:
+        items: Items to process, typically lead tuples
+        func: Callable applied to each item
+        max_workers: Number of leads processed at once
+
+    Returns:
+        A tuple (results, summary)
+    """
+    latencies: List[float] = []
+
+    def timed(item: T) -> R:
+        started = time.perf_counter()
+        try:
+            return func(item)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(executor.map(timed, items))
+    summary = summarize_run(latencies, time.perf_counter() - start)
+
+    logger.info(
+        f"Processed {summary['leads']} leads in {summary['elapsed_seconds']}s "
+        f"({summary['leads_per_second']} leads/s, p50 {summary['latency_ms']['p50']}ms, "
+        f"p95 {summary['latency_ms']['p95']}ms)"
+    )
+    return results, summary
@@ -0,0 +1,96 @@
+"""
+Benchmark /api/history search latency as the verification history grows.
+
+Fills a scratch VerificationStore in steps (1k, 10k, 100k, 1M records by
+default) and times substring queries through the trigram index and, for
+comparison, the LIKE scan used for short queries.
+
+    python benchmark_history_search.py
+    python benchmark_history_search.py --sizes 1000 10000 --no-scan
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+from typing import Dict, List
+
+from verification_store import VerificationStore
+
+FIRST_NAMES = ["John", "Jane", "Maria", "Bob", "Sarah", "David", "Linda", "James", "Emily", "Michael"]
+LAST_NAMES = ["Doe", "Smith", "Garcia", "Johnson", "Brown", "Miller", "Davis", "Wilson", "Moore", "Taylor"]
+
+# Each needle is planted in one row, so the result size stays fixed and
+# timings reflect the lookup rather than serializing large result sets
+NEEDLES = ["zyxwq", "qwxyz", "kvpjm"]
+
+def random_verification(rng: random.Random, index: int) -> Dict:
+    tag = "".join(rng.choice(string.ascii_lowercase) for _ in range(6))
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES) + tag
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": f"{first_name.lower()}.{tag}{index}@example.com",
+        "phone": "".join(rng.choice(string.digits) for _ in range(10)),
+        "status": rng.choice(["valid", "invalid"]),
+        "risk_score": round(rng.random(), 2),
+        "timestamp": "2024-01-01T00:00:00",
+        "details": {}
+    }
+
+def fill(store: VerificationStore, start: int, stop: int, rng: random.Random) -> None:
+    batch: List[Dict] = []
+    for index in range(start, stop):
+        verification = random_verification(rng, index)
+        if index < len(NEEDLES):
+            verification["last_name"] = "Needle" + NEEDLES[index]
+        batch.append(verification)
+        if len(batch) == 10000:
+            store.add_many(batch)
+            batch = []
+    if batch:
+        store.add_many(batch)
+
+def time_queries(store: VerificationStore, queries: List[str], repeat: int) -> float:
+    """Median query time in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            store.search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark verification history search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=20, help="Times each query is run per size")
+    parser.add_argument("--no-scan", action="store_true", help="Skip the LIKE scan comparison")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = VerificationStore(os.path.join(tmpdir, "benchmark.sqlite3"))
+        print(f"Trigram index available: {store.indexed_search}")
+        print(f"{'records':>10} {'indexed ms':>11} {'scan ms':>9}")
+
+        stored = 0
+        for size in sorted(args.sizes):
+            fill(store, stored, size, rng)
+            stored = size
+
+            indexed = time_queries(store, NEEDLES, args.repeat)
+            scan = "-"
+            if not args.no_scan:
+                store.indexed_search, indexed_search = False, store.indexed_search
+                scan = f"{time_queries(store, NEEDLES, max(1, args.repeat // 10)):.2f}"
+                store.indexed_search = indexed_search
+            print(f"{size:>10} {indexed:>11.2f} {scan:>9}")
+
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Defaults for every provider; override with CIRCUIT_<SETTING> or <PROVIDER>_CIRCUIT_<SETTING>
+DEFAULT_SETTINGS = {
+    "window": 20,            # most recent calls the error and slow rates are measured over
+    "min_calls": 5,          # calls needed in the window before the circuit may open
+    "error_rate": 0.5,       # share of failed calls that opens the circuit
+    "slow_call": 5.0,        # seconds after which a call counts as slow
+    "slow_rate": 0.8,        # share of slow calls that opens the circuit
+    "cooldown": 30.0         # seconds the circuit stays open before a probe is let through
+}
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} circuit is open; retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Stops calling a provider that is failing or too slow.
+
+    The breaker watches a sliding window of recent calls. When the share of
+    failed or slow calls crosses its threshold the circuit opens, and every
+    call fails immediately with CircuitOpenError. After the cooldown the
+    circuit is half-open: a single probe call is let through, and it either
+    closes the circuit again or reopens it for another cooldown.
+
+    Every change of state starts a new generation. before_call returns the
+    generation a call started in, and record ignores calls from an earlier
+    one, so a slow call sent before the circuit opened cannot count as the
+    half-open probe or reopen a circuit that has since closed.
+    """
+
+    def __init__(self, provider: str, window: int = 20, min_calls: int = 5, error_rate: float = 0.5,
+                 slow_call: float = 5.0, slow_rate: float = 0.8, cooldown: float = 30.0):
+        """
+        Args:
+            provider: Name used in errors and logs
+            window: Number of recent calls the rates are measured over
+            min_calls: Calls needed in the window before the circuit can open
+            error_rate: Share of failed calls that opens the circuit
+            slow_call: Seconds after which a call counts as slow
+            slow_rate: Share of slow calls that opens the circuit
+            cooldown: Seconds to stay open before letting a probe through
+        """
+        self.provider = provider
+        self.min_calls = max(1, int(min_calls))
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.slow_rate = slow_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened_count = 0
+        self.rejected = 0
+        self._calls = deque(maxlen=max(1, int(window)))
+        self._opened_at = 0.0
+        self._probing = False
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> int:
+        """
+        Reserve permission to call the provider, or raise CircuitOpenError.
+
+        Returns the breaker generation the call started in, to pass to record.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.cooldown - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.provider, remaining)
+                self.state = HALF_OPEN
+                self._generation += 1
+                logger.info(f"{self.provider} circuit half-open, sending a probe")
+            if self.state == HALF_OPEN:
+                # Only one probe at a time; everyone else keeps failing fast until it reports back
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.provider, 0)
+                self._probing = True
+            return self._generation
+
+    def record(self, success: bool, duration: float, generation: Optional[int] = None) -> None:
+        """
+        Report the outcome of a call allowed by before_call.
+
+        Args:
+            success: Whether the provider answered properly
+            duration: Seconds the call took
+            generation: What before_call returned for this call; results from an
+                        earlier generation are ignored (default: the current one)
+        """
+        slow = duration >= self.slow_call
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if success and not slow:
+                    self.state = CLOSED
+                    self._generation += 1
+                    self._calls.clear()
+                    logger.info(f"{self.provider} circuit closed, probe succeeded")
+                else:
+                    self._open()
+                return
+
+            self._calls.append((success, slow))
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for ok, _ in self._calls if not ok)
+                slow_calls = sum(1 for _, is_slow in self._calls if is_slow)
+                if failures / len(self._calls) >= self.error_rate or slow_calls / len(self._calls) >= self.slow_rate:
+                    self._open()
+
+    def release(self, generation: Optional[int] = None) -> None:
+        """Give back permission from before_call for a call that was never sent"""
+        with self._lock:
+            if self.state == HALF_OPEN and (generation is None or generation == self._generation):
+                self._probing = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._generation += 1
+        self._opened_at = time.monotonic()
+        self.opened_count += 1
+        self._calls.clear()
+        logger.warning(f"{self.provider} circuit opened for {self.cooldown:.0f}s")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "recent_calls": len(self._calls),
+                "recent_failures": sum(1 for ok, _ in self._calls if not ok),
+                "recent_slow_calls": sum(1 for _, slow in self._calls if slow),
+                "times_opened": self.opened_count,
+                "rejected": self.rejected
+            }
+
+class CircuitBreakers:
+    """One CircuitBreaker per provider, configured from the environment"""
+
+    def __init__(self, settings: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            settings: Optional mapping of provider to CircuitBreaker keyword arguments.
+                      Providers not listed read <PROVIDER>_CIRCUIT_ERROR_RATE,
+                      <PROVIDER>_CIRCUIT_SLOW_CALL and so on, then the CIRCUIT_*
+                      defaults. CIRCUIT_BREAKER_ENABLED=false turns breaking off.
+        """
+        self._settings = settings or {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.enabled = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() != "false"
+
+    def _load_settings(self, provider: str) -> Dict:
+        if provider in self._settings:
+            return self._settings[provider]
+        settings = {}
+        for name, default in DEFAULT_SETTINGS.items():
+            value = os.getenv(f"{provider.upper()}_CIRCUIT_{name.upper()}") or os.getenv(f"CIRCUIT_{name.upper()}")
+            try:
+                settings[name] = type(default)(value) if value else default
+            except ValueError:
+                logger.warning(f"Ignoring invalid circuit breaker setting {name} for {provider}: {value}")
+                settings[name] = default
+        return settings
+
+    def get(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(provider, **self._load_settings(provider))
+            return self._breakers[provider]
+
+    def configure(self, provider: str, **settings) -> CircuitBreaker:
+        """Replace a provider's breaker, e.g. in tests or after changing thresholds"""
+        with self._lock:
+            self._settings[provider] = settings
+            self._breakers[provider] = CircuitBreaker(provider, **settings)
+            return self._breakers[provider]
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: breaker.stats() for provider, breaker in breakers.items()}
+
+# Process-wide breakers shared by every provider client
+circuit_breakers = CircuitBreakers()
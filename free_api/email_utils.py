@@ -0,0 +1,77 @@
+import os
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Dot-atom local part (RFC 5322 without quoted strings or comments)
+_LOCAL_PART = re.compile(r"^[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*$")
+_DOMAIN_LABEL = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$")
+_TLD = re.compile(r"^(?:[a-z]{2,63}|xn--[a-z0-9-]{1,59})$")
+
+@lru_cache(maxsize=None)
+def _load_list(filename: str) -> FrozenSet[str]:
+    """Read a bundled one-entry-per-line list into a set (loaded once per process)"""
+    with open(os.path.join(DATA_DIR, filename)) as f:
+        return frozenset(
+            line.strip().lower() for line in f
+            if line.strip() and not line.startswith("#")
+        )
+
+def disposable_domains() -> FrozenSet[str]:
+    return _load_list("disposable_domains.txt")
+
+def role_accounts() -> FrozenSet[str]:
+    return _load_list("role_accounts.txt")
+
+def normalize_domain(domain: str) -> Optional[str]:
+    """Lowercase a domain, drop a trailing dot and convert it to its ASCII (IDNA) form"""
+    domain = (domain or "").strip().rstrip(".").lower()
+    try:
+        return domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+
+def normalize_email(email: str) -> Optional[str]:
+    """Return the address with a normalized domain, or None if it cannot be split"""
+    email = (email or "").strip()
+    local, sep, domain = email.rpartition("@")
+    if not sep or not local:
+        return None
+    domain = normalize_domain(domain)
+    if not domain:
+        return None
+    return f"{local}@{domain}"
+
+def _valid_syntax(local: str, domain: str) -> bool:
+    if len(local) > 64 or len(domain) > 253 or len(local) + len(domain) + 1 > 254:
+        return False
+    if not _LOCAL_PART.match(local):
+        return False
+    labels = domain.split(".")
+    if len(labels) < 2 or not _TLD.match(labels[-1]):
+        return False
+    return all(_DOMAIN_LABEL.match(label) for label in labels)
+
+def screen_email(email: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Check an email address offline before paying for a NeverBounce lookup.
+
+    Returns:
+        A tuple (normalized_email, reason). reason is None when the address passed
+        and should be sent to the API, otherwise one of "invalid_syntax",
+        "disposable_domain" or "role_account".
+    """
+    normalized = normalize_email(email)
+    if normalized is None:
+        return None, "invalid_syntax"
+
+    local, _, domain = normalized.rpartition("@")
+    if not _valid_syntax(local, domain):
+        return normalized, "invalid_syntax"
+    if domain in disposable_domains():
+        return normalized, "disposable_domain"
+    if local.lower() in role_accounts():
+        return normalized, "role_account"
+    return normalized, None
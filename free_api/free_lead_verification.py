@@ -1,10 +1,21 @@
 import requests
-import json
 import os
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import islice
 from dotenv import load_dotenv
-from typing import Tuple, List, Dict, Optional
+from typing import Callable, Iterable, Tuple, List, Dict, Optional
 from urllib3.exceptions import InsecureRequestWarning
+from http_client import DeadlineExceeded, http_client
+from circuit_breaker import CircuitOpenError
+from verification_cache import VerificationCache, normalize_email_key, normalize_phone_key
+from batch_planner import BatchPlan, RequestCoalescer, background_key
+from phone_utils import national_number, validate_nanp
+from email_utils import screen_email
+from batch_runner import run_batch
+from lead_sink import LeadSink
 
 # Suppress SSL warnings
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
@@ -22,6 +33,94 @@ NUMVERIFY_API_KEY = os.getenv("NUMVERIFY_API_KEY")
 NEVERBOUNCE_API_KEY = os.getenv("NEVERBOUNCE_API_KEY")
 MICROBILT_API_KEY = os.getenv("MICROBILT_API_KEY")
 USE_MOCK_API = os.getenv("USE_MOCK_API", "false").lower() == "true"
+NEVERBOUNCE_API_URL = os.getenv("NEVERBOUNCE_API_URL", "https://api.neverbounce.com/v4")
+
+# Above this many distinct emails, process_new_leads verifies them with one NeverBounce bulk job
+NEVERBOUNCE_BULK_THRESHOLD = int(os.getenv("NEVERBOUNCE_BULK_THRESHOLD", "500"))
+
+# Rows iter_verified_leads reads and plans at a time, so a long stream of leads is
+# never held in memory at once. Lookups of the last few windows are still shared.
+LEAD_PLAN_WINDOW = int(os.getenv("LEAD_PLAN_WINDOW", "10000"))
+
+# Seconds allowed for all of a lead's checks together (0 disables the budget and runs
+# them one after another). Checks still outstanding then are reported as missing, and
+# provider requests that have not been sent by then are dropped rather than paid for.
+LEAD_TIME_BUDGET = float(os.getenv("LEAD_TIME_BUDGET", "20"))
+
+# Threads first started for running leads' checks at the same time. The pool grows
+# beyond this whenever more checks are running, so checks never queue for a thread,
+# and shrinks back once the burst is over.
+LEAD_CHECK_WORKERS = int(os.getenv("LEAD_CHECK_WORKERS", "32"))
+
+# Most checks run at once; beyond this, checks fail straight away as timed out
+LEAD_CHECK_WORKERS_MAX = int(os.getenv("LEAD_CHECK_WORKERS_MAX", "256"))
+
+# Provider behind each check of a lead verification result
+CHECK_PROVIDERS = {
+    "phone_verification": "numverify",
+    "email_verification": "neverbounce",
+    "background_check": "microbilt"
+}
+
+class CheckPoolFull(RuntimeError):
+    """Raised by CheckPool.submit when max_workers checks are already running"""
+
+class CheckPool:
+    """
+    Threads shared by every caller that verifies leads with a time budget:
+    process_new_leads batch workers, IntegrationManager, BatchJobRunner and
+    the web app's /api/verify all submit here.
+
+    A check that waited in a queue for a thread would spend its lead's budget
+    before reaching the provider, so the pool always has a thread for every
+    check submitted. When more checks are running than it has threads, it is
+    replaced by one twice the size, up to max_workers; past that, submit
+    raises CheckPoolFull rather than queueing. Once the burst is over and no
+    more than min_workers checks are running, it is replaced by a pool of
+    min_workers again. A replaced pool finishes the checks it already started
+    and its threads then exit.
+    """
+
+    def __init__(self, min_workers: int = LEAD_CHECK_WORKERS, max_workers: int = LEAD_CHECK_WORKERS_MAX):
+        self.min_workers = max(3, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.size = 0
+        self.running = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args) -> Future:
+        with self._lock:
+            if self.running >= self.max_workers:
+                raise CheckPoolFull(f"{self.running} lead checks already running")
+            self.running += 1
+            if self._executor is None or self.running > self.size:
+                size = min(self.max_workers, max(self.min_workers, 2 * self.size, self.running))
+            elif self.size > self.min_workers and self.running <= self.min_workers:
+                size = self.min_workers
+            else:
+                size = self.size
+            if size != self.size:
+                retired = self._executor
+                self.size = size
+                self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="lead-check")
+                if retired is not None:
+                    retired.shutdown(wait=False)
+            executor = self._executor
+        future = executor.submit(func, *args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self.running -= 1
+
+_check_pool = CheckPool()
+
+def run_with_deadline(deadline: float, check: Callable, *args) -> Dict:
+    """Run a check so its provider requests are dropped unsent once time.monotonic() passes deadline"""
+    with http_client.deadline(deadline):
+        return check(*args)
 
 # Debug API keys
 logger.debug(f"Numverify API Key: {'Set' if NUMVERIFY_API_KEY else 'Not Set'}")
@@ -29,10 +128,29 @@ logger.debug(f"NeverBounce API Key: {'Set' if NEVERBOUNCE_API_KEY else 'Not Set'
 logger.debug(f"MicroBilt API Key: {'Set' if MICROBILT_API_KEY else 'Not Set'}")
 
 class LeadVerifier:
-    def __init__(self):
-        """Initialize the lead verifier with API keys"""
+    def __init__(self, cache: Optional[VerificationCache] = None, coalescer: Optional[RequestCoalescer] = None,
+                 time_budget: Optional[float] = None):
+        """
+        Initialize the lead verifier with API keys.
+        
+        Args:
+            cache: Optional VerificationCache consulted before every provider call
+            coalescer: Optional RequestCoalescer so repeated lookups within a batch run once
+            time_budget: Seconds allowed for each lead's checks together (default LEAD_TIME_BUDGET;
+                         0 runs the checks one after another with no budget)
+        """
+        self.cache = cache
+        self.coalescer = coalescer
+        self.time_budget = LEAD_TIME_BUDGET if time_budget is None else time_budget
+        # Provider calls avoided because the input was rejected locally
+        self.calls_saved = {"numverify": 0, "neverbounce": 0}
+        self._stats_lock = threading.Lock()
         self.numverify_url = "http://apilayer.net/api/validate"
-        self.neverbounce_url = "https://api.neverbounce.com/v4/single/check"
+        self.neverbounce_api_url = NEVERBOUNCE_API_URL.rstrip("/")
+        self.neverbounce_url = f"{self.neverbounce_api_url}/single/check"
+        self.bulk_poll_interval = float(os.getenv("NEVERBOUNCE_BULK_POLL_INTERVAL", "5"))
+        self.bulk_timeout = float(os.getenv("NEVERBOUNCE_BULK_TIMEOUT", "3600"))
+        self.bulk_page_size = 1000
         self.microbilt_url = "https://api.microbilt.com/v1/person/search"
         
         # Verify API keys are set
@@ -43,13 +161,42 @@ class LeadVerifier:
         if not MICROBILT_API_KEY:
             logger.warning("MICROBILT_API_KEY not found in environment variables")
 
+    def _record_saved_call(self, provider: str) -> None:
+        with self._stats_lock:
+            self.calls_saved[provider] += 1
+
+    def _lookup(self, provider: str, key: str, fetch: Callable[[], Dict]) -> Dict:
+        """
+        Run a provider lookup through the batch coalescer and cache, when configured.
+        A lookup dropped unsent at the lead's deadline comes back as a timed_out
+        result, and is neither cached nor shared with later lookups of the key.
+        """
+        if self.cache is not None:
+            uncached = fetch
+            fetch = lambda: self.cache.get_or_fetch(provider, key, uncached)
+        try:
+            if self.coalescer is not None:
+                return self.coalescer.get_or_fetch(provider, key, fetch)
+            return fetch()
+        except DeadlineExceeded as e:
+            return {"timed_out": True, "provider": provider, "error": str(e)}
+
     def verify_phone(self, phone_number: str) -> Dict:
         """Verify phone number using Numverify API"""
+        # Numbers that break NANP rules can never be valid, so don't pay to ask
+        valid, reason = validate_nanp(phone_number)
+        if not valid:
+            self._record_saved_call("numverify")
+            return {"valid": False, "number": national_number(phone_number), "reason": reason, "checked_locally": True}
+        
+        return self._lookup("numverify", normalize_phone_key(phone_number), lambda: self._verify_phone(phone_number))
+
+    def _verify_phone(self, phone_number: str) -> Dict:
         if not NUMVERIFY_API_KEY:
             return {"valid": False, "error": "Numverify API key not configured"}
             
-        # Clean phone number (remove non-numeric characters)
-        clean_phone = ''.join(filter(str.isdigit, phone_number))
+        # Clean phone number (10-digit national number without country code)
+        clean_phone = national_number(phone_number)
         
         params = {
             "access_key": NUMVERIFY_API_KEY,
@@ -59,7 +206,7 @@ class LeadVerifier:
         }
         
         try:
-            response = requests.get(self.numverify_url, params=params)
+            response = http_client.get("numverify", self.numverify_url, params=params)
             response.raise_for_status()
             result = response.json()
             
@@ -68,12 +215,24 @@ class LeadVerifier:
                 return {"valid": False, "error": result["error"]}
                 
             return result
+        except CircuitOpenError as e:
+            return provider_unavailable(e)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error verifying phone number: {e}")
             return {"valid": False, "error": str(e)}
 
     def verify_email(self, email: str) -> Dict:
         """Verify email using NeverBounce API"""
+        # Malformed, disposable and role addresses are rejected without a paid lookup
+        normalized, reason = screen_email(email)
+        if reason:
+            self._record_saved_call("neverbounce")
+            return {"result": "invalid", "reason": reason, "checked_locally": True}
+        email = normalized
+        
+        return self._lookup("neverbounce", normalize_email_key(email), lambda: self._verify_email(email))
+
+    def _verify_email(self, email: str) -> Dict:
         if not NEVERBOUNCE_API_KEY:
             return {"result": "invalid", "error": "NeverBounce API key not configured"}
             
@@ -83,7 +242,7 @@ class LeadVerifier:
         }
         
         try:
-            response = requests.post(self.neverbounce_url, data=params)
+            response = http_client.post("neverbounce", self.neverbounce_url, data=params)
             response.raise_for_status()
             result = response.json()
             
@@ -98,12 +257,119 @@ class LeadVerifier:
                 logger.error(f"NeverBounce API error: {result}")
                 return {"result": "invalid", "error": result.get("message", "Unknown error")}
                 
+        except CircuitOpenError as e:
+            return provider_unavailable(e)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error verifying email: {e}")
             return {"result": "invalid", "error": str(e)}
 
+    def verify_emails_bulk(self, emails: List[str]) -> Dict[str, Dict]:
+        """
+        Verify many emails with a single NeverBounce bulk job.
+        
+        Addresses rejected by the local screen or found in the cache are not sent.
+        
+        Returns:
+            A mapping of each input email to a result in the same shape as verify_email
+        """
+        results = {}
+        pending = {}
+        for email in emails:
+            normalized, reason = screen_email(email)
+            if reason:
+                self._record_saved_call("neverbounce")
+                results[email] = {"result": "invalid", "reason": reason, "checked_locally": True}
+                continue
+            cached = self.cache.get("neverbounce", normalize_email_key(normalized)) if self.cache else None
+            if cached is not None:
+                results[email] = cached
+            else:
+                pending.setdefault(normalize_email_key(normalized), []).append(email)
+        
+        if pending:
+            job_results = self._run_bulk_job(list(pending))
+            for key, originals in pending.items():
+                result = job_results.get(key, {"result": "invalid", "error": "Missing from bulk job results"})
+                if self.cache is not None:
+                    self.cache.set("neverbounce", key, result)
+                for email in originals:
+                    results[email] = result
+        
+        return results
+
+    def _run_bulk_job(self, emails: List[str]) -> Dict[str, Dict]:
+        """Create a NeverBounce bulk job, wait for it to finish and collect its results"""
+        if not NEVERBOUNCE_API_KEY:
+            error = {"result": "invalid", "error": "NeverBounce API key not configured"}
+            return {email: error for email in emails}
+        
+        try:
+            response = http_client.post("neverbounce", f"{self.neverbounce_api_url}/jobs/create", json={
+                "key": NEVERBOUNCE_API_KEY,
+                "input_location": "supplied",
+                "input": [{"email": email} for email in emails],
+                "auto_parse": True,
+                "auto_start": True
+            })
+            response.raise_for_status()
+            created = response.json()
+            if created.get("status") != "success":
+                raise RuntimeError(created.get("message", "Unable to create bulk job"))
+            job_id = created["job_id"]
+            logger.info(f"Started NeverBounce bulk job {job_id} for {len(emails)} emails")
+            
+            # Poll until the job completes
+            deadline = time.monotonic() + self.bulk_timeout
+            while True:
+                response = http_client.get("neverbounce", f"{self.neverbounce_api_url}/jobs/status",
+                                           params={"key": NEVERBOUNCE_API_KEY, "job_id": job_id})
+                response.raise_for_status()
+                status = response.json()
+                job_status = status.get("job_status")
+                if job_status == "complete":
+                    break
+                if job_status == "failed" or status.get("status") != "success":
+                    raise RuntimeError(status.get("failure_reason") or status.get("message") or "Bulk job failed")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Bulk job {job_id} did not finish within {self.bulk_timeout}s")
+                time.sleep(self.bulk_poll_interval)
+            
+            # Page through the results
+            results = {}
+            page = 1
+            while True:
+                response = http_client.get("neverbounce", f"{self.neverbounce_api_url}/jobs/results", params={
+                    "key": NEVERBOUNCE_API_KEY,
+                    "job_id": job_id,
+                    "page": page,
+                    "items_per_page": self.bulk_page_size
+                })
+                response.raise_for_status()
+                body = response.json()
+                for item in body.get("results", []):
+                    verification = item.get("verification", {})
+                    results[normalize_email_key(item.get("data", {}).get("email", ""))] = {
+                        "result": verification.get("result", "unknown"),
+                        "flags": verification.get("flags", []),
+                        "suggested_correction": verification.get("suggested_correction", ""),
+                        "execution_time": verification.get("execution_time", 0)
+                    }
+                if page >= body.get("total_pages", 1):
+                    break
+                page += 1
+            return results
+        
+        except (requests.exceptions.RequestException, RuntimeError, KeyError, ValueError) as e:
+            logger.error(f"Error running NeverBounce bulk job: {e}")
+            error = {"result": "invalid", "error": str(e)}
+            return {email: error for email in emails}
+
     def check_background(self, name: str, phone: str, email: str) -> Dict:
         """Check background information using MicroBilt API"""
+        return self._lookup("microbilt", background_key(name, phone, email),
+                            lambda: self._check_background(name, phone, email))
+
+    def _check_background(self, name: str, phone: str, email: str) -> Dict:
         if not MICROBILT_API_KEY or MICROBILT_API_KEY == "microbilt_api":
             logger.info("Skipping background check - MicroBilt API key not configured")
             return {"status": "skipped", "message": "Background check not configured"}
@@ -120,32 +386,109 @@ class LeadVerifier:
         }
         
         try:
-            response = requests.post(self.microbilt_url, headers=headers, json=data)
+            response = http_client.post("microbilt", self.microbilt_url, headers=headers, json=data)
             response.raise_for_status()
             return response.json()
+        except CircuitOpenError as e:
+            return provider_unavailable(e)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error checking background: {e}")
             return {"error": str(e)}
 
     def verify_lead(self, name: str, phone: str, email: str) -> Dict:
-        """Verify a lead using all available services"""
-        phone_result = self.verify_phone(phone)
-        email_result = self.verify_email(email)
-        background_result = self.check_background(name, phone, email)
+        """
+        Verify a lead using all available services.
+        
+        With a time budget the three checks run at once and the lead is returned
+        when the budget runs out, whether or not every check has answered. A
+        provider request still waiting for its rate limit or concurrency slot
+        at that point is dropped without being sent, so no lookup is paid for
+        after its lead gave up on it. Requests already sent are left to finish
+        against their own connect/read timeouts, and their result is cached for
+        the next lookup. Either way the checks come back as timed_out results
+        and are listed in missing_checks.
+        """
+        if not self.time_budget or self.time_budget <= 0:
+            phone_result = self.verify_phone(phone)
+            email_result = self.verify_email(email)
+            background_result = self.check_background(name, phone, email)
+            return self.build_result(phone_result, email_result, background_result)
+        
+        deadline = time.monotonic() + self.time_budget
+        futures = {
+            "phone_verification": self._submit_check("phone_verification", deadline, self.verify_phone, phone),
+            "email_verification": self._submit_check("email_verification", deadline, self.verify_email, email),
+            "background_check": self._submit_check("background_check", deadline, self.check_background,
+                                                   name, phone, email)
+        }
+        done, _ = wait(futures.values(), timeout=self.time_budget)
+        
+        results = {}
+        for check, future in futures.items():
+            if future in done:
+                results[check] = future.result()
+            else:
+                future.cancel()
+                results[check] = check_timed_out(check, self.time_budget)
+        return self.build_result(results["phone_verification"], results["email_verification"],
+                                 results["background_check"])
+
+    def _submit_check(self, check: str, deadline: float, func: Callable, *args) -> Future:
+        """Run a check on the shared pool, or time it out at once if the pool is full"""
+        try:
+            return _check_pool.submit(run_with_deadline, deadline, func, *args)
+        except CheckPoolFull as e:
+            logger.warning(f"Skipping {check}: {e}")
+            future = Future()
+            future.set_result(check_timed_out(check, self.time_budget))
+            return future
+
+    def build_result(self, phone_result: Dict, email_result: Dict, background_result: Dict) -> Dict:
+        """
+        Combine the individual provider results into a lead verification result.
         
+        Checks skipped because a provider's circuit was open say nothing about
+        the lead: they add a provider_unavailable risk factor and are listed in
+        unavailable_providers so the lead can be verified again later. Checks
+        that ran out of time budget are treated the same way, with a
+        checks_timed_out risk factor and the checks listed in missing_checks.
+        A lead with no other risk factors gets overall status "partial" or
+        "provider_unavailable" rather than being flagged.
+        """
         # Determine overall status
         risk_factors = []
+        checks = {
+            "phone_verification": phone_result,
+            "email_verification": email_result,
+            "background_check": background_result
+        }
+        unavailable = [result["provider"] for result in checks.values() if result.get("provider_unavailable")]
+        missing = [check for check, result in checks.items() if result.get("timed_out")]
+        completed = {check: not (result.get("provider_unavailable") or result.get("timed_out"))
+                     for check, result in checks.items()}
         
-        if not phone_result.get("valid", False):
+        if completed["phone_verification"] and not phone_result.get("valid", False):
             risk_factors.append("invalid_phone")
             
-        if email_result.get("result") != "valid":
+        if completed["email_verification"] and email_result.get("result") != "valid":
             risk_factors.append("invalid_email")
             
-        if background_result.get("error"):
+        if completed["background_check"] and background_result.get("error"):
             risk_factors.append("background_check_failed")
             
-        overall_status = "verified" if not risk_factors else "flagged"
+        if risk_factors:
+            overall_status = "flagged"
+        elif missing:
+            overall_status = "partial"
+        elif unavailable:
+            overall_status = "provider_unavailable"
+        else:
+            overall_status = "verified"
+        
+        if missing:
+            risk_factors.append("checks_timed_out")
+        if unavailable:
+            risk_factors.append("provider_unavailable")
         
         return {
             "phone_verification": phone_result,
@@ -153,49 +496,204 @@ class LeadVerifier:
             "background_check": background_result,
             "verification_status": {
                 "overall_status": overall_status,
-                "risk_factors": risk_factors
+                "risk_factors": risk_factors,
+                "unavailable_providers": unavailable,
+                "missing_checks": missing
             }
         }
 
-def process_new_leads(leads: List[Tuple[str, str, str]]) -> Tuple[List[Dict], List[Dict]]:
+def check_timed_out(check: str, budget: float) -> Dict:
+    """Result for a check that had not answered when the lead's time budget ran out"""
+    return {
+        "timed_out": True,
+        "provider": CHECK_PROVIDERS[check],
+        "error": f"No answer within the {budget:g}s lead time budget"
+    }
+
+def provider_unavailable(error: CircuitOpenError) -> Dict:
     """
-    Process a list of new leads and return verified and flagged leads.
+    Result for a check skipped because the provider's circuit is open.
+    It carries an error so it is never cached, and the lead can be re-verified later.
+    """
+    return {
+        "provider_unavailable": True,
+        "provider": error.provider,
+        "retry_after": round(error.retry_after, 1),
+        "error": str(error)
+    }
+
+# Contribution of each risk factor to the 0-1 risk score used by the web app and integrations
+RISK_WEIGHTS = {
+    "invalid_phone": 0.4,
+    "invalid_email": 0.4,
+    "background_check_failed": 0.2,
+    # The provider was down or too slow, not the lead at fault
+    "provider_unavailable": 0.0,
+    "checks_timed_out": 0.0
+}
+
+def verify_lead(first_name: str, last_name: str, phone: str, email: str,
+                verifier: Optional[LeadVerifier] = None) -> Dict:
+    """
+    Verify a lead given separate first and last names.
+    
+    Returns a flat summary (phone_valid, email_valid, risk_score, risk_factors)
+    used by the web app and integrations, with the full result under "details".
+    """
+    verifier = verifier or LeadVerifier()
+    return summarize_result(verifier.verify_lead(f"{first_name} {last_name}".strip(), phone, email))
+
+def summarize_result(result: Dict) -> Dict:
+    """Flat summary returned by verify_lead for a LeadVerifier.verify_lead result"""
+    risk_factors = result["verification_status"]["risk_factors"]
+    
+    return {
+        "phone_valid": bool(result["phone_verification"].get("valid", False)),
+        "email_valid": result["email_verification"].get("result") == "valid",
+        "risk_score": round(min(1.0, sum(RISK_WEIGHTS.get(factor, 0.2) for factor in risk_factors)), 2),
+        "risk_factors": risk_factors,
+        "unavailable_providers": result["verification_status"]["unavailable_providers"],
+        "missing_checks": result["verification_status"]["missing_checks"],
+        "details": result
+    }
+
+def lead_record(name: str, phone: str, email: str, result: Dict) -> Dict:
+    """Build the output record for a verified or flagged lead"""
+    record = {
+        "name": name,
+        "phone": phone,
+        "email": email,
+        "verification_details": result
+    }
+    if result["verification_status"]["overall_status"] != "verified":
+        record["risk_factors"] = result["verification_status"]["risk_factors"]
+    return record
+
+def _verify_emails_in_bulk(plan: BatchPlan, verifier: LeadVerifier, bulk_threshold: Optional[int]) -> None:
+    """Run a NeverBounce bulk job for large batches and share its results with every row"""
+    threshold = NEVERBOUNCE_BULK_THRESHOLD if bulk_threshold is None else bulk_threshold
+    if threshold <= 0 or len(plan.emails) <= threshold:
+        return
+    
+    emails = [plan.leads[rows[0]][2] for rows in plan.emails.values()]
+    for email, result in verifier.verify_emails_bulk(emails).items():
+        normalized, reason = screen_email(email)
+        # Failed jobs are not primed, so those rows fall back to single checks
+        if not reason and "error" not in result:
+            verifier.coalescer.prime("neverbounce", normalize_email_key(normalized), result)
+
+def iter_verified_leads(leads: Iterable[Tuple[str, str, str]], cache: Optional[VerificationCache] = None,
+                        bulk_threshold: Optional[int] = 0):
+    """
+    Verify leads one at a time, yielding each output record as soon as it is ready.
     Each lead is a tuple of (name, phone, email).
+    Leads are read LEAD_PLAN_WINDOW rows at a time, so any iterable can be
+    streamed through. Rows sharing a phone, email or name+phone share a single
+    provider lookup within a window and with recent windows.
+    Pass a VerificationCache to reuse earlier provider results.
+
+    Bulk email checks are off by default, so the first record comes out as
+    soon as its lead is verified. With a bulk_threshold (None for
+    NEVERBOUNCE_BULK_THRESHOLD), a window with more distinct emails than that
+    is verified with one NeverBounce bulk job first: fewer, cheaper email
+    checks, but nothing is yielded until the job finishes, which can take
+    minutes.
+
+    Yields:
+        Tuples (record, verified)
+    """
+    window = max(1, LEAD_PLAN_WINDOW)
+    # Three lookups per row, kept for the current window and the one before it
+    verifier = LeadVerifier(cache, RequestCoalescer(max_entries=6 * window))
+    leads = iter(leads)
+    required = planned = 0
+    
+    while True:
+        plan = BatchPlan(islice(leads, window))
+        if not plan.leads:
+            break
+        _verify_emails_in_bulk(plan, verifier, bulk_threshold)
+        
+        for name, phone, email in plan.leads:
+            result = verifier.verify_lead(name, phone, email)
+            verified = result["verification_status"]["overall_status"] == "verified"
+            yield lead_record(name, phone, email, result), verified
+        required += plan.lookups_required
+        planned += plan.lookups_planned
+    
+    logger.info(f"Deduplicated {required} lookups to {planned} "
+                f"(dedup ratio {round(1 - planned / required, 3) if required else 0.0})")
+    logger.info(f"Provider calls saved by local checks: {verifier.calls_saved}")
+
+def process_new_leads(leads: List[Tuple[str, str, str]], cache: Optional[VerificationCache] = None,
+                      bulk_threshold: Optional[int] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Process a list of new leads and return verified and flagged leads.
+    Since nothing is returned until every lead is done, large email sets go
+    through a NeverBounce bulk job (above bulk_threshold, default
+    NEVERBOUNCE_BULK_THRESHOLD). See iter_verified_leads for deduplication and
+    caching; use it with a LeadSink to write results as they are verified.
     """
-    verifier = LeadVerifier()
     verified_leads = []
     flagged_leads = []
     
-    for name, phone, email in leads:
-        result = verifier.verify_lead(name, phone, email)
-        
-        if result["verification_status"]["overall_status"] == "verified":
-            verified_leads.append({
-                "name": name,
-                "phone": phone,
-                "email": email,
-                "verification_details": result
-            })
+    for record, verified in iter_verified_leads(leads, cache, bulk_threshold):
+        if verified:
+            verified_leads.append(record)
         else:
-            flagged_leads.append({
-                "name": name,
-                "phone": phone,
-                "email": email,
-                "verification_details": result,
-                "risk_factors": result["verification_status"]["risk_factors"]
-            })
+            flagged_leads.append(record)
     
     return verified_leads, flagged_leads
 
-def save_leads_to_json(verified_leads: List[Dict], flagged_leads: List[Dict], output_dir: str = "results") -> None:
-    """Save verified and flagged leads to separate JSON files"""
-    os.makedirs(output_dir, exist_ok=True)
+def process_new_leads_batch(leads: List[Tuple[str, str, str]], max_workers: int = 8,
+                            cache: Optional[VerificationCache] = None,
+                            bulk_threshold: Optional[int] = None) -> Tuple[List[Dict], List[Dict], Dict]:
+    """
+    Process leads with several in flight at once.
+
+    Each provider is additionally capped by its <PROVIDER>_MAX_CONCURRENCY setting.
+    Repeated phones, emails and name+phone combinations are looked up once,
+    and large email sets go through a NeverBounce bulk job (see process_new_leads).
+    Verified and flagged leads keep their input order.
+
+    Returns:
+        A tuple (verified_leads, flagged_leads, summary) where summary holds
+        throughput, latency and deduplication figures for the run
+    """
+    plan = BatchPlan(leads)
+    verifier = LeadVerifier(cache, RequestCoalescer())
+    _verify_emails_in_bulk(plan, verifier, bulk_threshold)
+    results, summary = run_batch(plan.leads, lambda lead: verifier.verify_lead(*lead), max_workers)
+    summary["dedup"] = plan.report()
+    summary["connection_pool"] = http_client.pool_stats()
+    summary["calls_saved"] = dict(verifier.calls_saved)
+    if cache is not None:
+        summary["cache"] = cache.stats()
     
-    with open(os.path.join(output_dir, "verified_leads.json"), "w") as f:
-        json.dump(verified_leads, f, indent=2)
+    verified_leads = []
+    flagged_leads = []
+    for (name, phone, email), result in zip(plan.leads, results):
+        if result["verification_status"]["overall_status"] == "verified":
+            verified_leads.append(lead_record(name, phone, email, result))
+        else:
+            flagged_leads.append(lead_record(name, phone, email, result))
+    
+    return verified_leads, flagged_leads, summary
+
+def save_leads_to_json(verified_leads: List[Dict], flagged_leads: List[Dict], output_dir: str = "results",
+                       compress: bool = False) -> Tuple[str, str]:
+    """
+    Save verified and flagged leads to verified_leads.jsonl and flagged_leads.jsonl.
+    Files are written to a partial path and moved into place once complete.
+    Returns the two file paths.
+    """
+    with LeadSink(output_dir, compress) as sink:
+        for record in verified_leads:
+            sink.add(record, True)
+        for record in flagged_leads:
+            sink.add(record, False)
     
-    with open(os.path.join(output_dir, "flagged_leads.json"), "w") as f:
-        json.dump(flagged_leads, f, indent=2)
+    return sink.verified_path, sink.flagged_path
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,231 @@
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from circuit_breaker import circuit_breakers
+from provider_limits import provider_slot
+from rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Transient statuses worth retrying before reporting a provider error
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Methods retried after a read timeout or one of RETRY_STATUSES; connection errors are retried for any method
+RETRY_METHODS = frozenset(["GET"])
+
+# Default (connect, read) deadlines in seconds for each provider.
+# Override with <PROVIDER>_CONNECT_TIMEOUT and <PROVIDER>_READ_TIMEOUT, e.g. MICROBILT_READ_TIMEOUT=30
+DEFAULT_TIMEOUTS = {
+    "numverify": (3.05, 5.0),
+    "neverbounce": (3.05, 10.0),
+    "microbilt": (3.05, 15.0),
+    "forewarn": (3.05, 10.0)
+}
+
+class DeadlineExceeded(Exception):
+    """
+    Raised instead of sending a request that could not start before the
+    calling thread's deadline (see HttpClient.deadline). Nothing reached the
+    provider, so this is not a provider failure.
+    """
+
+    def __init__(self, provider: str):
+        super().__init__(f"{provider} request not sent: deadline passed before it could start")
+        self.provider = provider
+
+def _env_number(name: str, default, cast=int):
+    value = os.getenv(name)
+    try:
+        return cast(value) if value else default
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value}")
+        return default
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP transport shared by every provider client.
+
+    Each provider gets one HTTPAdapter whose connection pool is reused for every
+    request to that provider's host. Sessions are kept per thread so that cookie
+    and header state is never shared between threads, while the adapters (and
+    therefore the open connections) are shared. Retries, timeouts, rate limiting,
+    concurrency caps and circuit breaking are all applied here.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, max_retries: Optional[int] = None,
+                 timeout: Optional[float] = None, connect_timeout: Optional[float] = None):
+        """
+        Args:
+            pool_size: Connections kept open per provider host
+                       (default: <PROVIDER>_POOL_SIZE, then HTTP_POOL_SIZE, then 10)
+            max_retries: Retries for connection errors, and for GETs also read timeouts
+                         and transient statuses (default: HTTP_MAX_RETRIES, then 2)
+            timeout: Seconds to wait for response data, for every provider
+                     (default: <PROVIDER>_READ_TIMEOUT, then HTTP_TIMEOUT, then DEFAULT_TIMEOUTS)
+            connect_timeout: Seconds to wait for a connection, for every provider
+                             (default: <PROVIDER>_CONNECT_TIMEOUT, then HTTP_CONNECT_TIMEOUT,
+                             then DEFAULT_TIMEOUTS)
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries if max_retries is not None else _env_number("HTTP_MAX_RETRIES", 2)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._adapters: Dict[str, HTTPAdapter] = {}
+        self._request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _pool_size_for(self, provider: str) -> int:
+        if self.pool_size:
+            return self.pool_size
+        return _env_number(f"{provider.upper()}_POOL_SIZE", _env_number("HTTP_POOL_SIZE", 10))
+
+    def timeout_for(self, provider: str) -> Tuple[float, float]:
+        """Return the (connect, read) timeout applied to a provider's requests"""
+        default_connect, default_read = DEFAULT_TIMEOUTS.get(provider, (3.05, 10.0))
+        prefix = provider.upper()
+        connect = self.connect_timeout or _env_number(
+            f"{prefix}_CONNECT_TIMEOUT", _env_number("HTTP_CONNECT_TIMEOUT", default_connect, float), float)
+        read = self.timeout or _env_number(
+            f"{prefix}_READ_TIMEOUT", _env_number("HTTP_TIMEOUT", default_read, float), float)
+        return connect, read
+
+    def _get_adapter(self, provider: str) -> HTTPAdapter:
+        with self._lock:
+            if provider not in self._adapters:
+                # Provider POSTs are paid lookups or create bulk jobs, so they are only
+                # retried when the connection failed and nothing reached the provider;
+                # read timeouts and retryable statuses are retried for GETs alone
+                retry = Retry(
+                    total=self.max_retries,
+                    backoff_factor=0.3,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=RETRY_METHODS,
+                    raise_on_status=False
+                )
+                pool_size = self._pool_size_for(provider)
+                self._adapters[provider] = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            return self._adapters[provider]
+
+    def session(self, provider: str) -> requests.Session:
+        """Return this thread's session for a provider, backed by the shared pool"""
+        sessions = getattr(self._local, "sessions", None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        if provider not in sessions:
+            session = requests.Session()
+            adapter = self._get_adapter(provider)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            sessions[provider] = session
+        return sessions[provider]
+
+    @contextmanager
+    def deadline(self, at: Optional[float]) -> Iterator[None]:
+        """
+        Give this thread's requests a deadline on the time.monotonic() clock.
+
+        A request that is still waiting for its rate limit or a concurrency slot
+        when the deadline passes is dropped with DeadlineExceeded instead of
+        being sent. Requests already sent run to their own read timeout.
+        """
+        previous = getattr(self._local, "deadline", None)
+        self._local.deadline = at
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def _time_left(self, provider: str) -> Optional[float]:
+        """Seconds until this thread's deadline (None without one); raises once it has passed"""
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(provider)
+        return remaining
+
+    def request(self, provider: str, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request to a provider, honouring its rate limit, concurrency cap
+        and connect/read deadlines.
+
+        Raises CircuitOpenError without sending anything while the provider's
+        circuit is open, and DeadlineExceeded without sending anything when the
+        thread's deadline passes before the request could start.
+        """
+        kwargs.setdefault("timeout", self.timeout_for(provider))
+        self._time_left(provider)
+        breaker = circuit_breakers.get(provider) if circuit_breakers.enabled else None
+        generation = breaker.before_call() if breaker is not None else None
+        start = None
+        try:
+            # Don't take a rate limit token or a slot the request would have to wait past its deadline for
+            if rate_limiter.acquire(provider, timeout=self._time_left(provider)) is None:
+                raise DeadlineExceeded(provider)
+            with ExitStack() as slot:
+                try:
+                    slot.enter_context(provider_slot(provider, timeout=self._time_left(provider)))
+                except TimeoutError:
+                    raise DeadlineExceeded(provider) from None
+                self._time_left(provider)
+                with self._lock:
+                    self._request_counts[provider] = self._request_counts.get(provider, 0) + 1
+                start = time.monotonic()
+                response = self.session(provider).request(method, url, **kwargs)
+        except DeadlineExceeded:
+            if breaker is not None:
+                breaker.release(generation)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.record(False, time.monotonic() - start if start is not None else 0.0, generation)
+            raise
+        if breaker is not None:
+            # Server errors and throttling are the provider's fault; 4xx answers are not
+            failed = response.status_code >= 500 or response.status_code == 429
+            breaker.record(not failed, time.monotonic() - start, generation)
+        return response
+
+    def get(self, provider: str, url: str, **kwargs) -> requests.Response:
+        return self.request(provider, "GET", url, **kwargs)
+
+    def post(self, provider: str, url: str, **kwargs) -> requests.Response:
+        return self.request(provider, "POST", url, **kwargs)
+
+    def pool_stats(self) -> Dict[str, Dict]:
+        """
+        Report connection reuse for each provider.
+
+        Returns:
+            A mapping of provider to requests sent, connections opened and how
+            many requests were served over an already-open connection
+        """
+        stats = {}
+        with self._lock:
+            adapters = dict(self._adapters)
+            counts = dict(self._request_counts)
+        for provider, adapter in adapters.items():
+            pools = adapter.poolmanager.pools
+            connections = sum(pools[key].num_connections for key in pools.keys())
+            total = counts.get(provider, 0)
+            reused = max(0, total - connections)
+            stats[provider] = {
+                "requests": total,
+                "connections_opened": connections,
+                "reused": reused,
+                "reuse_ratio": round(reused / total, 3) if total else 0.0
+            }
+        return stats
+
+# Process-wide client shared by every provider integration
+http_client = HttpClient()
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from verification_store import SQLiteStore
+
+JOB_COLUMNS = ("id", "status", "total", "processed", "verified", "flagged",
+               "created_at", "started_at", "finished_at", "error")
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    "id TEXT PRIMARY KEY, status TEXT NOT NULL, total INTEGER NOT NULL, "
+    "processed INTEGER NOT NULL DEFAULT 0, verified INTEGER NOT NULL DEFAULT 0, flagged INTEGER NOT NULL DEFAULT 0, "
+    "created_at REAL NOT NULL, started_at REAL, finished_at REAL, error TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)",
+    # seq numbers a job's results in completion order, starting at 1
+    "CREATE TABLE IF NOT EXISTS job_results ("
+    "job_id TEXT NOT NULL, seq INTEGER NOT NULL, row_index INTEGER NOT NULL, verified INTEGER NOT NULL, "
+    "result TEXT NOT NULL, PRIMARY KEY (job_id, seq))"
+]
+
+class JobStore(SQLiteStore):
+    """
+    Batch verification jobs and their per-lead results.
+
+    Lives in the same SQLite database as the verification history, so job
+    progress and results outlive the request that started the job and are
+    visible to every worker process.
+    """
+
+    schema = SCHEMA
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        # Wakes wait_for_results when a job in this process makes progress
+        self._changed = threading.Condition()
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+    def create_job(self, total: int) -> str:
+        """Record a new queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, total, created_at) VALUES (?, 'queued', ?, ?)",
+                (job_id, total, time.time())
+            )
+        return job_id
+
+    def start_job(self, job_id: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def finish_job(self, job_id: str, error: Optional[str] = None) -> None:
+        """Mark a job completed, or failed when an error is given"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                ("failed" if error else "completed", time.time(), error, job_id)
+            )
+        self._notify()
+
+    def add_result(self, job_id: str, row_index: int, result: Dict, verified: bool) -> int:
+        """Store one lead's result, update the job's counters and return the result's seq"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET processed = processed + 1, verified = verified + ?, flagged = flagged + ? "
+                "WHERE id = ?",
+                (int(verified), int(not verified), job_id)
+            )
+            seq = conn.execute("SELECT processed FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO job_results (job_id, seq, row_index, verified, result) VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, row_index, int(verified), json.dumps(result))
+            )
+        self._notify()
+        return seq
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job status and counters with throughput so far, or None"""
+        row = self._connection().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        elapsed = 0.0
+        if job["started_at"]:
+            elapsed = (job["finished_at"] or time.time()) - job["started_at"]
+        job["elapsed_seconds"] = round(elapsed, 3)
+        job["leads_per_second"] = round(job["processed"] / elapsed, 2) if elapsed > 0 else 0.0
+        return job
+
+    def get_results(self, job_id: str, after: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Results with seq greater than after, in completion order"""
+        sql = ("SELECT seq, row_index, verified, result FROM job_results "
+               "WHERE job_id = ? AND seq > ? ORDER BY seq")
+        params: List = [job_id, after]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {"seq": seq, "row": row_index, "verified": bool(verified), "result": json.loads(result)}
+            for seq, row_index, verified, result in self._connection().execute(sql, params)
+        ]
+
+    def wait_for_results(self, job_id: str, after: int, timeout: float, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Results with seq greater than after, waiting up to timeout seconds for
+        some to arrive. Jobs run by this process wake the wait immediately;
+        progress made by other worker processes is seen when the wait times out.
+        """
+        # Holding the condition while checking means a notify cannot slip in unseen
+        with self._changed:
+            results = self.get_results(job_id, after, limit)
+            if results:
+                return results
+            self._changed.wait(timeout)
+        return self.get_results(job_id, after, limit)
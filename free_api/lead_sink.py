@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+import time
+from typing import Dict
+
+# Records are flushed to disk at least this often, so a crash loses little
+DEFAULT_FLUSH_INTERVAL = float(os.getenv("LEAD_SINK_FLUSH_INTERVAL", "5"))
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+class JsonlWriter:
+    """
+    Appends records to a JSON Lines file as they are produced.
+
+    Records go to "<path>.partial" through a buffered (optionally gzip) stream
+    that is flushed every few seconds. close() renames the partial file into
+    place, so the final path only ever holds a complete run; if the process
+    dies first, everything flushed so far is still on disk in the partial file.
+    """
+
+    def __init__(self, path: str, compress: bool = False, append: bool = False,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Args:
+            path: Final file path (".gz" is added when compressing)
+            compress: Write gzip-compressed JSON Lines
+            append: Continue an existing partial file instead of starting over
+            buffer_size: Bytes buffered in memory between writes to disk
+            flush_interval: Seconds between forced flushes
+        """
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.path = path
+        self.partial_path = path + ".partial"
+        self.flush_interval = flush_interval
+        self.count = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        mode = "ab" if append else "wb"
+        self._raw = open(self.partial_path, mode, buffering=buffer_size)
+        self._file = gzip.GzipFile(fileobj=self._raw, mode=mode) if compress else self._raw
+        self._last_flush = time.monotonic()
+
+    def write(self, record: Dict) -> None:
+        self._file.write(json.dumps(record).encode("utf-8") + b"\n")
+        self.count += 1
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self._file is not self._raw:
+            self._raw.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self, finalize: bool = True) -> None:
+        """Flush and close; with finalize, atomically move the partial file to its final path"""
+        if self._raw.closed:
+            return
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        if finalize:
+            os.replace(self.partial_path, self.path)
+
+class LeadSink:
+    """
+    Writes verified and flagged leads to verified_leads.jsonl and
+    flagged_leads.jsonl as each result is produced, so memory stays flat
+    however large the run.
+
+    Use as a context manager: on a clean exit both files are finalized; if an
+    exception escapes, the partial files are left in place for inspection or
+    for a resumed run to append to.
+    """
+
+    def __init__(self, output_dir: str, compress: bool = False, append: bool = False):
+        self.output_dir = output_dir
+        self.verified = JsonlWriter(os.path.join(output_dir, "verified_leads.jsonl"), compress, append)
+        self.flagged = JsonlWriter(os.path.join(output_dir, "flagged_leads.jsonl"), compress, append)
+
+    @property
+    def verified_path(self) -> str:
+        return self.verified.path
+
+    @property
+    def flagged_path(self) -> str:
+        return self.flagged.path
+
+    def add(self, record: Dict, verified: bool) -> None:
+        (self.verified if verified else self.flagged).write(record)
+
+    def close(self, finalize: bool = True) -> None:
+        self.verified.close(finalize)
+        self.flagged.close(finalize)
+
+    def __enter__(self) -> "LeadSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(finalize=exc_type is None)
+
+def read_jsonl(path: str):
+    """
+    Yield records from a JSON Lines file written by JsonlWriter, plain or gzip.
+
+    A gzip partial file cut off by a crash is read up to its last flush.
+    """
+    opener = gzip.open if path.endswith((".gz", ".gz.partial")) else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            return
@@ -0,0 +1,92 @@
+import itertools
+import threading
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+
+# Number of status polls a bulk job reports "running" before it completes
+POLLS_BEFORE_COMPLETE = 1
+
+# In-memory bulk jobs: job_id -> {"emails": [...], "polls": int}
+JOBS = {}
+_job_ids = itertools.count(1)
+_lock = threading.Lock()
+
+def _verdict(email):
+    """Deterministic stand-in for a NeverBounce verification result"""
+    local = email.split("@")[0].lower()
+    if "invalid" in local or "bounce" in local:
+        return {"result": "invalid", "flags": ["has_dns"], "suggested_correction": ""}
+    if "catchall" in local:
+        return {"result": "catchall", "flags": ["has_dns", "has_dns_mx"], "suggested_correction": ""}
+    return {"result": "valid", "flags": ["has_dns", "has_dns_mx", "smtp_connectable"], "suggested_correction": ""}
+
+def _params():
+    return request.get_json(silent=True) or request.values
+
+def _check_key(params):
+    if not params.get("key"):
+        return jsonify({"status": "auth_failure", "message": "Invalid API key"})
+    return None
+
+@app.route('/v4/single/check', methods=['GET', 'POST'])
+def single_check():
+    params = _params()
+    error = _check_key(params)
+    if error:
+        return error
+    verdict = _verdict(params.get("email", ""))
+    return jsonify(dict(verdict, status="success", execution_time=5))
+
+@app.route('/v4/jobs/create', methods=['POST'])
+def create_job():
+    params = _params()
+    error = _check_key(params)
+    if error:
+        return error
+    emails = [row["email"] if isinstance(row, dict) else row[0] for row in params.get("input", [])]
+    with _lock:
+        job_id = next(_job_ids)
+        JOBS[job_id] = {"emails": emails, "polls": 0}
+    return jsonify({"status": "success", "job_id": job_id, "execution_time": 5})
+
+@app.route('/v4/jobs/status', methods=['GET'])
+def job_status():
+    error = _check_key(request.args)
+    if error:
+        return error
+    job = JOBS.get(int(request.args.get("job_id", 0)))
+    if job is None:
+        return jsonify({"status": "general_failure", "message": "Job not found"})
+    with _lock:
+        job["polls"] += 1
+        complete = job["polls"] > POLLS_BEFORE_COMPLETE
+    return jsonify({
+        "status": "success",
+        "job_status": "complete" if complete else "running",
+        "total": {"records": len(job["emails"]), "processed": len(job["emails"]) if complete else 0}
+    })
+
+@app.route('/v4/jobs/results', methods=['GET'])
+def job_results():
+    error = _check_key(request.args)
+    if error:
+        return error
+    job = JOBS.get(int(request.args.get("job_id", 0)))
+    if job is None:
+        return jsonify({"status": "general_failure", "message": "Job not found"})
+    page = int(request.args.get("page", 1))
+    per_page = int(request.args.get("items_per_page", 10))
+    emails = job["emails"]
+    total_pages = max(1, -(-len(emails) // per_page))
+    page_emails = emails[(page - 1) * per_page:page * per_page]
+    return jsonify({
+        "status": "success",
+        "total_results": len(emails),
+        "total_pages": total_pages,
+        "query": {"job_id": int(request.args.get("job_id")), "page": page, "items_per_page": per_page},
+        "results": [{"data": {"email": email}, "verification": _verdict(email)} for email in page_emails]
+    })
+
+if __name__ == '__main__':
+    app.run(debug=True, port=5001)
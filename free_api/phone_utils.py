@@ -0,0 +1,58 @@
+import re
+from typing import Optional, Tuple
+
+# Country code for the North American Numbering Plan (US, Canada and the Caribbean)
+NANP_COUNTRY_CODE = "1"
+
+_NON_DIGITS = re.compile(r"\D")
+
+def digits_only(phone: str) -> str:
+    """Strip everything except digits from a phone number"""
+    return _NON_DIGITS.sub("", phone or "")
+
+def national_number(phone: str) -> str:
+    """Return the 10-digit NANP national number, dropping a leading country code"""
+    digits = digits_only(phone)
+    if len(digits) == 11 and digits.startswith(NANP_COUNTRY_CODE):
+        return digits[1:]
+    return digits
+
+def validate_nanp(phone: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a phone number against the NANP numbering rules without any network call.
+
+    Area (NPA) and exchange (NXX) codes must start with 2-9 and may not be N11
+    service codes such as 411 or 911.
+
+    Returns:
+        A tuple (valid, reason) where reason explains why an invalid number was rejected
+    """
+    number = national_number(phone)
+    if len(number) != 10:
+        return False, "invalid_length"
+
+    area_code, exchange = number[:3], number[3:6]
+    if area_code[0] in "01":
+        return False, "invalid_area_code"
+    if area_code[1:] == "11":
+        return False, "n11_area_code"
+    if exchange[0] in "01":
+        return False, "invalid_exchange_code"
+    if exchange[1:] == "11":
+        return False, "n11_exchange_code"
+    return True, None
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """
+    Normalize a NANP phone number to E.164 (e.g. +12125551234).
+
+    Returns None when the number cannot be a valid NANP number.
+    """
+    valid, _ = validate_nanp(phone)
+    if not valid:
+        return None
+    return f"+{NANP_COUNTRY_CODE}{national_number(phone)}"
+
+def phone_key(phone: str) -> str:
+    """Canonical key for caching and deduplication: E.164 when valid, otherwise the raw digits"""
+    return normalize_phone(phone) or digits_only(phone)
@@ -0,0 +1,45 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Default number of requests allowed in flight at once for each provider.
+# Override with <PROVIDER>_MAX_CONCURRENCY, e.g. NEVERBOUNCE_MAX_CONCURRENCY=10
+DEFAULT_CONCURRENCY = {
+    "numverify": 4,
+    "neverbounce": 8,
+    "microbilt": 4,
+    "forewarn": 4
+}
+
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+def get_concurrency_limit(provider: str) -> int:
+    """Return the configured in-flight request cap for a provider"""
+    default = DEFAULT_CONCURRENCY.get(provider, 4)
+    value = os.getenv(f"{provider.upper()}_MAX_CONCURRENCY")
+    try:
+        return max(1, int(value)) if value else default
+    except ValueError:
+        return default
+
+def _get_semaphore(provider: str) -> threading.BoundedSemaphore:
+    with _lock:
+        if provider not in _semaphores:
+            _semaphores[provider] = threading.BoundedSemaphore(get_concurrency_limit(provider))
+        return _semaphores[provider]
+
+@contextmanager
+def provider_slot(provider: str, timeout: Optional[float] = None):
+    """
+    Hold one of the provider's concurrency slots for the duration of a request.
+    Raises TimeoutError if no slot frees up within timeout seconds.
+    """
+    semaphore = _get_semaphore(provider)
+    if not semaphore.acquire(timeout=None if timeout is None else max(0.0, timeout)):
+        raise TimeoutError(f"No {provider} request slot free within {timeout:.1f}s")
+    try:
+        yield
+    finally:
+        semaphore.release()
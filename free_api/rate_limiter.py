@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `burst`. A caller only
+    sleeps when the bucket is empty, and then only for as long as it takes the
+    next token to arrive.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum number of requests that may be sent back to back
+                   (default: one second's worth of tokens, at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take tokens from the bucket and return how long the caller must wait, or
+        None (taking nothing) when that would be longer than max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            # The deficit is paid back by future refills, so concurrent callers queue up fairly
+            wait = (tokens - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Block until the requested tokens are available and return the time spent waiting.
+        With a timeout, return None straight away if the tokens would take longer to arrive.
+        """
+        wait = self._reserve(tokens, timeout)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+class RateLimiter:
+    """One token bucket per provider, configured from the environment"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Args:
+            limits: Optional mapping of provider to {"rate": ..., "burst": ...}.
+                    Providers not listed read <PROVIDER>_RATE_LIMIT (requests per
+                    second) and <PROVIDER>_RATE_BURST from the environment. A
+                    provider without a configured rate is not throttled.
+        """
+        self._limits = limits or {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _load_config(self, provider: str) -> Dict[str, float]:
+        if provider in self._limits:
+            return self._limits[provider]
+        prefix = provider.upper()
+        try:
+            return {
+                "rate": float(os.getenv(f"{prefix}_RATE_LIMIT", "0") or 0),
+                "burst": float(os.getenv(f"{prefix}_RATE_BURST", "0") or 0)
+            }
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit settings for {provider}")
+            return {"rate": 0, "burst": 0}
+
+    def get_bucket(self, provider: str) -> Optional[TokenBucket]:
+        """Return the provider's bucket, or None if the provider is unlimited"""
+        with self._lock:
+            if provider not in self._buckets:
+                config = self._load_config(provider)
+                rate = config.get("rate", 0)
+                self._buckets[provider] = TokenBucket(rate, config.get("burst")) if rate > 0 else None
+            return self._buckets[provider]
+
+    def configure(self, provider: str, rate: float, burst: Optional[float] = None) -> None:
+        """Set or replace the limit for a provider (rate <= 0 disables throttling)"""
+        with self._lock:
+            self._limits[provider] = {"rate": rate, "burst": burst or 0}
+            self._buckets[provider] = TokenBucket(rate, burst) if rate > 0 else None
+
+    def acquire(self, provider: str, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Wait until a request to the provider fits within its quota. With a
+        timeout, return None without waiting if it would not fit in time.
+        """
+        bucket = self.get_bucket(provider)
+        if bucket is None:
+            return 0.0
+        waited = bucket.acquire(timeout=timeout)
+        if waited:
+            logger.debug(f"Rate limited {provider} request for {waited:.3f}s")
+        return waited
+
+# Process-wide limiter shared by every provider client
+rate_limiter = RateLimiter()
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Journal entries are flushed to the OS at least this often
+DEFAULT_FLUSH_INTERVAL = float(os.getenv("RUN_JOURNAL_FLUSH_INTERVAL", "1"))
+
+JOURNAL_FILENAME = "run_journal.jsonl"
+
+def row_key(index: int, *values: str) -> str:
+    """Identify an input row by its position and a hash of its contents"""
+    digest = hashlib.sha1("\x1f".join(str(value) for value in values).encode("utf-8")).hexdigest()[:16]
+    return f"{index}:{digest}"
+
+class RunJournal:
+    """
+    Append-only record of the input rows a run has finished, with their results.
+
+    Each finished row costs one buffered line write. When a run is resumed,
+    rows already in the journal are skipped and their results replayed into
+    the output, so a crash only loses the lookups made since the last flush.
+    A row is matched by offset and content hash, so an edited input file is
+    not mistaken for the one the journal was written against.
+
+    Only the keys written by earlier attempts are held in memory, and each is
+    dropped once is_done has matched it, so memory does not grow with the rows
+    this run finishes. Callers ask about each row once, in input order.
+    """
+
+    def __init__(self, path: str, resume: bool = False, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Args:
+            path: Journal file
+            resume: Continue an existing journal instead of starting a new one
+            flush_interval: Seconds between flushes to the OS
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        # Keys finished by earlier attempts that this run has not reached yet
+        self.completed = set()
+        self.resumed = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and os.path.exists(path):
+            for entry in self._entries():
+                self.completed.add(entry["key"])
+            self.resumed = len(self.completed)
+            logger.info(f"Resuming run: {self.resumed} rows already done")
+
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if self._file.tell() and not self._ends_with_newline():
+            # Terminate the entry cut short by the crash so new entries start cleanly
+            self._file.write("\n")
+        self._last_flush = time.monotonic()
+
+    def _entries(self) -> Iterator[Dict]:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # The last line may be cut short if the run died mid-write
+                    continue
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def is_done(self, key: str) -> bool:
+        """Whether an earlier attempt finished this row; each row should be asked about once"""
+        if key in self.completed:
+            self.completed.discard(key)
+            return True
+        return False
+
+    def replay(self) -> Iterator[Tuple[Dict, bool]]:
+        """Yield (record, verified) for every row finished by earlier attempts"""
+        self.flush()
+        for entry in self._entries():
+            yield entry["record"], entry["verified"]
+
+    def record(self, key: str, record: Dict, verified: bool) -> None:
+        """Mark a row as done"""
+        self._file.write(json.dumps({"key": key, "verified": verified, "record": record}) + "\n")
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self, remove: bool = False) -> None:
+        """Close the journal; remove it once the run's output has been finalized"""
+        if not self._file.closed:
+            self._file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
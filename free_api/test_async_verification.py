@@ -0,0 +1,177 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import free_lead_verification
+from free_lead_verification import CheckPool, CheckPoolFull, LeadVerifier
+from rate_limiter import rate_limiter
+from async_lead_verification import AsyncLeadVerifier, verify_lead_concurrently
+
+class _NumverifyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        body = json.dumps({"valid": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def slow(result, delay=0.2):
+    def call(*args):
+        time.sleep(delay)
+        return result
+    return call
+
+class TestAsyncLeadVerifier(unittest.TestCase):
+    def setUp(self):
+        self.verifier = LeadVerifier()
+        self.verifier.verify_phone = MagicMock(side_effect=slow({"valid": True}))
+        self.verifier.verify_email = MagicMock(side_effect=slow({"result": "valid"}))
+        self.verifier.check_background = MagicMock(side_effect=slow({"status": "ok"}))
+
+    def test_checks_run_concurrently(self):
+        start = time.perf_counter()
+        result = asyncio.run(AsyncLeadVerifier(self.verifier).verify_lead("John Doe", "2125551234", "john@example.com"))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(result["verification_status"]["overall_status"], "verified")
+        self.verifier.check_background.assert_called_once_with("John Doe", "2125551234", "john@example.com")
+
+    def test_matches_sequential_result(self):
+        expected = self.verifier.verify_lead("John Doe", "2125551234", "john@example.com")
+        result = verify_lead_concurrently("John Doe", "2125551234", "john@example.com", self.verifier)
+        self.assertEqual(result, expected)
+
+    def test_verify_leads_keeps_order(self):
+        self.verifier.verify_email = MagicMock(side_effect=lambda email: {"result": "valid" if "good" in email else "invalid"})
+        leads = [
+            ("Good Lead", "2125551234", "good@example.com"),
+            ("Bad Lead", "2125554321", "bad@example.com")
+        ]
+        results = asyncio.run(AsyncLeadVerifier(self.verifier).verify_leads(leads))
+        self.assertEqual([r["verification_status"]["overall_status"] for r in results], ["verified", "flagged"])
+
+class TestLeadTimeBudget(unittest.TestCase):
+    def setUp(self):
+        self.verifier = LeadVerifier(time_budget=0.3)
+        self.verifier.verify_phone = MagicMock(side_effect=slow({"valid": True}, 0.05))
+        self.verifier.verify_email = MagicMock(side_effect=slow({"result": "valid"}, 0.05))
+        self.verifier.check_background = MagicMock(side_effect=slow({"status": "ok"}, 1))
+
+    def assert_partial(self, result):
+        status = result["verification_status"]
+        self.assertEqual(status["overall_status"], "partial")
+        self.assertEqual(status["missing_checks"], ["background_check"])
+        self.assertEqual(status["risk_factors"], ["checks_timed_out"])
+        self.assertTrue(result["background_check"]["timed_out"])
+        self.assertEqual(result["email_verification"], {"result": "valid"})
+
+    def test_slow_check_gives_partial_result(self):
+        start = time.perf_counter()
+        result = self.verifier.verify_lead("John Doe", "2125551234", "john@example.com")
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assert_partial(result)
+
+    def test_async_verifier_honours_budget(self):
+        async def timed():
+            start = time.perf_counter()
+            result = await AsyncLeadVerifier(self.verifier).verify_lead("John Doe", "2125551234", "john@example.com")
+            return result, time.perf_counter() - start
+
+        # asyncio.run waits for the abandoned check's thread on exit, so time the lead itself
+        result, elapsed = asyncio.run(timed())
+        self.assertLess(elapsed, 0.6)
+        self.assert_partial(result)
+
+    def test_real_failures_still_flag(self):
+        self.verifier.verify_phone = MagicMock(return_value={"valid": False})
+        result = self.verifier.verify_lead("John Doe", "2125551234", "john@example.com")
+        self.assertEqual(result["verification_status"]["overall_status"], "flagged")
+        self.assertEqual(result["verification_status"]["risk_factors"], ["invalid_phone", "checks_timed_out"])
+
+    def test_requests_not_sent_in_budget_are_dropped(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _NumverifyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        # One Numverify request a second, so most leads can't get theirs sent within the budget
+        rate_limiter.configure("numverify", rate=1, burst=1)
+        self.addCleanup(rate_limiter.configure, "numverify", 0)
+
+        verifier = LeadVerifier(time_budget=0.5)
+        verifier.numverify_url = f"http://127.0.0.1:{server.server_address[1]}"
+        verifier.verify_email = MagicMock(return_value={"result": "valid"})
+        verifier.check_background = MagicMock(return_value={"status": "ok"})
+        phones = [f"212555{index:04d}" for index in range(1, 6)]
+
+        start = time.perf_counter()
+        with patch.object(free_lead_verification, "NUMVERIFY_API_KEY", "key"), ThreadPoolExecutor(5) as pool:
+            results = list(pool.map(lambda phone: verifier.verify_lead("John Doe", phone, "john@example.com"),
+                                    phones))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        timed_out = [r for r in results if r["verification_status"]["missing_checks"] == ["phone_verification"]]
+        self.assertGreaterEqual(len(timed_out), 3)
+        # Nothing is sent for the leads that gave up, even once tokens become available
+        time.sleep(1.5)
+        self.assertEqual(_NumverifyHandler.requests_seen, len(results) - len(timed_out))
+
+class TestCheckPool(unittest.TestCase):
+    def test_every_check_gets_a_thread(self):
+        pool = CheckPool(min_workers=4)
+        started = threading.Barrier(20, timeout=2)
+        futures = [pool.submit(started.wait) for _ in range(20)]
+        # All 20 checks run at once, so none waits in a queue behind the others
+        for future in futures:
+            future.result(timeout=3)
+        self.assertGreaterEqual(pool.size, 20)
+        # Done callbacks may still be running just after the results arrive
+        deadline = time.monotonic() + 1
+        while pool.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(pool.running, 0)
+
+    def wait_until_idle(self, pool):
+        deadline = time.monotonic() + 1
+        while pool.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_burst_is_capped_and_shrinks_back(self):
+        pool = CheckPool(min_workers=4, max_workers=8)
+        release = threading.Event()
+        futures = [pool.submit(release.wait, 2) for _ in range(8)]
+        self.assertEqual(pool.size, 8)
+        # Past the cap, checks fail fast instead of queueing or growing the pool
+        with self.assertRaises(CheckPoolFull):
+            pool.submit(release.wait, 2)
+        self.assertEqual(pool.running, 8)
+
+        release.set()
+        for future in futures:
+            future.result(timeout=3)
+        self.wait_until_idle(pool)
+        pool.submit(time.sleep, 0).result(timeout=1)
+        self.assertEqual(pool.size, 4)
+
+    def test_full_pool_times_checks_out(self):
+        verifier = LeadVerifier(time_budget=1)
+        with patch.object(free_lead_verification._check_pool, "submit", side_effect=CheckPoolFull("full")):
+            result = verifier.verify_lead("John Doe", "2125551234", "john@example.com")
+        self.assertEqual(result["verification_status"]["missing_checks"],
+                         ["phone_verification", "email_verification", "background_check"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from batch_jobs import BatchJobRunner
+from job_store import JobStore
+
+class TestBatchJobs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.jobs = JobStore(os.path.join(self.tmpdir, "jobs.sqlite3"))
+
+    def tearDown(self):
+        self.jobs.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_results_are_numbered_in_completion_order(self):
+        job_id = self.jobs.create_job(2)
+        self.jobs.start_job(job_id)
+        self.assertEqual(self.jobs.add_result(job_id, 1, {"email": "b"}, False), 1)
+        self.assertEqual(self.jobs.add_result(job_id, 0, {"email": "a"}, True), 2)
+
+        job = self.jobs.get_job(job_id)
+        self.assertEqual((job["status"], job["processed"], job["verified"], job["flagged"]), ("running", 2, 1, 1))
+        self.assertEqual([r["row"] for r in self.jobs.get_results(job_id)], [1, 0])
+        self.assertEqual(self.jobs.get_results(job_id, after=1), [
+            {"seq": 2, "row": 0, "verified": True, "result": {"email": "a"}}
+        ])
+        self.assertIsNone(self.jobs.get_job("missing"))
+
+    def test_wait_for_results_wakes_on_new_result(self):
+        job_id = self.jobs.create_job(1)
+        timer = threading.Timer(0.05, self.jobs.add_result, (job_id, 0, {"email": "a"}, True))
+        timer.start()
+
+        started = time.monotonic()
+        results = self.jobs.wait_for_results(job_id, 0, timeout=5)
+        timer.join()
+
+        self.assertEqual([r["seq"] for r in results], [1])
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.jobs.wait_for_results(job_id, 1, timeout=0.01), [])
+
+    def test_runner_processes_leads_in_background(self):
+        release = threading.Event()
+
+        def handle_lead(lead, verifier):
+            release.wait(5)
+            return {"email": lead["email"], "status": "valid" if "good" in lead["email"] else "invalid"}
+
+        runner = BatchJobRunner(self.jobs, handle_lead, lambda result: result["status"] == "valid", max_workers=2)
+        leads = [{"email": "good@example.com"}, {"email": "bad@example.com"}, {"email": "good2@example.com"}]
+        job_id = runner.submit(leads)
+
+        # submit() returns before any lead has been verified
+        self.assertEqual(self.jobs.get_job(job_id)["processed"], 0)
+        release.set()
+        runner.shutdown()
+
+        job = self.jobs.get_job(job_id)
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual((job["verified"], job["flagged"]), (2, 1))
+        self.assertEqual(sorted(r["row"] for r in self.jobs.get_results(job_id)), [0, 1, 2])
+
+    def test_failing_lead_is_recorded_and_job_continues(self):
+        def handle_lead(lead, verifier):
+            if lead["email"] == "bad@example.com":
+                raise RuntimeError("provider outage")
+            return {"email": lead["email"], "status": "valid"}
+
+        runner = BatchJobRunner(self.jobs, handle_lead, lambda result: result["status"] == "valid", max_workers=1)
+        job_id = runner.submit([{"email": "a@example.com"}, {"email": "bad@example.com"}, {"email": "c@example.com"}])
+        runner.shutdown()
+
+        job = self.jobs.get_job(job_id)
+        self.assertEqual((job["status"], job["processed"], job["verified"], job["flagged"]), ("completed", 3, 2, 1))
+        failed = [r for r in self.jobs.get_results(job_id) if r["row"] == 1][0]
+        self.assertEqual(failed["result"], {"error": "provider outage", "lead": {"email": "bad@example.com"}})
+        self.assertFalse(failed["verified"])
+
+    def test_runner_marks_failed_jobs(self):
+        handled = []
+
+        def handle_lead(lead, verifier):
+            handled.append(lead)
+            return {"email": lead["email"]}
+
+        runner = BatchJobRunner(self.jobs, handle_lead, lambda result: True, max_workers=1)
+        with patch.object(self.jobs, "add_result", side_effect=RuntimeError("disk full")):
+            job_id = runner.submit([{"email": f"{n}@example.com"} for n in range(20)])
+            runner.shutdown()
+
+        job = self.jobs.get_job(job_id)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "disk full")
+        # Leads not yet started when the job failed are not verified
+        self.assertLess(len(handled), 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from batch_planner import BatchPlan, RequestCoalescer
+from free_lead_verification import LeadVerifier, process_new_leads_batch
+
+class TestBatchPlanner(unittest.TestCase):
+    def test_groups_rows_by_normalized_contact(self):
+        plan = BatchPlan([
+            ("John Doe", "(212) 555-1234", "John@Example.com"),
+            ("Jane Doe", "212.555.1234", "john@example.com"),
+            ("john  doe", "+1 212 555 1234", "JOHN@example.com")
+        ])
+        report = plan.report()
+        self.assertEqual(report["unique_phones"], 1)
+        self.assertEqual(report["unique_emails"], 1)
+        self.assertEqual(report["unique_backgrounds"], 2)
+        self.assertEqual(report["lookups_planned"], 4)
+        self.assertEqual(report["dedup_ratio"], round(1 - 4 / 9, 3))
+
+    def test_coalescer_runs_concurrent_lookups_once(self):
+        coalescer = RequestCoalescer()
+        fetch = MagicMock(side_effect=lambda: time.sleep(0.05) or {"valid": True})
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(coalescer.get_or_fetch("numverify", "+12125551234", fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        fetch.assert_called_once()
+        self.assertEqual(results, [{"valid": True}] * 5)
+        self.assertEqual(coalescer.stats(), {"lookups_performed": 1, "lookups_coalesced": 4})
+
+    def test_bounded_coalescer_forgets_oldest_lookups(self):
+        coalescer = RequestCoalescer(max_entries=2)
+        fetch = MagicMock(return_value={"valid": True})
+        for key in ("a", "b", "c", "a"):
+            coalescer.get_or_fetch("numverify", key, fetch)
+
+        # "a" was evicted by "c", so it is looked up again
+        self.assertEqual(fetch.call_count, 4)
+        self.assertEqual(len(coalescer._results), 2)
+
+    def test_bounded_coalescer_evicts_only_past_max_entries(self):
+        coalescer = RequestCoalescer(max_entries=3)
+        fetch = MagicMock(return_value={"valid": True})
+        for key in ("a", "b", "c"):
+            coalescer.get_or_fetch("numverify", key, fetch)
+        # Exactly max_entries lookups are all kept
+        coalescer.get_or_fetch("numverify", "a", fetch)
+        self.assertEqual(fetch.call_count, 3)
+
+        coalescer.prime("neverbounce", "d@example.com", {"result": "valid"})
+        self.assertEqual(list(coalescer._results), [
+            ("numverify", "b"), ("numverify", "c"), ("neverbounce", "d@example.com")
+        ])
+        self.assertEqual(coalescer.get_or_fetch("neverbounce", "d@example.com", fetch), {"result": "valid"})
+        self.assertEqual(fetch.call_count, 3)
+
+    def test_raised_lookups_are_run_again(self):
+        coalescer = RequestCoalescer()
+        fetch = MagicMock(side_effect=[TimeoutError("dropped"), {"valid": True}])
+        with self.assertRaises(TimeoutError):
+            coalescer.get_or_fetch("numverify", "a", fetch)
+        self.assertEqual(coalescer.get_or_fetch("numverify", "a", fetch), {"valid": True})
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_unbounded_coalescer_keeps_every_lookup(self):
+        coalescer = RequestCoalescer()
+        fetch = MagicMock(return_value={"valid": True})
+        for key in range(100):
+            coalescer.get_or_fetch("numverify", str(key), fetch)
+        self.assertEqual(len(coalescer._results), 100)
+
+    def test_batch_fans_results_out_to_every_row(self):
+        verify_phone = MagicMock(return_value={"valid": True})
+        verify_email = MagicMock(return_value={"result": "valid"})
+        check_background = MagicMock(return_value={"status": "ok"})
+        leads = [("John Doe", "2125551234", "john@example.com")] * 4 + [("Jane Roe", "2125554321", "jane@example.com")]
+
+        with patch.object(LeadVerifier, "_verify_phone", verify_phone), \
+                patch.object(LeadVerifier, "_verify_email", verify_email), \
+                patch.object(LeadVerifier, "_check_background", check_background):
+            verified, flagged, summary = process_new_leads_batch(leads, max_workers=4)
+
+        self.assertEqual(len(verified), 5)
+        self.assertEqual(verify_phone.call_count, 2)
+        self.assertEqual(verify_email.call_count, 2)
+        self.assertEqual(check_background.call_count, 2)
+        self.assertEqual(summary["dedup"]["lookups_planned"], 6)
+
+if __name__ == '__main__':
+    unittest.main()
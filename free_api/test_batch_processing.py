@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from batch_runner import run_batch
+from provider_limits import provider_slot
+import free_lead_verification
+from free_lead_verification import iter_verified_leads, process_new_leads_batch
+
+class TestBatchProcessing(unittest.TestCase):
+    def test_run_batch_keeps_input_order(self):
+        def work(n):
+            time.sleep(0.01 * (5 - n))
+            return n * 10
+        results, summary = run_batch(range(5), work, max_workers=5)
+        self.assertEqual(results, [0, 10, 20, 30, 40])
+        self.assertEqual(summary["leads"], 5)
+        self.assertGreater(summary["leads_per_second"], 0)
+        self.assertIn("p95", summary["latency_ms"])
+
+    @patch.dict('os.environ', {"TESTPROVIDER_MAX_CONCURRENCY": "2"})
+    def test_provider_slot_caps_concurrency(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(_):
+            with provider_slot("testprovider"):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+
+        run_batch(range(10), work, max_workers=10)
+        self.assertEqual(max(peak), 2)
+
+    def test_process_new_leads_batch_splits_in_order(self):
+        leads = [
+            ("Lead %d" % i, "212555%04d" % i, "lead%d@example.com" % i) for i in range(6)
+        ]
+
+        def fake_verify(self, name, phone, email):
+            status = "verified" if int(name.split()[1]) % 2 == 0 else "flagged"
+            return {"verification_status": {"overall_status": status, "risk_factors": []}}
+
+        with patch.object(free_lead_verification.LeadVerifier, "verify_lead", fake_verify):
+            verified, flagged, summary = process_new_leads_batch(leads, max_workers=4)
+
+        self.assertEqual([lead["name"] for lead in verified], ["Lead 0", "Lead 2", "Lead 4"])
+        self.assertEqual([lead["name"] for lead in flagged], ["Lead 1", "Lead 3", "Lead 5"])
+        self.assertEqual(summary["leads"], 6)
+
+    def test_iter_verified_leads_reads_one_window_at_a_time(self):
+        read = []
+
+        def leads():
+            for i in range(5):
+                read.append(i)
+                yield ("Lead %d" % i, "212555%04d" % i, "lead%d@example.com" % i)
+
+        def fake_verify(self, name, phone, email):
+            return {"verification_status": {"overall_status": "verified", "risk_factors": []}}
+
+        with patch.object(free_lead_verification.LeadVerifier, "verify_lead", fake_verify), \
+                patch.object(free_lead_verification, "LEAD_PLAN_WINDOW", 2):
+            results = iter_verified_leads(leads())
+            self.assertEqual(next(results)[0]["name"], "Lead 0")
+            self.assertEqual(read, [0, 1])
+            self.assertEqual([record["name"] for record, _ in results], ["Lead 1", "Lead 2", "Lead 3", "Lead 4"])
+
+    def test_iter_verified_leads_does_not_wait_for_a_bulk_job(self):
+        leads = [("Lead %d" % i, "212555%04d" % i, "lead%d@example.com" % i) for i in range(4)]
+        bulk_done = threading.Event()
+
+        def slow_bulk_job(self, emails):
+            bulk_done.wait(5)
+            return {}
+
+        def fake_verify(self, name, phone, email):
+            return {"verification_status": {"overall_status": "verified", "risk_factors": []}}
+
+        with patch.object(free_lead_verification.LeadVerifier, "verify_lead", fake_verify), \
+                patch.object(free_lead_verification.LeadVerifier, "verify_emails_bulk", slow_bulk_job), \
+                patch.object(free_lead_verification, "NEVERBOUNCE_BULK_THRESHOLD", 2):
+            started = time.monotonic()
+            record, _ = next(iter_verified_leads(leads))
+            self.assertEqual(record["name"], "Lead 0")
+            self.assertFalse(bulk_done.is_set())
+            self.assertLess(time.monotonic() - started, 1)
+        bulk_done.set()
+
+if __name__ == '__main__':
+    unittest.main()
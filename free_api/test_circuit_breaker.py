@@ -0,0 +1,164 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import free_lead_verification
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, circuit_breakers
+from free_lead_verification import LeadVerifier
+from http_client import HttpClient
+from verification_cache import VerificationCache
+
+class _FailingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        self.send_response(500)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker("test", window=10, min_calls=4, error_rate=0.5, cooldown=60)
+        for success in (True, False, True, False):
+            breaker.before_call()
+            breaker.record(success, 0.01)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError) as raised:
+            breaker.before_call()
+        self.assertEqual(raised.exception.provider, "test")
+        self.assertGreater(raised.exception.retry_after, 0)
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker("test", min_calls=3, slow_call=0.5, slow_rate=0.6, cooldown=60)
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record(True, 1.0)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_stays_closed_below_min_calls(self):
+        breaker = CircuitBreaker("test", min_calls=5, cooldown=60)
+        for _ in range(4):
+            breaker.before_call()
+            breaker.record(False, 0.01)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker("test", min_calls=1, cooldown=0.05)
+        breaker.before_call()
+        breaker.record(False, 0.01)
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        breaker.before_call()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # Only the probe gets through while it is in flight
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record(False, 0.01)
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        breaker.before_call()
+        breaker.record(True, 0.01)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["times_opened"], 2)
+
+    def test_calls_from_before_the_circuit_opened_are_ignored(self):
+        breaker = CircuitBreaker("test", min_calls=1, cooldown=0.05)
+        slow_call = breaker.before_call()
+        failing_call = breaker.before_call()
+        breaker.record(False, 0.01, failing_call)
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        probe = breaker.before_call()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        # A success sent while the circuit was still closed is not the probe
+        breaker.record(True, 0.01, slow_call)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record(False, 0.01, probe)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_late_failure_does_not_count_against_a_closed_circuit(self):
+        breaker = CircuitBreaker("test", min_calls=1, cooldown=0.05)
+        stale = breaker.before_call()
+        breaker.record(False, 0.01, breaker.before_call())
+        time.sleep(0.06)
+        breaker.record(True, 0.01, breaker.before_call())
+        self.assertEqual(breaker.state, CLOSED)
+
+        breaker.record(False, 0.01, stale)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["recent_calls"], 0)
+
+class TestHttpClientCircuit(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FailingHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_open_circuit_fails_fast(self):
+        circuit_breakers.configure("failingprovider", min_calls=3, error_rate=0.5, cooldown=60)
+        client = HttpClient(max_retries=0, timeout=5)
+        for _ in range(3):
+            self.assertEqual(client.get("failingprovider", self.url).status_code, 500)
+
+        seen = _FailingHandler.requests_seen
+        with self.assertRaises(CircuitOpenError):
+            client.get("failingprovider", self.url)
+        self.assertEqual(_FailingHandler.requests_seen, seen)
+
+class TestProviderUnavailable(unittest.TestCase):
+    def setUp(self):
+        self.verifier = LeadVerifier()
+        self.verifier.verify_phone = MagicMock(return_value={"valid": True})
+
+    def test_open_circuit_gives_provider_unavailable(self):
+        open_error = CircuitOpenError("neverbounce", 12)
+        with patch.object(free_lead_verification, "NEVERBOUNCE_API_KEY", "key"), \
+                patch.object(free_lead_verification, "MICROBILT_API_KEY", None), \
+                patch.object(free_lead_verification.http_client, "post", side_effect=open_error):
+            result = self.verifier.verify_lead("John Doe", "2125551234", "john@example.com")
+
+        status = result["verification_status"]
+        self.assertEqual(status["overall_status"], "provider_unavailable")
+        self.assertEqual(status["risk_factors"], ["provider_unavailable"])
+        self.assertEqual(status["unavailable_providers"], ["neverbounce"])
+        self.assertTrue(result["email_verification"]["provider_unavailable"])
+
+    def test_real_risk_factors_still_flag(self):
+        email_result = free_lead_verification.provider_unavailable(CircuitOpenError("neverbounce", 5))
+        result = self.verifier.build_result({"valid": False}, email_result, {"status": "ok"})
+
+        self.assertEqual(result["verification_status"]["overall_status"], "flagged")
+        self.assertEqual(result["verification_status"]["risk_factors"], ["invalid_phone", "provider_unavailable"])
+
+    def test_unavailable_results_are_not_cached(self):
+        cache = VerificationCache(path=":memory:")
+        verifier = LeadVerifier(cache)
+        with patch.object(free_lead_verification, "NEVERBOUNCE_API_KEY", "key"), \
+                patch.object(free_lead_verification.http_client, "post",
+                             side_effect=CircuitOpenError("neverbounce", 5)):
+            verifier.verify_email("john@example.com")
+        self.assertEqual(cache.stats()["stores"], 0)
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
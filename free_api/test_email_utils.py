@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import patch
+
+from email_utils import normalize_email, screen_email
+from free_lead_verification import LeadVerifier
+
+class TestEmailUtils(unittest.TestCase):
+    def test_accepts_ordinary_addresses(self):
+        self.assertEqual(screen_email("john.smith@example.com"), ("john.smith@example.com", None))
+        self.assertEqual(screen_email("  Sarah.J+leads@Example.COM. "), ("Sarah.J+leads@example.com", None))
+
+    def test_rejects_bad_syntax(self):
+        for email in ["invalid@email", "no-at-sign", "@example.com", "a..b@example.com",
+                      "john@-example.com", "john@example.c0m", ""]:
+            self.assertEqual(screen_email(email)[1], "invalid_syntax", email)
+
+    def test_rejects_disposable_and_role_accounts(self):
+        self.assertEqual(screen_email("lead@Mailinator.com")[1], "disposable_domain")
+        self.assertEqual(screen_email("info@realty.com")[1], "role_account")
+
+    def test_normalizes_idn_domains(self):
+        self.assertEqual(normalize_email("anna@bücher.de"), "anna@xn--bcher-kva.de")
+
+    @patch('free_lead_verification.http_client.post')
+    def test_screened_addresses_skip_neverbounce(self, mock_post):
+        verifier = LeadVerifier()
+        result = verifier.verify_email("invalid@email")
+
+        mock_post.assert_not_called()
+        self.assertEqual(result["result"], "invalid")
+        self.assertEqual(result["reason"], "invalid_syntax")
+        self.assertEqual(verifier.calls_saved["neverbounce"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,13 +6,13 @@ class TestLeadVerification(unittest.TestCase):
     def setUp(self):
         self.verifier = LeadVerifier()
         
-    @patch('free_api.free_lead_verification.requests.get')
+    @patch('free_lead_verification.http_client.get')
     def test_verify_phone_success(self, mock_get):
         # Mock successful phone verification
         mock_response = MagicMock()
         mock_response.json.return_value = {
             "valid": True,
-            "number": "1234567890",
+            "number": "2125551234",
             "local_format": "123-456-7890",
             "international_format": "+11234567890",
             "country_prefix": "+1",
@@ -24,11 +24,11 @@ class TestLeadVerification(unittest.TestCase):
         }
         mock_get.return_value = mock_response
         
-        result = self.verifier.verify_phone("1234567890")
+        result = self.verifier.verify_phone("2125551234")
         self.assertTrue(result["valid"])
-        self.assertEqual(result["number"], "1234567890")
+        self.assertEqual(result["number"], "2125551234")
         
-    @patch('free_api.free_lead_verification.requests.post')
+    @patch('free_lead_verification.http_client.post')
     def test_verify_email_success(self, mock_post):
         # Mock successful email verification
         mock_response = MagicMock()
@@ -44,7 +44,7 @@ class TestLeadVerification(unittest.TestCase):
         result = self.verifier.verify_email("test@example.com")
         self.assertEqual(result["result"], "valid")
         
-    @patch('free_api.free_lead_verification.requests.get')
+    @patch('free_lead_verification.http_client.get')
     def test_check_background_success(self, mock_get):
         # Mock successful background check
         mock_response = MagicMock()
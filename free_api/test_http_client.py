@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+import urllib3
+
+from http_client import HttpClient
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = {}
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def _respond(self):
+        key = (self.command, self.path)
+        type(self).requests_seen[key] = type(self).requests_seen.get(key, 0) + 1
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+        status = 503 if self.path.startswith("/busy") else 200
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_connections_are_reused(self):
+        client = HttpClient(pool_size=2, max_retries=0, timeout=5)
+        for i in range(5):
+            response = client.get("testprovider", f"{self.url}/check/{i}")
+            self.assertEqual(response.json()["path"], f"/check/{i}")
+
+        stats = client.pool_stats()["testprovider"]
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["reused"], 4)
+
+    def test_threads_share_the_provider_pool(self):
+        client = HttpClient(pool_size=4, max_retries=0, timeout=5)
+
+        def worker():
+            for _ in range(5):
+                client.get("testprovider", self.url)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = client.pool_stats()["testprovider"]
+        self.assertEqual(stats["requests"], 20)
+        self.assertLessEqual(stats["connections_opened"], 4)
+        self.assertGreaterEqual(stats["reused"], 16)
+
+    def test_read_timeout_cuts_off_slow_responses(self):
+        client = HttpClient(max_retries=0, timeout=0.2)
+        start = time.monotonic()
+        with self.assertRaises(requests.exceptions.RequestException):
+            client.get("slowprovider", f"{self.url}/slow")
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_posts_are_not_resent_after_a_read_timeout(self):
+        client = HttpClient(max_retries=2, timeout=0.2)
+        with self.assertRaises(requests.exceptions.RequestException):
+            client.post("postprovider", f"{self.url}/slow/post", json={"email": "a@example.com"})
+        self.assertEqual(_Handler.requests_seen[("POST", "/slow/post")], 1)
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            client.get("getprovider", f"{self.url}/slow/get")
+        self.assertEqual(_Handler.requests_seen[("GET", "/slow/get")], 3)
+
+    def test_posts_are_not_resent_on_retryable_statuses(self):
+        client = HttpClient(max_retries=2, timeout=5)
+        self.assertEqual(client.post("busyprovider", f"{self.url}/busy/post").status_code, 503)
+        self.assertEqual(_Handler.requests_seen[("POST", "/busy/post")], 1)
+
+    def test_posts_are_retried_when_the_connection_fails(self):
+        client = HttpClient(max_retries=2, timeout=5)
+        with patch("urllib3.connectionpool.HTTPConnectionPool._new_conn",
+                   side_effect=urllib3.exceptions.NewConnectionError(None, "refused")) as connect:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.post("refusedprovider", f"{self.url}/check")
+        self.assertEqual(connect.call_count, 3)
+
+    def test_timeouts_per_provider(self):
+        client = HttpClient()
+        self.assertEqual(client.timeout_for("numverify"), (3.05, 5.0))
+        with patch.dict(os.environ, {"MICROBILT_READ_TIMEOUT": "30", "MICROBILT_CONNECT_TIMEOUT": "1"}):
+            self.assertEqual(client.timeout_for("microbilt"), (1.0, 30.0))
+        self.assertEqual(HttpClient(timeout=2, connect_timeout=0.5).timeout_for("microbilt"), (0.5, 2))
+
+if __name__ == '__main__':
+    unittest.main()
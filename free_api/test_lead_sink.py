@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lead_sink import JsonlWriter, LeadSink, read_jsonl
+from free_lead_verification import save_leads_to_json
+
+class TestLeadSink(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_records_are_finalized_atomically(self):
+        with LeadSink(self.tmpdir) as sink:
+            sink.add({"name": "John Doe"}, True)
+            sink.add({"name": "Jane Smith"}, False)
+            # Nothing appears at the final path until the sink is closed
+            self.assertFalse(os.path.exists(sink.verified_path))
+
+        self.assertEqual(list(read_jsonl(sink.verified_path)), [{"name": "John Doe"}])
+        self.assertEqual(list(read_jsonl(sink.flagged_path)), [{"name": "Jane Smith"}])
+        self.assertFalse(os.path.exists(sink.verified.partial_path))
+
+    def test_failed_run_keeps_partial_file(self):
+        with self.assertRaises(RuntimeError):
+            with LeadSink(self.tmpdir) as sink:
+                sink.add({"name": "John Doe"}, True)
+                raise RuntimeError("provider outage")
+
+        self.assertFalse(os.path.exists(sink.verified_path))
+        self.assertEqual(list(read_jsonl(sink.verified.partial_path)), [{"name": "John Doe"}])
+
+    def test_gzip_and_append(self):
+        path = os.path.join(self.tmpdir, "leads.jsonl")
+        writer = JsonlWriter(path, compress=True)
+        writer.write({"n": 1})
+        writer.close(finalize=False)
+
+        writer = JsonlWriter(path, compress=True, append=True)
+        writer.write({"n": 2})
+        writer.close()
+
+        self.assertTrue(writer.path.endswith(".jsonl.gz"))
+        self.assertEqual(list(read_jsonl(writer.path)), [{"n": 1}, {"n": 2}])
+
+    def test_save_leads_to_json_writes_jsonl(self):
+        verified_path, flagged_path = save_leads_to_json([{"name": "John Doe"}], [], self.tmpdir)
+        self.assertEqual(os.path.basename(verified_path), "verified_leads.jsonl")
+        self.assertEqual(list(read_jsonl(verified_path)), [{"name": "John Doe"}])
+        self.assertEqual(list(read_jsonl(flagged_path)), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,7 +21,7 @@ class TestMicroBiltIntegration(unittest.TestCase):
         self.test_phone = "+1234567890"
         self.test_email = "john.doe@example.com"
 
-    @patch('requests.post')
+    @patch('free_lead_verification.http_client.post')
     def test_successful_background_check(self, mock_post):
         """Test successful background check with MicroBilt"""
         # Mock successful response
@@ -58,7 +58,7 @@ class TestMicroBiltIntegration(unittest.TestCase):
         self.assertEqual(result["criminal_records"], [])
         self.assertEqual(result["bankruptcies"], [])
 
-    @patch('requests.post')
+    @patch('free_lead_verification.http_client.post')
     def test_background_check_with_criminal_records(self, mock_post):
         """Test background check with criminal records"""
         # Mock response with criminal records
@@ -91,7 +91,7 @@ class TestMicroBiltIntegration(unittest.TestCase):
         self.assertEqual(result["criminal_records"][0]["offense"], "DUI")
         self.assertIn("criminal_history", result["risk_factors"])
 
-    @patch('requests.post')
+    @patch('free_lead_verification.http_client.post')
     def test_background_check_with_bankruptcy(self, mock_post):
         """Test background check with bankruptcy records"""
         # Mock response with bankruptcy
@@ -124,7 +124,7 @@ class TestMicroBiltIntegration(unittest.TestCase):
         self.assertEqual(result["bankruptcies"][0]["chapter"], "7")
         self.assertIn("bankruptcy", result["risk_factors"])
 
-    @patch('requests.post')
+    @patch('free_lead_verification.http_client.post')
     def test_background_check_error_handling(self, mock_post):
         """Test error handling in background check"""
         # Mock API error
@@ -0,0 +1,65 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from werkzeug.serving import make_server
+
+import free_lead_verification
+import mock_neverbounce_api
+from free_lead_verification import LeadVerifier, process_new_leads
+
+class TestNeverBounceBulk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server("127.0.0.1", 0, mock_neverbounce_api.app, threaded=True)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/v4"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        patcher = patch.object(free_lead_verification, "NEVERBOUNCE_API_KEY", "test-key")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        url_patcher = patch.object(free_lead_verification, "NEVERBOUNCE_API_URL", self.base_url)
+        url_patcher.start()
+        self.addCleanup(url_patcher.stop)
+
+    def make_verifier(self):
+        verifier = LeadVerifier()
+        verifier.bulk_poll_interval = 0.01
+        verifier.bulk_page_size = 2
+        return verifier
+
+    def test_bulk_job_maps_results_to_email_verification_shape(self):
+        emails = ["john@example.com", "invalid.user@example.com", "catchall@example.com",
+                  "JOHN@example.com", "sarah@example.com", "not-an-email"]
+        results = self.make_verifier().verify_emails_bulk(emails)
+
+        self.assertEqual(results["john@example.com"]["result"], "valid")
+        self.assertEqual(results["JOHN@example.com"], results["john@example.com"])
+        self.assertEqual(results["invalid.user@example.com"]["result"], "invalid")
+        self.assertEqual(results["catchall@example.com"]["result"], "catchall")
+        self.assertEqual(results["sarah@example.com"]["result"], "valid")
+        self.assertIn("flags", results["sarah@example.com"])
+        self.assertEqual(results["not-an-email"]["reason"], "invalid_syntax")
+
+    def test_single_check_against_stand_in(self):
+        result = self.make_verifier().verify_email("jane@example.com")
+        self.assertEqual(result["result"], "valid")
+
+    def test_process_new_leads_switches_to_bulk_above_threshold(self):
+        leads = [("Lead %d" % i, "2125551234", "lead%d@example.com" % i) for i in range(4)]
+        with patch.object(LeadVerifier, "_verify_email") as single_check, \
+                patch.object(LeadVerifier, "_verify_phone", return_value={"valid": True}), \
+                patch.object(LeadVerifier, "_check_background", return_value={"status": "ok"}), \
+                patch.dict("os.environ", {"NEVERBOUNCE_BULK_POLL_INTERVAL": "0.01"}):
+            verified, flagged = process_new_leads(leads, bulk_threshold=2)
+
+        single_check.assert_not_called()
+        self.assertEqual(len(verified), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,14 @@
 import requests
 import os
 import json
-import time
 import csv
 import logging
 from dotenv import load_dotenv
 from free_lead_verification import LeadVerifier
-from typing import Dict
+from verification_cache import VerificationCache
+from lead_sink import LeadSink
+from run_journal import JOURNAL_FILENAME, RunJournal, row_key
+from typing import Dict, Optional
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,87 +29,108 @@ def verify_lead(verifier: LeadVerifier, name: str, phone: str, email: str) -> Di
     }
     return results
 
-def process_leads_from_csv(file_path: str):
-    """Process leads from a CSV file containing name, phone, and email"""
-    verifier = LeadVerifier()
-    verified_leads = []
-    flagged_leads = []
+def process_leads_from_csv(file_path: str, cache: Optional[VerificationCache] = None,
+                           output_dir: str = "results", compress: bool = False, resume: bool = False):
+    """
+    Process leads from a CSV file containing name, phone, and email.
+    Each result is appended to verified_leads.jsonl or flagged_leads.jsonl
+    in output_dir as soon as it is produced.
+    Finished rows are recorded in a run journal in output_dir; with resume,
+    rows finished by an earlier, interrupted run are not verified again.
+    """
+    verifier = LeadVerifier(cache)
+    journal = RunJournal(os.path.join(output_dir, JOURNAL_FILENAME), resume)
     
     try:
-        with open(file_path, 'r') as f:
-            reader = csv.DictReader(f)
-            leads = list(reader)
-        
-        total_leads = len(leads)
-        logger.info(f"Processing {total_leads} leads from {file_path}")
+        logger.info(f"Processing leads from {file_path}")
         
-        for index, lead in enumerate(leads, 1):
-            logger.info(f"\nProcessing lead {index}/{total_leads}: {lead['name']}")
-            result = verify_lead(verifier, lead['name'], lead['phone'], lead['email'])
+        # Stream rows from the file so memory use does not grow with its size
+        with open(file_path, 'r', newline='') as f, LeadSink(output_dir, compress) as sink:
+            reader = csv.DictReader(f)
             
-            # Print verification results
-            print("\nPhone Verification:")
-            phone_result = result['phone_verification']
-            if phone_result.get('valid'):
-                print(f"✅ Valid phone number")
-                print(f"Location: {phone_result.get('location', 'Unknown')}")
-                print(f"Carrier: {phone_result.get('carrier', 'Unknown')}")
-            else:
-                print(f"❌ Invalid phone number")
-                if 'error' in phone_result:
-                    print(f"Error: {phone_result['error']}")
+            # Carry over results from the interrupted run
+            for record, verified in journal.replay():
+                sink.add(record, verified)
             
-            print("\nEmail Verification:")
-            email_result = result['email_verification']
-            if email_result.get('result') == 'valid':
-                print("✅ Valid email address")
-            else:
-                print("❌ Invalid email address")
-                if 'error' in email_result:
-                    print(f"Error: {email_result['error']}")
+            for index, lead in enumerate(reader, 1):
+                key = row_key(index, lead['name'], lead['phone'], lead['email'])
+                if journal.is_done(key):
+                    continue
+                
+                logger.info(f"\nProcessing lead {index}: {lead['name']}")
+                result = verify_lead(verifier, lead['name'], lead['phone'], lead['email'])
             
-            print("\nBackground Check:")
-            bg_result = result['background_check']
-            if 'error' not in bg_result:
-                print("✅ Background check completed")
-                # Add more detailed background check results here
-            else:
-                print(f"❌ Error in background check: {bg_result.get('error')}")
+                # Print verification results
+                print("\nPhone Verification:")
+                phone_result = result['phone_verification']
+                if phone_result.get('valid'):
+                    print(f"✅ Valid phone number")
+                    print(f"Location: {phone_result.get('location', 'Unknown')}")
+                    print(f"Carrier: {phone_result.get('carrier', 'Unknown')}")
+                else:
+                    print(f"❌ Invalid phone number")
+                    if 'error' in phone_result:
+                        print(f"Error: {phone_result['error']}")
             
-            # Add delay to avoid rate limiting
-            time.sleep(1)
+                print("\nEmail Verification:")
+                email_result = result['email_verification']
+                if email_result.get('result') == 'valid':
+                    print("✅ Valid email address")
+                else:
+                    print("❌ Invalid email address")
+                    if 'error' in email_result:
+                        print(f"Error: {email_result['error']}")
             
-            # Save results
-            if all([
-                phone_result.get('valid'),
-                email_result.get('result') == 'valid',
-                'error' not in bg_result
-            ]):
-                verified_leads.append(result)
-            else:
-                flagged_leads.append(result)
+                print("\nBackground Check:")
+                bg_result = result['background_check']
+                if 'error' not in bg_result:
+                    print("✅ Background check completed")
+                    # Add more detailed background check results here
+                else:
+                    print(f"❌ Error in background check: {bg_result.get('error')}")
+            
+                # Save results
+                verified = all([
+                    phone_result.get('valid'),
+                    email_result.get('result') == 'valid',
+                    'error' not in bg_result
+                ])
+                sink.add(result, verified)
+                journal.record(key, result, verified)
         
-        # Save results to JSON files
-        os.makedirs('results', exist_ok=True)
-        with open('results/verified_leads.json', 'w') as f:
-            json.dump(verified_leads, f, indent=2)
-        with open('results/flagged_leads.json', 'w') as f:
-            json.dump(flagged_leads, f, indent=2)
+        # Output is finalized, so the journal is no longer needed
+        journal.close(remove=True)
         
         logger.info(f"\nVerification complete!")
-        logger.info(f"Verified leads: {len(verified_leads)}")
-        logger.info(f"Flagged leads: {len(flagged_leads)}")
-        logger.info("Results saved to 'results' directory")
+        logger.info(f"Verified leads: {sink.verified.count}")
+        logger.info(f"Flagged leads: {sink.flagged.count}")
+        logger.info(f"Results saved to '{output_dir}' directory")
+        if cache is not None:
+            logger.info(f"Cache stats: {cache.stats()}")
             
     except FileNotFoundError:
         logger.error(f"Error: File {file_path} not found")
     except Exception as e:
         logger.error(f"Error processing file: {e}")
+    finally:
+        journal.close()
 
 if __name__ == "__main__":
+    import argparse
+    
     # Get the directory of the current script
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(script_dir, "sample_leads.csv")
     
-    # Process leads from the sample CSV file
-    process_leads_from_csv(csv_path) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Verify leads from a CSV file")
+    parser.add_argument("csv_path", nargs="?", default=os.path.join(script_dir, "sample_leads.csv"),
+                        help="CSV file with name, phone and email columns (default: sample_leads.csv)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the verification result cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="Ignore cached results and store fresh ones")
+    parser.add_argument("--output", "-o", default="results", help="Directory for the JSON Lines result files")
+    parser.add_argument("--gzip", action="store_true", help="Compress the result files")
+    parser.add_argument("--resume", action="store_true", help="Skip rows finished by an interrupted run")
+    args = parser.parse_args()
+    
+    # Process leads from the CSV file
+    process_leads_from_csv(args.csv_path, VerificationCache(bypass=args.no_cache, refresh=args.refresh_cache),
+                           args.output, args.gzip, args.resume) 
\ No newline at end of file
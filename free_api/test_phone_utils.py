@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import patch
+
+from phone_utils import normalize_phone, phone_key, validate_nanp
+from free_lead_verification import LeadVerifier
+
+class TestPhoneUtils(unittest.TestCase):
+    def test_normalizes_to_e164(self):
+        self.assertEqual(normalize_phone("(616) 403-6921"), "+16164036921")
+        self.assertEqual(normalize_phone("+1 616.403.6921"), "+16164036921")
+        self.assertEqual(normalize_phone("16164036921"), "+16164036921")
+
+    def test_rejects_invalid_numbers(self):
+        self.assertEqual(validate_nanp("0000000000"), (False, "invalid_area_code"))
+        self.assertEqual(validate_nanp("123-456-7890"), (False, "invalid_area_code"))
+        self.assertEqual(validate_nanp("911-555-1234"), (False, "n11_area_code"))
+        self.assertEqual(validate_nanp("212-155-1234"), (False, "invalid_exchange_code"))
+        self.assertEqual(validate_nanp("212-411-1234"), (False, "n11_exchange_code"))
+        self.assertEqual(validate_nanp("555-1234"), (False, "invalid_length"))
+        self.assertIsNone(normalize_phone("+44 20 7946 0958"))
+
+    def test_phone_key(self):
+        self.assertEqual(phone_key("212.555.1234"), "+12125551234")
+        self.assertEqual(phone_key("000-000-0000"), "0000000000")
+
+    @patch('free_lead_verification.http_client.get')
+    def test_invalid_numbers_skip_numverify(self, mock_get):
+        verifier = LeadVerifier()
+        result = verifier.verify_phone("123-456-7890")
+
+        mock_get.assert_not_called()
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["reason"], "invalid_area_code")
+        self.assertEqual(verifier.calls_saved["numverify"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
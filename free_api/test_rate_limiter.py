@@ -0,0 +1,55 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from rate_limiter import RateLimiter, TokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_does_not_wait(self):
+        bucket = TokenBucket(rate=10, burst=5)
+        start = time.perf_counter()
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits, [0.0] * 5)
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+    def test_waits_only_when_quota_exceeded(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        self.assertEqual(bucket.acquire(), 0.0)
+        start = time.perf_counter()
+        waited = bucket.acquire()
+        self.assertGreater(waited, 0)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.04)
+
+    def test_timeout_gives_up_without_taking_tokens(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        self.assertEqual(bucket.acquire(), 0.0)
+        start = time.perf_counter()
+        self.assertIsNone(bucket.acquire(timeout=0.2))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        # Nothing was taken, so a caller willing to wait still gets the next token first
+        self.assertLessEqual(bucket._reserve(1), 1.0)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+class TestRateLimiter(unittest.TestCase):
+    def test_unconfigured_provider_is_unlimited(self):
+        limiter = RateLimiter()
+        self.assertIsNone(limiter.get_bucket("someprovider"))
+        self.assertEqual(limiter.acquire("someprovider"), 0.0)
+
+    @patch.dict('os.environ', {"NUMVERIFY_RATE_LIMIT": "5", "NUMVERIFY_RATE_BURST": "2"})
+    def test_reads_limits_from_environment(self):
+        bucket = RateLimiter().get_bucket("numverify")
+        self.assertEqual(bucket.rate, 5.0)
+        self.assertEqual(bucket.burst, 2.0)
+
+    def test_explicit_configuration(self):
+        limiter = RateLimiter({"neverbounce": {"rate": 100, "burst": 10}})
+        self.assertEqual(limiter.get_bucket("neverbounce").burst, 10.0)
+        limiter.configure("neverbounce", 0)
+        self.assertIsNone(limiter.get_bucket("neverbounce"))
+
+if __name__ == '__main__':
+    unittest.main()
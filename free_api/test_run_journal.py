@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from run_journal import RunJournal, row_key
+
+class TestRunJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "run_journal.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_row_key_tracks_offset_and_content(self):
+        key = row_key(1, "John Doe", "2125551234")
+        self.assertEqual(key, row_key(1, "John Doe", "2125551234"))
+        self.assertNotEqual(key, row_key(2, "John Doe", "2125551234"))
+        self.assertNotEqual(key, row_key(1, "John Doe", "2125559999"))
+
+    def test_resume_replays_finished_rows(self):
+        journal = RunJournal(self.path)
+        journal.record("1:a", {"name": "John Doe"}, True)
+        journal.record("2:b", {"name": "Jane Smith"}, False)
+        journal.close()
+        # Simulate a run killed halfway through writing an entry
+        with open(self.path, "a") as f:
+            f.write('{"key": "3:c", "verif')
+
+        resumed = RunJournal(self.path, resume=True)
+        self.assertTrue(resumed.is_done("1:a"))
+        self.assertFalse(resumed.is_done("3:c"))
+        self.assertEqual(list(resumed.replay()), [({"name": "John Doe"}, True), ({"name": "Jane Smith"}, False)])
+        resumed.record("3:c", {"name": "Bob Johnson"}, True)
+        resumed.close()
+        self.assertTrue(RunJournal(self.path, resume=True).is_done("3:c"))
+        resumed = RunJournal(self.path, resume=True)
+        resumed.close(remove=True)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_memory_does_not_grow_with_finished_rows(self):
+        journal = RunJournal(self.path)
+        journal.record("1:a", {"name": "John Doe"}, True)
+        journal.record("2:b", {"name": "Jane Smith"}, True)
+        self.assertEqual(journal.completed, set())
+        journal.close()
+
+        resumed = RunJournal(self.path, resume=True)
+        self.assertEqual(resumed.resumed, 2)
+        self.assertTrue(resumed.is_done("1:a"))
+        # Matched keys are dropped, since each row is only asked about once
+        self.assertEqual(resumed.completed, {"2:b"})
+        resumed.close()
+
+    def test_new_run_starts_empty(self):
+        journal = RunJournal(self.path)
+        journal.record("1:a", {"name": "John Doe"}, True)
+        journal.close()
+
+        fresh = RunJournal(self.path)
+        self.assertFalse(fresh.is_done("1:a"))
+        self.assertEqual(list(fresh.replay()), [])
+        fresh.close()
+
+if __name__ == '__main__':
+    unittest.main()
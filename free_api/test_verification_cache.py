@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from verification_cache import VerificationCache, is_cacheable, normalize_email_key, normalize_phone_key
+from free_lead_verification import LeadVerifier
+
+class TestVerificationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.sqlite3")
+        self.cache = VerificationCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_memory_and_disk_tiers(self):
+        self.cache.set("numverify", "2125551234", {"valid": True})
+        self.assertEqual(self.cache.get("numverify", "2125551234"), {"valid": True})
+
+        # A fresh instance only has the on-disk tier
+        reopened = VerificationCache(self.path)
+        self.assertEqual(reopened.get("numverify", "2125551234"), {"valid": True})
+        self.assertEqual(reopened.stats()["disk_hits"], 1)
+        reopened.close()
+
+    def test_errors_are_never_cached(self):
+        self.cache.set("neverbounce", "a@example.com", {"result": "invalid", "error": "timeout"})
+        self.cache.set("microbilt", "key", {"status": "skipped"})
+        self.assertIsNone(self.cache.get("neverbounce", "a@example.com"))
+        self.assertIsNone(self.cache.get("microbilt", "key"))
+        self.assertFalse(is_cacheable({"valid": False, "error": "bad key"}))
+
+    def test_transient_email_results_are_not_cached(self):
+        self.cache.set("neverbounce", "a@example.com", {"result": "unknown", "flags": []})
+        self.cache.set("neverbounce", "b@example.com", {"result": "catchall", "flags": []})
+        self.assertIsNone(self.cache.get("neverbounce", "a@example.com"))
+        self.assertEqual(self.cache.get("neverbounce", "b@example.com")["result"], "catchall")
+
+        calls = []
+        for _ in range(2):
+            self.cache.get_or_fetch("neverbounce", "c@example.com", lambda: calls.append(1) or {"result": "unknown"})
+        self.assertEqual(len(calls), 2)
+
+    def test_entries_expire_per_provider(self):
+        cache = VerificationCache(self.path, ttls={"neverbounce": 0})
+        cache.set("neverbounce", "a@example.com", {"result": "valid"})
+        time.sleep(0.01)
+        self.assertIsNone(cache.get("neverbounce", "a@example.com"))
+        cache.close()
+
+    def test_lru_evicts_oldest(self):
+        cache = VerificationCache(self.path, max_entries=2)
+        for key in ("1", "2", "3"):
+            cache.set("numverify", key, {"valid": True})
+        self.assertEqual(list(cache._memory), [("numverify", "2"), ("numverify", "3")])
+        cache.close()
+
+    def test_bypass_and_refresh(self):
+        self.cache.set("numverify", "2125551234", {"valid": True})
+
+        bypass = VerificationCache(self.path, bypass=True)
+        self.assertIsNone(bypass.get("numverify", "2125551234"))
+        bypass.set("numverify", "9995551234", {"valid": True})
+        self.assertIsNone(self.cache.get("numverify", "9995551234"))
+
+        refresh = VerificationCache(self.path, refresh=True)
+        self.assertIsNone(refresh.get("numverify", "2125551234"))
+        refresh.set("numverify", "2125551234", {"valid": False, "line_type": "landline"})
+        self.assertEqual(VerificationCache(self.path).get("numverify", "2125551234")["line_type"], "landline")
+
+    def test_hit_and_miss_counters(self):
+        fetch = MagicMock(return_value={"result": "valid"})
+        for _ in range(3):
+            self.cache.get_or_fetch("neverbounce", "a@example.com", fetch)
+        fetch.assert_called_once()
+        self.assertEqual(self.cache.stats()["hits"], 2)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_key_normalization(self):
+        self.assertEqual(normalize_phone_key("(212) 555-1234"), "+12125551234")
+        self.assertEqual(normalize_phone_key("1-212-555-1234"), "+12125551234")
+        self.assertEqual(normalize_email_key("  John.Doe@Example.COM "), "john.doe@example.com")
+
+    def test_lead_verifier_uses_cache(self):
+        verifier = LeadVerifier(self.cache)
+        verifier._verify_email = MagicMock(return_value={"result": "valid"})
+        verifier.verify_email("John@Example.com")
+        verifier.verify_email("john@example.com")
+        verifier._verify_email.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
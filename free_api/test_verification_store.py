@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import sqlite3
+import unittest
+
+from verification_store import SCHEMA, VerificationStore
+
+def make_verification(first_name, last_name, status="valid", risk_score=0.0):
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": f"{first_name.lower()}@example.com",
+        "phone": "2125551234",
+        "status": status,
+        "risk_score": risk_score,
+        "timestamp": "2024-01-01T00:00:00",
+        "details": {"risk_factors": []}
+    }
+
+def add_from_process(path, count):
+    store = VerificationStore(path)
+    for i in range(count):
+        store.add(make_verification("Worker", str(i)))
+    store.close()
+
+class TestVerificationStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "verifications.sqlite3")
+        self.store = VerificationStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_add_and_get(self):
+        stored = self.store.add(make_verification("John", "Doe"))
+        self.assertEqual(stored["id"], 1)
+        self.assertEqual(self.store.get(1), stored)
+        self.assertIsNone(self.store.get(2))
+
+    def test_search_and_status_filter(self):
+        self.store.add(make_verification("John", "Doe"))
+        self.store.add(make_verification("Jane", "Smith", status="invalid", risk_score=0.8))
+        self.store.add(make_verification("Bob", "Doe_100%", status="invalid"))
+
+        self.assertEqual([v["first_name"] for v in self.store.search("doe")], ["John", "Bob"])
+        self.assertEqual([v["first_name"] for v in self.store.search("_100%")], ["Bob"])
+        self.assertEqual([v["first_name"] for v in self.store.search(status="invalid")], ["Jane", "Bob"])
+        self.assertEqual([v["first_name"] for v in self.store.search("doe", "invalid")], ["Bob"])
+        self.assertEqual(self.store.count(), 3)
+
+    def test_indexed_search_matches_substrings(self):
+        self.assertTrue(self.store.indexed_search)
+        self.store.add(make_verification("John", "Doe"))
+        self.store.add(make_verification("Jane", "Smith"))
+
+        self.assertEqual([v["first_name"] for v in self.store.search("MIT")], ["Jane"])
+        self.assertEqual([v["first_name"] for v in self.store.search("ohn@exa")], ["John"])
+        self.assertEqual([v["first_name"] for v in self.store.search("55512")], ["John", "Jane"])
+        self.assertEqual(self.store.search('"smith'), [])
+        # Too short for trigrams, answered by a scan instead
+        self.assertEqual([v["first_name"] for v in self.store.search("sm")], ["Jane"])
+
+    def test_index_is_built_for_existing_history(self):
+        path = os.path.join(self.tmpdir, "existing.sqlite3")
+        conn = sqlite3.connect(path)
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.execute(
+            "INSERT INTO verifications (first_name, last_name, email, phone, status, risk_score, timestamp, details) "
+            "VALUES ('Maria', 'Garcia', 'maria@example.com', '3332221111', 'valid', 0, '2024-01-01', '{}')"
+        )
+        conn.commit()
+        conn.close()
+
+        store = VerificationStore(path)
+        self.assertEqual([v["first_name"] for v in store.search("garc")], ["Maria"])
+        store.close()
+
+    def test_cursor_pages_and_projection(self):
+        for name in ["A", "B", "C", "D", "E"]:
+            self.store.add(make_verification(name, "Doe"))
+
+        first = self.store.search(limit=2, fields=["first_name"], newest_first=True)
+        self.assertEqual(first, [{"id": 5, "first_name": "E"}, {"id": 4, "first_name": "D"}])
+        second = self.store.search(limit=2, after=first[-1]["id"], newest_first=True)
+        self.assertEqual([v["first_name"] for v in second], ["C", "B"])
+        self.assertIn("details", second[0])
+        self.assertEqual([v["first_name"] for v in self.store.search(after=3)], ["D", "E"])
+        with self.assertRaises(ValueError):
+            self.store.search(fields=["password"])
+
+    def test_state_tracks_changes(self):
+        before = self.store.state()
+        self.store.add(make_verification("John", "Doe"))
+        after = self.store.state()
+        self.assertEqual(after["count"], before["count"] + 1)
+        self.assertGreater(after["version"], before["version"])
+        self.assertEqual(self.store.count(), 1)
+
+    def test_survives_restart(self):
+        self.store.add(make_verification("John", "Doe"))
+        self.store.close()
+        reopened = VerificationStore(self.path)
+        self.assertEqual(reopened.get(1)["last_name"], "Doe")
+        reopened.close()
+
+    def test_unwritable_path_names_the_setting(self):
+        # A regular file where the database directory should be cannot be created
+        blocker = os.path.join(self.tmpdir, "blocker")
+        open(blocker, "w").close()
+        with self.assertRaises(RuntimeError) as raised:
+            VerificationStore(os.path.join(blocker, "verifications.sqlite3"))
+        self.assertIn("VERIFICATION_DB_PATH", str(raised.exception))
+
+    def test_concurrent_writers_get_unique_ids(self):
+        threads = [threading.Thread(target=lambda: [self.store.add(make_verification("Thread", "T")) for _ in range(20)])
+                   for _ in range(4)]
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=add_from_process, args=(self.path, 20)) for _ in range(2)]
+        for worker in threads + processes:
+            worker.start()
+        for worker in threads + processes:
+            worker.join()
+
+        ids = [v["id"] for v in self.store.search()]
+        self.assertEqual(len(ids), 120)
+        self.assertEqual(len(set(ids)), 120)
+
+if __name__ == '__main__':
+    unittest.main()
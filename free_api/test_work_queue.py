@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import verification_worker
+from work_queue import WorkQueue
+
+def drain(path, worker_id):
+    queue = WorkQueue(path)
+    queue.register_worker(worker_id)
+    while True:
+        items = queue.claim(worker_id, 5)
+        if not items:
+            break
+        for item in items:
+            queue.complete(item["id"], worker_id, {"n": item["payload"]["n"], "worker": worker_id})
+    queue.close()
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "queue.sqlite3")
+        self.queue = WorkQueue(self.path, visibility_timeout=60, max_attempts=2)
+
+    def tearDown(self):
+        self.queue.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_claim_and_complete(self):
+        self.queue.enqueue([{"n": 1}, {"n": 2}])
+        self.queue.register_worker("a")
+        items = self.queue.claim("a", 5)
+        self.assertEqual([item["payload"] for item in items], [{"n": 1}, {"n": 2}])
+        # Claimed items are hidden from other workers
+        self.assertEqual(self.queue.claim("b", 5), [])
+
+        self.assertTrue(self.queue.complete(items[0]["id"], "a", {"ok": True}))
+        stats = self.queue.stats()
+        self.assertEqual((stats["depth"], stats["in_flight"], stats["done"]), (1, 1, 1))
+        self.assertEqual(stats["workers"]["a"]["completed"], 1)
+        self.assertEqual([r["result"] for r in self.queue.results()], [{"ok": True}])
+
+    def test_crashed_worker_items_are_reclaimed(self):
+        self.queue.enqueue([{"n": 1}])
+        self.queue.visibility_timeout = 0.05
+        item = self.queue.claim("crashed", 1)[0]
+        time.sleep(0.1)
+        self.assertEqual(self.queue.stats()["expired"], 1)
+
+        reclaimed = self.queue.claim("b", 1)
+        self.assertEqual([i["id"] for i in reclaimed], [item["id"]])
+        self.assertEqual(reclaimed[0]["attempts"], 2)
+        # The worker that lost its claim cannot overwrite the new one
+        self.assertFalse(self.queue.complete(item["id"], "crashed", {"late": True}))
+
+    def test_renew_extends_only_a_live_claim(self):
+        self.queue.enqueue([{"n": 1}, {"n": 2}])
+        self.queue.visibility_timeout = 0.2
+        first, second = self.queue.claim("a", 2)
+        time.sleep(0.15)
+        self.assertTrue(self.queue.renew(second["id"], "a"))
+        time.sleep(0.1)
+        # The renewed claim is still held; the other one expired and can go to another worker
+        self.assertEqual([item["id"] for item in self.queue.claim("b", 5)], [first["id"]])
+        self.assertFalse(self.queue.renew(first["id"], "a"))
+        self.assertTrue(self.queue.complete(second["id"], "a", {"ok": True}))
+
+    def test_run_worker_skips_items_whose_claim_expired(self):
+        self.queue.enqueue([{"name": f"Lead {n}", "phone": "2125551234", "email": "lead@example.com"}
+                            for n in range(3)])
+        verified = []
+
+        def slow_verify(verifier, payload):
+            verified.append(payload["name"])
+            if len(verified) == 1:
+                # The first lead takes so long that the rest of the batch's claims expire and are taken
+                with self.queue._connection() as conn:
+                    conn.execute("UPDATE queue_items SET visible_at = 0 WHERE payload NOT LIKE '%Lead 0%'")
+                self.assertEqual(len(other.claim("b", 5)), 2)
+            return {"verified": True}
+
+        other = WorkQueue(self.path, visibility_timeout=60)
+        with patch.object(verification_worker, "verify_payload", side_effect=slow_verify), \
+                patch.object(verification_worker, "VerificationCache"), \
+                patch.object(verification_worker, "WorkQueue", return_value=self.queue), \
+                patch.object(self.queue, "close"):
+            completed = verification_worker.run_worker(self.path, "a", batch_size=3, exit_when_empty=True)
+        other.close()
+
+        # Only the first item was verified by this worker; the others now belong to "b"
+        self.assertEqual(completed, 1)
+        self.assertEqual(verified, ["Lead 0"])
+
+    def test_failed_items_retry_until_max_attempts(self):
+        self.queue.enqueue([{"n": 1}])
+        item = self.queue.claim("a", 1)[0]
+        self.queue.fail(item["id"], "a", "timeout")
+        item = self.queue.claim("a", 1)[0]
+        self.queue.fail(item["id"], "a", "timeout")
+
+        self.assertEqual(self.queue.claim("a", 1), [])
+        stats = self.queue.stats()
+        self.assertEqual((stats["depth"], stats["failed"]), (0, 1))
+        self.assertEqual(self.queue.results()[0]["error"], "timeout")
+
+    def test_worker_processes_share_the_queue(self):
+        self.queue.enqueue({"n": n} for n in range(200))
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=drain, args=(self.path, f"w{i}")) for i in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        results = self.queue.results()
+        self.assertEqual(sorted(r["result"]["n"] for r in results), list(range(200)))
+        stats = self.queue.stats()
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(sum(w["completed"] for w in stats["workers"].values()), 200)
+
+    def test_run_worker_verifies_queued_leads(self):
+        self.queue.enqueue([{"name": "John Doe", "phone": "2125551234", "email": "john@example.com"}])
+        with patch.object(verification_worker, "verify_payload", return_value={"verified": True}), \
+                patch.object(verification_worker, "VerificationCache"):
+            completed = verification_worker.run_worker(self.path, "w", exit_when_empty=True)
+
+        self.assertEqual(completed, 1)
+        self.assertEqual(self.queue.results()[0]["result"], {"verified": True})
+
+if __name__ == '__main__':
+    unittest.main()
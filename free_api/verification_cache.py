@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from phone_utils import phone_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "verification_cache.sqlite3")
+
+# Seconds a successful provider response stays valid.
+# Override with <PROVIDER>_CACHE_TTL, e.g. NEVERBOUNCE_CACHE_TTL=86400
+DEFAULT_TTLS = {
+    "numverify": 30 * 24 * 3600,
+    "neverbounce": 7 * 24 * 3600,
+    "microbilt": 30 * 24 * 3600,
+    "forewarn": 30 * 24 * 3600
+}
+
+def normalize_phone_key(phone: str) -> str:
+    """Canonical cache key for a phone number (E.164 for valid NANP numbers)"""
+    return phone_key(phone)
+
+def normalize_email_key(email: str) -> str:
+    """Canonical cache key for an email address"""
+    return (email or "").strip().lower()
+
+def normalize_name_key(name: str) -> str:
+    """Canonical cache key for a person's name"""
+    return " ".join((name or "").lower().split())
+
+# Email results that only say the check could not finish this time (greylisting, a timed-out
+# SMTP probe), so a retry may well succeed. "catchall" describes the domain and is kept.
+TRANSIENT_EMAIL_RESULTS = {"unknown"}
+
+def is_cacheable(result) -> bool:
+    """
+    Only conclusive provider responses are cached; errors, skipped checks and
+    transient answers such as NeverBounce "unknown" never are
+    """
+    return (isinstance(result, dict) and "error" not in result and result.get("status") != "skipped"
+            and result.get("result") not in TRANSIENT_EMAIL_RESULTS)
+
+class VerificationCache:
+    """
+    Two-tier cache for provider verification results.
+
+    Lookups go to an in-process LRU first and fall back to a SQLite file, so
+    results survive across runs and uploads. Entries expire after a per-provider
+    TTL. Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000,
+                 ttls: Optional[Dict[str, int]] = None, bypass: bool = False, refresh: bool = False):
+        """
+        Args:
+            path: SQLite file for the persistent tier (default: VERIFICATION_CACHE_PATH
+                  or .cache/verification_cache.sqlite3 next to this module)
+            max_entries: Size of the in-process LRU tier
+            ttls: Per-provider TTLs in seconds, overriding the defaults
+            bypass: Neither read nor write the cache
+            refresh: Ignore cached entries but store fresh results
+        """
+        self.path = path or os.getenv("VERIFICATION_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.bypass = bypass
+        self.refresh = refresh
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.stores = 0
+
+    def ttl_for(self, provider: str) -> int:
+        value = os.getenv(f"{provider.upper()}_CACHE_TTL")
+        if value and value.isdigit():
+            return int(value)
+        return self.ttls.get(provider, 24 * 3600)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verification_cache ("
+                "provider TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (provider, key))"
+            )
+        return self._conn
+
+    def _remember(self, cache_key: Tuple[str, str], expires_at: float, value: Dict) -> None:
+        self._memory[cache_key] = (expires_at, value)
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, provider: str, key: str) -> Optional[Dict]:
+        """Return the cached result for a provider lookup, or None"""
+        if self.bypass or not key:
+            return None
+        now = time.time()
+        cache_key = (provider, key)
+        with self._lock:
+            if self.refresh:
+                self.misses += 1
+                return None
+
+            entry = self._memory.get(cache_key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+            self._memory.pop(cache_key, None)
+
+            try:
+                row = self._connection().execute(
+                    "SELECT value, expires_at FROM verification_cache WHERE provider = ? AND key = ?",
+                    (provider, key)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Verification cache read failed: {e}")
+                row = None
+
+            if row and row[1] > now:
+                value = json.loads(row[0])
+                self._remember(cache_key, row[1], value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+            self.misses += 1
+            return None
+
+    def set(self, provider: str, key: str, value: Dict) -> None:
+        """Store a successful provider result; error responses are ignored"""
+        if self.bypass or not key or not is_cacheable(value):
+            return
+        expires_at = time.time() + self.ttl_for(provider)
+        with self._lock:
+            self._remember((provider, key), expires_at, value)
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO verification_cache (provider, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (provider, key, json.dumps(value), expires_at)
+                )
+                conn.commit()
+                self.stores += 1
+            except sqlite3.Error as e:
+                logger.warning(f"Verification cache write failed: {e}")
+
+    def get_or_fetch(self, provider: str, key: str, fetch: Callable[[], Dict]) -> Dict:
+        """Return the cached result or call fetch() and cache what it returns"""
+        cached = self.get(provider, key)
+        if cached is not None:
+            return cached
+        result = fetch()
+        self.set(provider, key, result)
+        return result
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the persistent tier and return how many were removed"""
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM verification_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            conn.commit()
+            return removed
+
+    def stats(self) -> Dict:
+        """Hit and miss counters for this cache instance"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "stores": self.stores,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
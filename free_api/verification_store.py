@@ -0,0 +1,274 @@
+import json
+import os
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data", "verifications.sqlite3")
+
+# Seconds a writer waits for another process's transaction before giving up
+BUSY_TIMEOUT = float(os.getenv("VERIFICATION_DB_BUSY_TIMEOUT", "5"))
+
+COLUMNS = ("id", "first_name", "last_name", "email", "phone", "status", "risk_score", "timestamp", "details")
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS verifications ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "first_name TEXT NOT NULL, last_name TEXT NOT NULL, email TEXT NOT NULL, phone TEXT NOT NULL, "
+    "status TEXT NOT NULL, risk_score REAL NOT NULL, timestamp TEXT NOT NULL, details TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_status ON verifications (status)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_risk_score ON verifications (risk_score)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_timestamp ON verifications (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_email ON verifications (email COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_phone ON verifications (phone)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_last_name ON verifications (last_name COLLATE NOCASE)",
+    # Row count and a change counter, kept current by triggers so neither needs a table scan
+    "CREATE TABLE IF NOT EXISTS verification_meta (key TEXT PRIMARY KEY, value REAL NOT NULL)",
+    "INSERT OR IGNORE INTO verification_meta (key, value) VALUES "
+    "('count', (SELECT COUNT(*) FROM verifications)), ('version', 0), ('modified_at', strftime('%s', 'now'))",
+    "CREATE TRIGGER IF NOT EXISTS verification_meta_insert AFTER INSERT ON verifications BEGIN "
+    "UPDATE verification_meta SET value = value + 1 WHERE key IN ('count', 'version'); "
+    "UPDATE verification_meta SET value = strftime('%s', 'now') WHERE key = 'modified_at'; END",
+    "CREATE TRIGGER IF NOT EXISTS verification_meta_delete AFTER DELETE ON verifications BEGIN "
+    "UPDATE verification_meta SET value = value + (CASE key WHEN 'count' THEN -1 ELSE 1 END) "
+    "WHERE key IN ('count', 'version'); "
+    "UPDATE verification_meta SET value = strftime('%s', 'now') WHERE key = 'modified_at'; END",
+    "CREATE TRIGGER IF NOT EXISTS verification_meta_update AFTER UPDATE ON verifications BEGIN "
+    "UPDATE verification_meta SET value = value + 1 WHERE key = 'version'; "
+    "UPDATE verification_meta SET value = strftime('%s', 'now') WHERE key = 'modified_at'; END"
+]
+
+INSERT_SQL = (
+    f"INSERT INTO verifications ({', '.join(COLUMNS[1:])}) VALUES ({', '.join('?' * (len(COLUMNS) - 1))})"
+)
+
+SEARCH_COLUMNS = ("first_name", "last_name", "email", "phone")
+
+# Trigram full-text index over the searchable columns, kept in step with the
+# verifications table by triggers. Needs SQLite 3.34+ built with FTS5.
+SEARCH_SCHEMA = [
+    "CREATE VIRTUAL TABLE verifications_search USING fts5("
+    "first_name, last_name, email, phone, content='verifications', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER verifications_search_insert AFTER INSERT ON verifications BEGIN "
+    "INSERT INTO verifications_search (rowid, first_name, last_name, email, phone) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone); END",
+    "CREATE TRIGGER verifications_search_delete AFTER DELETE ON verifications BEGIN "
+    "INSERT INTO verifications_search (verifications_search, rowid, first_name, last_name, email, phone) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone); END",
+    "CREATE TRIGGER verifications_search_update AFTER UPDATE ON verifications BEGIN "
+    "INSERT INTO verifications_search (verifications_search, rowid, first_name, last_name, email, phone) "
+    "VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone); "
+    "INSERT INTO verifications_search (rowid, first_name, last_name, email, phone) "
+    "VALUES (new.id, new.first_name, new.last_name, new.email, new.phone); END",
+    # Index anything stored before the search table existed
+    "INSERT INTO verifications_search (verifications_search) VALUES ('rebuild')"
+]
+
+# Trigram queries need at least this many characters; shorter ones scan
+MIN_INDEXED_SEARCH = 3
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _fts_phrase(value: str) -> str:
+    """Quote a search term so FTS5 matches it literally"""
+    return '"' + value.replace('"', '""') + '"'
+
+class SQLiteStore:
+    """
+    Base for stores kept in the shared SQLite database.
+
+    The database runs in WAL mode, so readers never block the writer and
+    several worker processes can share one file. Each thread gets its own
+    connection, and a process forked after the store was created opens
+    fresh ones. Subclasses list their CREATE statements in schema.
+    """
+
+    schema: List[str] = []
+    path_env = "VERIFICATION_DB_PATH"
+    default_path = DEFAULT_DB_PATH
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file (default: the environment variable named by path_env,
+                  VERIFICATION_DB_PATH, or else .data/verifications.sqlite3 next to this module)
+        """
+        self.path = path or os.getenv(self.path_env, self.default_path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        # Fail at startup with a pointer to the setting, e.g. on a read-only serverless filesystem
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connection()
+            with conn:
+                for statement in self.schema:
+                    conn.execute(statement)
+        except (OSError, sqlite3.OperationalError) as e:
+            raise RuntimeError(f"Cannot open the SQLite database at {self.path} ({e}); "
+                               f"set {self.path_env} to a writable location") from e
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # Connections must not cross a fork (e.g. gunicorn --preload workers)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened by this store"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+class VerificationStore(SQLiteStore):
+    """
+    Persistent store for the verifications shown in the dashboard history.
+
+    Ids come from AUTOINCREMENT inside the insert itself, so concurrent
+    writers (threads or worker processes) never hand out the same id.
+
+    Name, email and phone searches go through an FTS5 trigram index, so
+    substring queries do not scan the whole history. Where FTS5 is not
+    available the store falls back to LIKE scans.
+    """
+
+    schema = SCHEMA
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        self.indexed_search = self._create_search_index(self._connection())
+
+    def _create_search_index(self, conn: sqlite3.Connection) -> bool:
+        """Create the trigram search index if needed; return whether it is usable"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'verifications_search'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            with conn:
+                for statement in SEARCH_SCHEMA:
+                    conn.execute(statement)
+            return True
+        except sqlite3.OperationalError as e:
+            # Another process may have created it first
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'verifications_search'"
+            ).fetchone():
+                return True
+            logger.warning(f"Trigram search index unavailable, searching with LIKE scans: {e}")
+            return False
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        verification = dict(row)
+        if "details" in verification:
+            verification["details"] = json.loads(verification["details"])
+        return verification
+
+    def add(self, verification: Dict) -> Dict:
+        """Store a verification and return it with its newly allocated id"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(INSERT_SQL, self._row_values(verification))
+        return dict(verification, id=cursor.lastrowid)
+
+    def add_many(self, verifications: Iterable[Dict]) -> int:
+        """Store several verifications in one transaction and return how many were added"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.executemany(INSERT_SQL, (self._row_values(v) for v in verifications))
+        return cursor.rowcount
+
+    @staticmethod
+    def _row_values(verification: Dict) -> List:
+        return [verification[column] for column in COLUMNS[1:-1]] + [json.dumps(verification["details"])]
+
+    def get(self, verification_id: int) -> Optional[Dict]:
+        """Return a single verification, or None"""
+        row = self._connection().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM verifications WHERE id = ?", (verification_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def search(self, search: str = "", status: str = "", limit: Optional[int] = None,
+               after: Optional[int] = None, fields: Optional[Sequence[str]] = None,
+               newest_first: bool = False) -> List[Dict]:
+        """
+        Verifications in the order they were stored, optionally filtered and paged.
+
+        Args:
+            search: Case-insensitive substring of first name, last name, email or phone
+            status: Exact status, e.g. "valid" or "invalid"
+            limit: Maximum number of verifications to return
+            after: Cursor; only return verifications that come after this id
+                   in the requested order
+            fields: Columns to return (id is always included); default is all
+            newest_first: Return the most recent verifications first
+
+        Raises:
+            ValueError: If fields names an unknown column
+        """
+        columns = list(COLUMNS)
+        if fields:
+            unknown = [field for field in fields if field not in COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            columns = ["id"] + [column for column in COLUMNS[1:] if column in fields]
+
+        clauses = []
+        params: List = []
+        if search and self.indexed_search and len(search) >= MIN_INDEXED_SEARCH:
+            clauses.append("id IN (SELECT rowid FROM verifications_search WHERE verifications_search MATCH ?)")
+            params.append(_fts_phrase(search))
+        elif search:
+            pattern = f"%{_escape_like(search)}%"
+            clauses.append("(" + " OR ".join(
+                f"{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS
+            ) + ")")
+            params.extend([pattern] * len(SEARCH_COLUMNS))
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if after is not None:
+            clauses.append("id < ?" if newest_first else "id > ?")
+            params.append(after)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        sql = f"SELECT {', '.join(columns)} FROM verifications{where} ORDER BY id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self._connection().execute(sql, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def state(self) -> Dict:
+        """Row count, a counter bumped by every change, and when the last change happened"""
+        rows = self._connection().execute("SELECT key, value FROM verification_meta").fetchall()
+        meta = {key: value for key, value in rows}
+        return {
+            "count": int(meta["count"]),
+            "version": int(meta["version"]),
+            "modified_at": meta["modified_at"]
+        }
+
+    def count(self) -> int:
+        return self.state()["count"]
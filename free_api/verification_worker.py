@@ -0,0 +1,168 @@
+"""
+Verification workers fed by the durable work queue.
+
+    python verification_worker.py enqueue leads.csv      # add leads to the queue
+    python verification_worker.py work --processes 4     # verify them with 4 processes
+    python verification_worker.py stats                  # queue depth and worker throughput
+    python verification_worker.py results -o results     # write finished leads as JSON Lines
+
+Workers can be started and stopped at any time, from any number of shells
+sharing the queue file; an item a worker was holding when it died is picked
+up by another worker once its visibility timeout passes.
+"""
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from typing import Dict, Iterator, Optional
+
+from batch_planner import RequestCoalescer
+from free_lead_verification import LeadVerifier, lead_record
+from lead_sink import LeadSink
+from verification_cache import VerificationCache
+from work_queue import WorkQueue
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle worker waits before looking for new items again
+IDLE_SLEEP = float(os.getenv("WORKER_IDLE_SLEEP", "1"))
+
+def lead_payloads(file_path: str) -> Iterator[Dict]:
+    """Stream queue payloads from a CSV file with name, phone and email columns"""
+    with open(file_path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield {"name": row["name"], "phone": row["phone"], "email": row["email"]}
+
+def verify_payload(verifier: LeadVerifier, payload: Dict) -> Dict:
+    """Verify one queued lead and return its output record with a verified flag"""
+    result = verifier.verify_lead(payload["name"], payload["phone"], payload["email"])
+    record = lead_record(payload["name"], payload["phone"], payload["email"], result)
+    record["verified"] = result["verification_status"]["overall_status"] == "verified"
+    return record
+
+def run_worker(queue_path: Optional[str] = None, worker_id: Optional[str] = None, batch_size: int = 10,
+               max_items: Optional[int] = None, exit_when_empty: bool = False) -> int:
+    """
+    Claim and verify queued leads until stopped.
+
+    Args:
+        queue_path: Work queue file (default WORK_QUEUE_PATH)
+        worker_id: Name reported in queue stats (default host:pid:random)
+        batch_size: Items claimed at a time
+        max_items: Stop after this many items
+        exit_when_empty: Stop when no items are left instead of waiting for more
+
+    Returns:
+        Number of items completed
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    queue = WorkQueue(queue_path)
+    queue.register_worker(worker_id)
+    cache = VerificationCache()
+    completed = 0
+
+    try:
+        while max_items is None or completed < max_items:
+            limit = batch_size if max_items is None else min(batch_size, max_items - completed)
+            items = queue.claim(worker_id, limit)
+            if not items:
+                if exit_when_empty:
+                    break
+                time.sleep(IDLE_SLEEP)
+                continue
+
+            # Repeats within a claimed batch share one lookup; the cache covers the rest
+            verifier = LeadVerifier(cache, RequestCoalescer())
+            for item in items:
+                # The claim was taken for the whole batch; restart its timeout now this item
+                # is reached, and leave it alone if it already expired and went to another worker
+                if not queue.renew(item["id"], worker_id):
+                    logger.warning(f"Worker {worker_id} lost its claim on item {item['id']} before starting it")
+                    continue
+                try:
+                    record = verify_payload(verifier, item["payload"])
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} failed item {item['id']}: {e}")
+                    queue.fail(item["id"], worker_id, str(e))
+                    continue
+                if queue.complete(item["id"], worker_id, record):
+                    completed += 1
+                else:
+                    logger.warning(f"Worker {worker_id} lost its claim on item {item['id']}")
+    finally:
+        queue.close()
+        cache.close()
+
+    logger.info(f"Worker {worker_id} completed {completed} items")
+    return completed
+
+def start_workers(processes: int, queue_path: Optional[str] = None, **kwargs) -> None:
+    """Run several worker processes and wait for them to exit"""
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=run_worker, args=(queue_path,), kwargs=kwargs, name=f"verification-worker-{i}")
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+def export_results(output_dir: str, queue_path: Optional[str] = None, compress: bool = False) -> None:
+    """Write finished leads to verified_leads.jsonl and flagged_leads.jsonl"""
+    queue = WorkQueue(queue_path)
+    after = 0
+    with LeadSink(output_dir, compress) as sink:
+        while True:
+            items = queue.results(after, limit=1000)
+            if not items:
+                break
+            for item in items:
+                record = item["result"] or dict(item["payload"], error=item["error"])
+                sink.add(record, bool(record.get("verified")))
+            after = items[-1]["id"]
+    queue.close()
+    print(f"Saved verified leads to {sink.verified_path}")
+    print(f"Saved flagged leads to {sink.flagged_path}")
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Durable queue of leads verified by worker processes")
+    parser.add_argument("--queue", help="Work queue file (default WORK_QUEUE_PATH or .data/work_queue.sqlite3)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Add leads from a CSV file with name, phone and email columns")
+    enqueue.add_argument("csv_path")
+
+    work = commands.add_parser("work", help="Verify queued leads")
+    work.add_argument("--processes", "-p", type=int, default=os.cpu_count() or 1)
+    work.add_argument("--batch-size", type=int, default=10, help="Items claimed at a time")
+    work.add_argument("--exit-when-empty", action="store_true", help="Stop once the queue is drained")
+
+    commands.add_parser("stats", help="Show queue depth and worker throughput")
+
+    results = commands.add_parser("results", help="Write finished leads as JSON Lines")
+    results.add_argument("--output", "-o", default="results")
+    results.add_argument("--gzip", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        queue = WorkQueue(args.queue)
+        print(f"Enqueued {queue.enqueue(lead_payloads(args.csv_path))} leads")
+        queue.close()
+    elif args.command == "work":
+        start_workers(args.processes, args.queue, batch_size=args.batch_size, exit_when_empty=args.exit_when_empty)
+    elif args.command == "stats":
+        queue = WorkQueue(args.queue)
+        print(json.dumps(queue.stats(), indent=2))
+        queue.close()
+    else:
+        export_results(args.output, args.queue, args.gzip)
@@ -0,0 +1,221 @@
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from verification_store import SQLiteStore
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data", "work_queue.sqlite3")
+
+# Seconds a claimed item stays hidden from other workers before it is handed out again
+DEFAULT_VISIBILITY_TIMEOUT = float(os.getenv("WORK_QUEUE_VISIBILITY_TIMEOUT", "120"))
+
+# Claims of one item before it is given up on and marked failed
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3"))
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS queue_items ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, queue TEXT NOT NULL, payload TEXT NOT NULL, "
+    "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+    "claimed_by TEXT, visible_at REAL NOT NULL, enqueued_at REAL NOT NULL, finished_at REAL, "
+    "result TEXT, error TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_queue_items_claim ON queue_items (queue, status, visible_at)",
+    "CREATE TABLE IF NOT EXISTS queue_workers ("
+    "worker_id TEXT PRIMARY KEY, queue TEXT NOT NULL, completed INTEGER NOT NULL DEFAULT 0, "
+    "failed INTEGER NOT NULL DEFAULT 0, started_at REAL NOT NULL, last_seen REAL NOT NULL)"
+]
+
+class WorkQueue(SQLiteStore):
+    """
+    Durable work queue in a local SQLite file, shared by any number of processes.
+
+    Producers enqueue JSON payloads. Workers claim items, which hides them
+    from other workers for a visibility timeout, and then complete or fail
+    them. An item claimed by a worker that dies is handed out again once its
+    timeout passes, so nothing is lost; after max_attempts claims it is
+    marked failed instead. A worker whose claim has expired cannot complete
+    the item any more, so each item's result is written once. Workers that
+    claim several items at once renew each claim just before working on it,
+    so the timeout only has to cover one item.
+    """
+
+    schema = SCHEMA
+    path_env = "WORK_QUEUE_PATH"
+    default_path = DEFAULT_QUEUE_PATH
+
+    def __init__(self, path: Optional[str] = None, queue: str = "leads",
+                 visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """
+        Args:
+            path: SQLite file (default: WORK_QUEUE_PATH or .data/work_queue.sqlite3 next to this module)
+            queue: Name of the queue within the file
+            visibility_timeout: Seconds a claim lasts before the item is handed out again
+            max_attempts: Claims of an item before it is marked failed
+        """
+        super().__init__(path)
+        self.queue = queue
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    def enqueue(self, payloads: Iterable[Dict]) -> int:
+        """Add payloads to the queue and return how many were added"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            cursor = conn.executemany(
+                "INSERT INTO queue_items (queue, payload, visible_at, enqueued_at) VALUES (?, ?, ?, ?)",
+                ((self.queue, json.dumps(payload), now, now) for payload in payloads)
+            )
+        return cursor.rowcount
+
+    def register_worker(self, worker_id: str) -> None:
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO queue_workers (worker_id, queue, started_at, last_seen) VALUES (?, ?, ?, ?)",
+                (worker_id, self.queue, now, now)
+            )
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Dict]:
+        """
+        Claim up to limit items that are pending or whose earlier claim expired.
+
+        Returns dicts with id, payload and attempts.
+        """
+        now = time.time()
+        conn = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers never claim the same item
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Items that keep timing out are given up on rather than retried forever
+            conn.execute(
+                "UPDATE queue_items SET status = 'failed', finished_at = ?, error = 'visibility timeout exceeded' "
+                "WHERE queue = ? AND status = 'claimed' AND visible_at <= ? AND attempts >= ?",
+                (now, self.queue, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT id, payload, attempts FROM queue_items "
+                "WHERE queue = ? AND status IN ('pending', 'claimed') AND visible_at <= ? ORDER BY id LIMIT ?",
+                (self.queue, now, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE queue_items SET status = 'claimed', claimed_by = ?, visible_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    [(worker_id, now + self.visibility_timeout, row["id"]) for row in rows]
+                )
+            conn.execute("UPDATE queue_workers SET last_seen = ? WHERE worker_id = ?", (now, worker_id))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return [{"id": row["id"], "payload": json.loads(row["payload"]), "attempts": row["attempts"] + 1}
+                for row in rows]
+
+    def renew(self, item_id: int, worker_id: str) -> bool:
+        """
+        Extend a claim by another visibility timeout from now. Returns False if
+        the claim had already expired, in which case the item must be skipped:
+        another worker may be verifying it.
+        """
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            updated = conn.execute(
+                "UPDATE queue_items SET visible_at = ? "
+                "WHERE id = ? AND status = 'claimed' AND claimed_by = ? AND visible_at > ?",
+                (now + self.visibility_timeout, item_id, worker_id, now)
+            ).rowcount
+        return bool(updated)
+
+    def complete(self, item_id: int, worker_id: str, result: Dict) -> bool:
+        """Store an item's result; returns False if the worker's claim had already expired"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            updated = conn.execute(
+                "UPDATE queue_items SET status = 'done', finished_at = ?, result = ? "
+                "WHERE id = ? AND status = 'claimed' AND claimed_by = ? AND visible_at > ?",
+                (now, json.dumps(result), item_id, worker_id, now)
+            ).rowcount
+            if updated:
+                conn.execute(
+                    "UPDATE queue_workers SET completed = completed + 1, last_seen = ? WHERE worker_id = ?",
+                    (now, worker_id)
+                )
+        return bool(updated)
+
+    def fail(self, item_id: int, worker_id: str, error: str) -> bool:
+        """
+        Release an item after an error. It is retried by any worker until
+        max_attempts is reached, then marked failed.
+        """
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            updated = conn.execute(
+                "UPDATE queue_items SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "visible_at = ?, error = ?, finished_at = CASE WHEN attempts >= ? THEN ? END "
+                "WHERE id = ? AND status = 'claimed' AND claimed_by = ?",
+                (self.max_attempts, now, error, self.max_attempts, now, item_id, worker_id)
+            ).rowcount
+            if updated:
+                conn.execute(
+                    "UPDATE queue_workers SET failed = failed + 1, last_seen = ? WHERE worker_id = ?",
+                    (now, worker_id)
+                )
+        return bool(updated)
+
+    def results(self, after: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Finished items (done or failed) with id greater than after, in id order"""
+        sql = ("SELECT id, status, payload, result, error FROM queue_items "
+               "WHERE queue = ? AND status IN ('done', 'failed') AND id > ? ORDER BY id")
+        params: List = [self.queue, after]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {
+                "id": row["id"],
+                "status": row["status"],
+                "payload": json.loads(row["payload"]),
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"]
+            }
+            for row in self._connection().execute(sql, params)
+        ]
+
+    def stats(self) -> Dict:
+        """Queue depth by state and each worker's throughput"""
+        now = time.time()
+        conn = self._connection()
+        counts = {"pending": 0, "in_flight": 0, "expired": 0, "done": 0, "failed": 0}
+        for status, expired, count in conn.execute(
+            "SELECT status, status = 'claimed' AND visible_at <= ?, COUNT(*) FROM queue_items "
+            "WHERE queue = ? GROUP BY 1, 2", (now, self.queue)
+        ):
+            if status == "claimed":
+                counts["expired" if expired else "in_flight"] += count
+            else:
+                counts[status] += count
+
+        workers = {}
+        for row in conn.execute(
+            "SELECT worker_id, completed, failed, started_at, last_seen FROM queue_workers WHERE queue = ?",
+            (self.queue,)
+        ):
+            elapsed = row["last_seen"] - row["started_at"]
+            workers[row["worker_id"]] = {
+                "completed": row["completed"],
+                "failed": row["failed"],
+                "items_per_second": round(row["completed"] / elapsed, 2) if elapsed > 0 else 0.0,
+                "last_seen_seconds_ago": round(now - row["last_seen"], 1)
+            }
+
+        return {
+            # Items still to be verified, including ones whose worker has gone away
+            "depth": counts["pending"] + counts["expired"] + counts["in_flight"],
+            **counts,
+            "workers": workers
+        }
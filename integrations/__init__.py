@@ -1,6 +1,12 @@
-from .schemas.lead import Lead
+import os
+import sys
+
+# Verification runs through the shared provider code alongside the free API implementation
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "free_api"))
+
+from .schemas.lead import Lead, LeadBatch
 from .adapters.base import BaseAdapter
 from .adapters.csv_adapter import CSVAdapter
 from .manager import IntegrationManager
 
-__all__ = ['Lead', 'BaseAdapter', 'CSVAdapter', 'IntegrationManager'] 
\ No newline at end of file
+__all__ = ['Lead', 'LeadBatch', 'BaseAdapter', 'CSVAdapter', 'IntegrationManager']
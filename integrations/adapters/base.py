@@ -1,10 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from ..schemas.lead import Lead
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..schemas.lead import Lead, LeadBatch
+
+# A whole source table: a DataFrame, or a dict of column name to values
+Table = Union[pd.DataFrame, Dict[str, Sequence[Any]]]
+
+def text_column(values: pd.Series) -> List[str]:
+    """
+    A column's values as strings, with nulls as "".
+
+    read_csv loads a numeric column with any blank cell as float64, so whole
+    numbers are written without the trailing ".0" (2125551234.0 -> "2125551234").
+    """
+    if not pd.api.types.is_float_dtype(values):
+        return values.fillna("").astype(str).tolist()
+    present = values.notna().to_numpy()
+    whole = present & (np.mod(values.fillna(0).to_numpy(), 1) == 0)
+    text = values.astype(str).to_numpy(dtype=object)
+    text[whole] = values[whole].to_numpy().astype(np.int64).astype(str)
+    text[~present] = ""
+    return text.tolist()
+
+def is_blank(value: Any) -> bool:
+    """Whether a source value counts as missing: None, a null such as NaN, or a blank string"""
+    if isinstance(value, str):
+        return not value.strip()
+    return value is None or (pd.api.types.is_scalar(value) and bool(pd.isna(value)))
 
 class BaseAdapter(ABC):
     """Base adapter interface for all CRM and lead source integrations"""
     
+    # Source columns every row must have a non-blank value for (see missing_fields)
+    required_fields: Tuple[str, ...] = ()
+    
+    # Source column holding each Lead field, for convert_table
+    field_columns: Dict[str, str] = {
+        "id": "id",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": "email",
+        "phone": "phone"
+    }
+    
     @abstractmethod
     def convert_to_lead(self, data: Dict[str, Any]) -> Lead:
         """Convert source-specific data to standard Lead format"""
@@ -20,6 +61,16 @@ class BaseAdapter(ABC):
         """Validate that the incoming data matches the expected format"""
         pass
     
+    def missing_fields(self, data: Dict[str, Any]) -> List[str]:
+        """
+        Required fields a source row lacks: absent, null or blank.
+        
+        This is the one rule every entry point rejects rows by (validate_table
+        applies it to whole columns), and rejected rows are reported as
+        {"row": position, "missing": missing_fields(row)}.
+        """
+        return [field for field in self.required_fields if is_blank(data.get(field))]
+    
     @abstractmethod
     def get_source_name(self) -> str:
         """Return the name of the source this adapter handles"""
@@ -29,6 +80,115 @@ class BaseAdapter(ABC):
         """Process a batch of leads from the source"""
         return [self.convert_to_lead(data) for data in data_list]
     
-    def export_batch(self, leads: List[Lead]) -> List[Dict[str, Any]]:
-        """Export a batch of leads back to the source format"""
-        return [self.convert_from_lead(lead) for lead in leads] 
\ No newline at end of file
+    def iter_leads(self, source: Any, errors: Optional[List[Dict[str, Any]]] = None) -> Iterator[Lead]:
+        """
+        Yield leads from a source one at a time, without loading it all.
+        
+        The default accepts any iterable of source rows; adapters override it to
+        read their own source format (a file, an API cursor) directly. Rows
+        missing required fields are skipped, and reported to errors as
+        {"row": position, "missing": [fields]} when it is given.
+        """
+        for row, data in enumerate(source):
+            if self.accept_row(row, data, errors):
+                yield self.convert_to_lead(data)
+    
+    def accept_row(self, row: int, data: Dict[str, Any], errors: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Whether a source row has every required field; if not, it is reported
+        to errors as {"row": row, "missing": [fields]} when errors is given.
+        """
+        missing = self.missing_fields(data)
+        if missing and errors is not None:
+            errors.append({"row": row, "missing": missing})
+        return not missing
+    
+    def export_stream(self, leads: Iterable[Lead], sink: Any) -> int:
+        """
+        Export leads one at a time as they arrive, returning how many were written.
+        
+        The default calls sink with each exported row; adapters override it to
+        write their own destination format directly.
+        """
+        count = 0
+        for lead in leads:
+            sink(self.convert_from_lead(lead))
+            count += 1
+        return count
+    
+    def convert_to_batch(self, data_list: List[Dict[str, Any]]) -> LeadBatch:
+        """
+        Convert a batch of source rows to a columnar LeadBatch.
+        
+        The default packs convert_to_lead results; adapters for large sources
+        should override it to build the columns directly.
+        """
+        return LeadBatch.from_leads(self.process_batch(data_list), self.get_source_name())
+    
+    def validate_table(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Check required_fields across every row at once, by the same rule as
+        missing_fields.
+        
+        Returns:
+            A boolean DataFrame with one column per required field, True where
+            the row's value is missing (no such column, null or blank)
+        """
+        missing = {}
+        for field in self.required_fields:
+            if field not in frame.columns:
+                missing[field] = np.ones(len(frame), dtype=bool)
+                continue
+            column = frame[field]
+            absent = column.isna().to_numpy()
+            if column.dtype == object or pd.api.types.is_string_dtype(column):
+                # Blank and whitespace-only strings count as missing too
+                absent = absent | (column == "").to_numpy() | column.str.isspace().fillna(False).to_numpy(dtype=bool)
+            missing[field] = absent
+        return pd.DataFrame(missing, index=frame.index, columns=list(self.required_fields), dtype=bool)
+    
+    def convert_table(self, table: Table) -> Tuple[LeadBatch, List[Dict[str, Any]]]:
+        """
+        Validate and convert a whole source table in column operations.
+        
+        Args:
+            table: A DataFrame or a dict of column name to values
+        
+        Returns:
+            A tuple (batch, errors). batch is a LeadBatch of the valid rows, with
+            the valid part of the table kept as its raw data. errors has one
+            {"row": position, "missing": [fields]} entry per rejected row, in
+            row order.
+        """
+        frame = table if isinstance(table, pd.DataFrame) else pd.DataFrame(table)
+        missing = self.validate_table(frame)
+        rejected = missing.to_numpy().any(axis=1)
+        
+        errors = []
+        if rejected.any():
+            fields = np.array(missing.columns)
+            flags = missing.to_numpy()
+            errors = [{"row": int(row), "missing": fields[flags[row]].tolist()} for row in np.flatnonzero(rejected)]
+            frame = frame[~rejected]
+        
+        def column(field: str) -> List[str]:
+            name = self.field_columns.get(field, field)
+            if name not in frame.columns:
+                return [""] * len(frame)
+            return text_column(frame[name])
+        
+        batch = LeadBatch(
+            self.get_source_name(),
+            column("id"),
+            column("first_name"),
+            column("last_name"),
+            column("email"),
+            column("phone"),
+            raw=frame
+        )
+        return batch, errors
+    
+    def export_batch(self, leads: Union[List[Lead], LeadBatch]) -> List[Dict[str, Any]]:
+        """Export a batch of leads (a list or a LeadBatch) back to the source format"""
+        return [self.convert_from_lead(lead) for lead in leads]
+ 
\ No newline at end of file
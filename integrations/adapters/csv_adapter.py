@@ -1,13 +1,18 @@
-from typing import Dict, Any
+import csv
+import json
+import os
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
 from .base import BaseAdapter
-from ..schemas.lead import Lead
+from ..schemas.lead import Lead, LeadBatch
 from datetime import datetime
 
 class CSVAdapter(BaseAdapter):
     """Adapter for handling CSV-formatted lead data"""
     
-    def convert_to_lead(self, data: Dict[str, Any]) -> Lead:
-        """Convert CSV row to Lead format"""
+    required_fields = ("first_name", "last_name", "email", "phone")
+    
+    def convert_to_lead(self, data: Dict[str, Any], created_at: Optional[datetime] = None) -> Lead:
+        """Convert CSV row to Lead format, optionally with a timestamp shared by its batch"""
         return Lead(
             id=str(data.get("id", "")),
             first_name=str(data.get("first_name", "")),
@@ -15,7 +20,7 @@ class CSVAdapter(BaseAdapter):
             email=str(data.get("email", "")),
             phone=str(data.get("phone", "")),
             source="csv",
-            created_at=datetime.now(),
+            created_at=created_at or datetime.now(),
             metadata={},
             raw_data=data
         )
@@ -33,10 +38,83 @@ class CSVAdapter(BaseAdapter):
             "risk_factors": lead.risk_factors
         }
     
+    def process_batch(self, data_list: List[Dict[str, Any]]) -> List[Lead]:
+        """Convert CSV rows to Leads that share one created_at"""
+        created_at = datetime.now()
+        return [self.convert_to_lead(data, created_at) for data in data_list]
+    
+    def convert_to_batch(self, data_list: List[Dict[str, Any]]) -> LeadBatch:
+        """Convert CSV rows straight to columns; the rows are kept by reference as raw data"""
+        return LeadBatch.from_records(data_list, "csv")
+    
+    def export_batch(self, leads: Union[List[Lead], LeadBatch]) -> List[Dict[str, Any]]:
+        """Convert leads to CSV rows, reading a LeadBatch's columns without building Lead objects"""
+        if not isinstance(leads, LeadBatch):
+            return super().export_batch(leads)
+        return [
+            {
+                "id": leads.ids[index],
+                "first_name": leads.first_names[index],
+                "last_name": leads.last_names[index],
+                "email": leads.emails[index],
+                "phone": leads.phones[index],
+                "verification_status": leads.verification_status[index],
+                "risk_score": leads.risk_scores[index],
+                "risk_factors": leads.risk_factors[index]
+            }
+            for index in range(len(leads))
+        ]
+    
+    def iter_leads(self, source: Any, errors: Optional[List[Dict[str, Any]]] = None) -> Iterator[Lead]:
+        """
+        Stream leads from a CSV file, one row at a time.
+        
+        Args:
+            source: Path to a CSV file with a header row, an open text file, or
+                    an iterable of row dicts
+            errors: Optional list that rows missing required fields (see
+                    missing_fields) are reported to as {"row": position,
+                    "missing": [fields]} instead of being yielded
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, newline="") as f:
+                yield from self.iter_leads(f, errors)
+            return
+        
+        rows = csv.DictReader(source) if hasattr(source, "read") else source
+        created_at = datetime.now()
+        for row, data in enumerate(rows):
+            if self.accept_row(row, data, errors):
+                yield self.convert_to_lead(data, created_at)
+    
+    def export_stream(self, leads: Iterable[Lead], sink: Any) -> int:
+        """
+        Write leads to a CSV file as they arrive and return how many were written.
+        
+        Args:
+            leads: Any iterable of leads, e.g. IntegrationManager.process_stream
+            sink: Path of the CSV file to write, or an open text file
+        """
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, "w", newline="") as f:
+                return self.export_stream(leads, f)
+        
+        writer = None
+        count = 0
+        for lead in leads:
+            row = self.convert_from_lead(lead)
+            if writer is None:
+                writer = csv.DictWriter(sink, fieldnames=list(row))
+                writer.writeheader()
+            # Nested verification results go in as JSON rather than Python reprs
+            writer.writerow({key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                             for key, value in row.items()})
+            count += 1
+        return count
+    
     def validate_source_data(self, data: Dict[str, Any]) -> bool:
-        """Validate CSV row data"""
-        required_fields = ["first_name", "last_name", "email", "phone"]
-        return all(field in data for field in required_fields)
+        """Validate CSV row data: every required field present and not blank"""
+        return not self.missing_fields(data)
     
     def get_source_name(self) -> str:
         return "csv" 
\ No newline at end of file
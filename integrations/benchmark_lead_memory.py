@@ -0,0 +1,99 @@
+"""
+Benchmark the memory held by converted leads: the previous dataclass Lead,
+the slotted Lead and the columnar LeadBatch.
+
+Source rows are generated before measuring, so the numbers are what each
+representation adds on top of the rows it was converted from. Run from the
+repository root:
+
+    python -m integrations.benchmark_lead_memory
+    python -m integrations.benchmark_lead_memory --sizes 1000000
+"""
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .adapters.csv_adapter import CSVAdapter
+
+@dataclass
+class DataclassLead:
+    """The Lead schema before it was slotted, for comparison"""
+    id: str
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+    source: str
+    created_at: datetime
+    metadata: Dict[str, Any]
+    raw_data: Dict[str, Any]
+    verification_status: Optional[Dict[str, Any]] = None
+    risk_score: Optional[float] = None
+    risk_factors: Optional[List[str]] = None
+
+def dataclass_leads(rows: List[Dict[str, Any]]) -> List[DataclassLead]:
+    """Convert rows the way CSVAdapter.convert_to_lead did with the dataclass Lead"""
+    return [
+        DataclassLead(
+            id=str(row.get("id", "")),
+            first_name=str(row.get("first_name", "")),
+            last_name=str(row.get("last_name", "")),
+            email=str(row.get("email", "")),
+            phone=str(row.get("phone", "")),
+            source="csv",
+            created_at=datetime.now(),
+            metadata={},
+            raw_data=row
+        )
+        for row in rows
+    ]
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": str(index),
+            "first_name": f"First{index}",
+            "last_name": f"Last{index}",
+            "email": f"lead{index}@example.com",
+            "phone": f"212555{index % 10000:04d}",
+            "company": "Example Co"
+        }
+        for index in range(count)
+    ]
+
+def measure(build: Callable[[List[Dict[str, Any]]], Any], rows: List[Dict[str, Any]]) -> int:
+    """Bytes still allocated by build(rows) once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    adapter = CSVAdapter()
+    variants = {
+        "dataclass Lead": dataclass_leads,
+        "slotted Lead": adapter.process_batch,
+        "LeadBatch": adapter.convert_to_batch
+    }
+
+    print(f"{'leads':>10}  {'representation':<16} {'MiB':>9} {'bytes/lead':>11}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        for name, build in variants.items():
+            used = measure(build, rows)
+            print(f"{size:>10}  {name:<16} {used / 2 ** 20:>9.1f} {used / size:>11.0f}")
+        del rows
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,29 @@
-from typing import Dict, Type, List, Any
-from .adapters.base import BaseAdapter
-from .schemas.lead import Lead
-from free_lead_verification import verify_lead
+from typing import Dict, Type, List, Any, Optional, Union, Iterable, Iterator
+from .adapters.base import BaseAdapter, Table
+from .schemas.lead import Lead, LeadBatch
+from .runners import DEDUPE_WINDOW, EXECUTORS, INTEGRATION_EXECUTOR, INTEGRATION_MAX_IN_FLIGHT, verify_contacts
+from free_lead_verification import LeadVerifier, verify_lead
+from batch_planner import BatchPlan, RequestCoalescer
 
 class IntegrationManager:
     """Manages lead source integrations and processing"""
     
-    def __init__(self):
+    def __init__(self, executor: Optional[str] = None, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            executor: How batches are verified: "sequential" (one lead at a time),
+                      "threads" or "asyncio" (default INTEGRATION_EXECUTOR, then sequential)
+            max_in_flight: Leads verified at once by the concurrent executors
+                           (default INTEGRATION_MAX_IN_FLIGHT, then 8)
+        """
+        self.executor = executor or INTEGRATION_EXECUTOR
+        if self.executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {self.executor!r}; expected one of {', '.join(EXECUTORS)}")
+        self.max_in_flight = max_in_flight or INTEGRATION_MAX_IN_FLIGHT
         self._adapters: Dict[str, BaseAdapter] = {}
+        self.last_batch_report: Optional[Dict[str, Any]] = None
+        # Rows the last batch rejected, as {"row": position, ...} entries
+        self.last_batch_errors: List[Dict[str, Any]] = []
     
     def register_adapter(self, adapter: BaseAdapter) -> None:
         """Register a new adapter"""
@@ -30,32 +46,134 @@ class IntegrationManager:
         verification_result = verify_lead(lead.first_name, lead.last_name, lead.phone, lead.email)
         
         # Update lead with verification results
-        lead.verification_status = verification_result
-        lead.risk_score = verification_result.get("risk_score")
-        lead.risk_factors = verification_result.get("risk_factors")
+        self._apply_result(lead, verification_result)
         
         return lead
     
-    def process_batch(self, source_name: str, data_list: List[Dict[str, Any]]) -> List[Lead]:
-        """Process multiple leads from a specific source"""
+    def process_batch(self, source_name: str,
+                      data_list: Union[List[Dict[str, Any]], LeadBatch]) -> Union[List[Lead], LeadBatch]:
+        """
+        Process multiple leads from a specific source.
+        
+        Pass source rows to get a list of Leads back, or a LeadBatch (see
+        BaseAdapter.convert_to_batch) to have its verification columns filled
+        in place and the same batch returned.
+        
+        Source rows missing required fields (the adapter's missing_fields) are
+        skipped and reported in last_batch_errors as {"row", "missing"}. Leads are verified with the
+        manager's executor; duplicate contacts are verified once, and leads
+        sharing a phone, email or name+phone reuse a single provider lookup.
+        The deduplication report is kept in last_batch_report.
+        """
         adapter = self.get_adapter(source_name)
-        leads = adapter.process_batch(data_list)
+        self.last_batch_errors = []
+        if isinstance(data_list, LeadBatch):
+            return self._process_lead_batch(data_list)
+        
+        valid_rows = [data for row, data in enumerate(data_list) if adapter.accept_row(row, data, self.last_batch_errors)]
+        leads = adapter.process_batch(valid_rows)
+        plan = BatchPlan((f"{lead.first_name} {lead.last_name}".strip(), lead.phone, lead.email) for lead in leads)
         
         # Process each lead through verification
-        for lead in leads:
-            verification_result = verify_lead(lead.first_name, lead.last_name, lead.phone, lead.email)
-            lead.verification_status = verification_result
-            lead.risk_score = verification_result.get("risk_score")
-            lead.risk_factors = verification_result.get("risk_factors")
+        contacts = ((lead, lead.first_name, lead.last_name, lead.phone, lead.email) for lead in leads)
+        for lead, verification_result in self._verify(contacts):
+            self._apply_result(lead, verification_result)
         
+        self.last_batch_report = plan.report()
         return leads
     
+    def process_stream(self, source_name: str, data: Iterable[Union[Dict[str, Any], Lead]]) -> Iterator[Lead]:
+        """
+        Verify source rows and yield each Lead as soon as its verification finishes.
+        
+        data may hold source rows or Leads already converted by the adapter
+        (e.g. from adapter.iter_leads). Items are read lazily, only as fast as
+        the executor has room for them, and only a bounded window of recent
+        lookups is kept for deduplication, so memory stays flat however long
+        the stream is. With a concurrent executor leads come out in completion
+        order, not input order. Invalid rows are skipped and reported in
+        last_batch_errors; once the stream is exhausted, last_batch_report
+        holds the lead and lookup counts.
+        """
+        adapter = self.get_adapter(source_name)
+        self.last_batch_errors = []
+        stats: Dict[str, int] = {}
+        
+        def contacts():
+            for row, item in enumerate(data):
+                if isinstance(item, Lead):
+                    lead = item
+                elif adapter.accept_row(row, item, self.last_batch_errors):
+                    lead = adapter.convert_to_lead(item)
+                else:
+                    continue
+                yield lead, lead.first_name, lead.last_name, lead.phone, lead.email
+        
+        # Three provider lookups per lead
+        coalescer = RequestCoalescer(max_entries=3 * DEDUPE_WINDOW)
+        for lead, verification_result in self._verify(contacts(), stats, coalescer):
+            self._apply_result(lead, verification_result)
+            yield lead
+        
+        self.last_batch_report = {"rows": stats["leads"], "unique_contacts": stats["verified"],
+                                  "duplicates_reused": stats["leads"] - stats["verified"]}
+    
+    def sync_stream(self, source_name: str, source: Any, sink: Any) -> int:
+        """
+        Read leads from a source, verify them and export them to a sink as they
+        finish, in constant memory. For CSV, source and sink are file paths or
+        open files. Rows the adapter rejects on reading are added to
+        last_batch_errors. Returns the number of leads exported.
+        """
+        adapter = self.get_adapter(source_name)
+        read_errors: List[Dict[str, Any]] = []
+        leads = adapter.iter_leads(source, read_errors)
+        count = adapter.export_stream(self.process_stream(source_name, leads), sink)
+        self.last_batch_errors = read_errors + self.last_batch_errors
+        return count
+    
+    def _verify(self, contacts, stats: Optional[Dict[str, int]] = None,
+                coalescer: Optional[RequestCoalescer] = None):
+        verifier = LeadVerifier(coalescer=coalescer or RequestCoalescer())
+        return verify_contacts(contacts, verifier, self.executor, self.max_in_flight, stats)
+    
+    @staticmethod
+    def _apply_result(lead: Lead, verification_result: Dict[str, Any]) -> None:
+        lead.verification_status = verification_result
+        lead.risk_score = verification_result.get("risk_score")
+        lead.risk_factors = verification_result.get("risk_factors")
+    
+    def process_table(self, source_name: str, table: Table) -> LeadBatch:
+        """
+        Validate, convert and verify a whole source table (a DataFrame or a
+        dict of columns) with the adapter's convert_table.
+        
+        Returns the verified LeadBatch of valid rows; rejected rows and the
+        fields they were missing are kept in last_batch_errors.
+        """
+        adapter = self.get_adapter(source_name)
+        batch, errors = adapter.convert_table(table)
+        batch = self._process_lead_batch(batch)
+        self.last_batch_errors = errors
+        return batch
+    
+    def _process_lead_batch(self, batch: LeadBatch) -> LeadBatch:
+        names = [f"{first} {last}".strip() for first, last in zip(batch.first_names, batch.last_names)]
+        plan = BatchPlan(zip(names, batch.phones, batch.emails))
+        
+        contacts = zip(range(len(batch)), batch.first_names, batch.last_names, batch.phones, batch.emails)
+        for index, verification_result in self._verify(contacts):
+            batch.set_verification(index, verification_result)
+        
+        self.last_batch_report = plan.report()
+        return batch
+    
     def export_lead(self, source_name: str, lead: Lead) -> Dict[str, Any]:
         """Export a lead back to source format"""
         adapter = self.get_adapter(source_name)
         return adapter.convert_from_lead(lead)
     
-    def export_batch(self, source_name: str, leads: List[Lead]) -> List[Dict[str, Any]]:
-        """Export multiple leads back to source format"""
+    def export_batch(self, source_name: str, leads: Union[List[Lead], LeadBatch]) -> List[Dict[str, Any]]:
+        """Export multiple leads (a list or a LeadBatch) back to source format"""
         adapter = self.get_adapter(source_name)
         return adapter.export_batch(leads) 
\ No newline at end of file
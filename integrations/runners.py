@@ -0,0 +1,151 @@
+import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from free_lead_verification import LeadVerifier, summarize_result, verify_lead
+from async_lead_verification import AsyncLeadVerifier
+from batch_planner import background_key
+
+EXECUTORS = ("sequential", "threads", "asyncio")
+
+# How IntegrationManager verifies leads, and how many leads it keeps in flight at once
+INTEGRATION_EXECUTOR = os.getenv("INTEGRATION_EXECUTOR", "sequential")
+INTEGRATION_MAX_IN_FLIGHT = int(os.getenv("INTEGRATION_MAX_IN_FLIGHT", "8"))
+
+# Finished results kept for reuse by later duplicates of the same contact
+DEDUPE_WINDOW = int(os.getenv("INTEGRATION_DEDUPE_WINDOW", "10000"))
+
+# A lead to verify: a caller's reference for it, then first name, last name, phone and email
+Contact = Tuple[Any, str, str, str, str]
+
+class _ThreadRunner:
+    """Verifies leads with verify_lead on a thread pool"""
+
+    def __init__(self, verifier: LeadVerifier, max_in_flight: int):
+        self.verifier = verifier
+        self.pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="integration")
+
+    def submit(self, first_name: str, last_name: str, phone: str, email: str):
+        return self.pool.submit(verify_lead, first_name, last_name, phone, email, self.verifier)
+
+    def wait_any(self, futures) -> set:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        return done
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+class _AsyncioRunner:
+    """
+    Verifies leads as tasks on a private event loop with AsyncLeadVerifier, so
+    each lead's checks also run at once. The loop only runs while the caller
+    waits for the next lead to finish, so it can be driven from plain code.
+    """
+
+    def __init__(self, verifier: LeadVerifier, max_in_flight: int):
+        self.loop = asyncio.new_event_loop()
+        # Three checks per lead in flight
+        self.executor = ThreadPoolExecutor(max_workers=3 * max_in_flight, thread_name_prefix="integration")
+        self.verifier = AsyncLeadVerifier(verifier, self.executor)
+
+    async def _verify(self, first_name: str, last_name: str, phone: str, email: str) -> Dict:
+        result = await self.verifier.verify_lead(f"{first_name} {last_name}".strip(), phone, email)
+        return summarize_result(result)
+
+    def submit(self, first_name: str, last_name: str, phone: str, email: str):
+        return self.loop.create_task(self._verify(first_name, last_name, phone, email))
+
+    def wait_any(self, futures) -> set:
+        done, _ = self.loop.run_until_complete(asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED))
+        return done
+
+    def close(self) -> None:
+        pending = [task for task in asyncio.all_tasks(self.loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def verify_contacts(contacts: Iterable[Contact], verifier: LeadVerifier, executor: str = "sequential",
+                    max_in_flight: int = INTEGRATION_MAX_IN_FLIGHT,
+                    stats: Optional[Dict[str, int]] = None) -> Iterator[Tuple[Any, Dict]]:
+    """
+    Verify leads and yield (reference, verify_lead result) pairs as each one finishes.
+
+    Contacts are read lazily, and at most max_in_flight leads are verified at
+    once. Duplicate contacts (same normalized name, phone and email) are
+    verified once. A duplicate of a lead still in flight waits for it, and
+    later duplicates reuse the finished result while it is among the last
+    DEDUPE_WINDOW results.
+
+    Args:
+        contacts: Iterable of (reference, first_name, last_name, phone, email)
+        verifier: LeadVerifier shared by every lead, typically with a RequestCoalescer
+        executor: "sequential", "threads" or "asyncio"
+        max_in_flight: Leads verified at once by the concurrent executors
+        stats: Optional dict updated with "leads" and "verified" (unique contacts looked up) counts
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}; expected one of {', '.join(EXECUTORS)}")
+    stats = stats if stats is not None else {}
+    stats.update(leads=0, verified=0)
+    finished: "OrderedDict[Hashable, Dict]" = OrderedDict()
+
+    def remember(key: Hashable, result: Dict) -> Dict:
+        finished[key] = result
+        if len(finished) > DEDUPE_WINDOW:
+            finished.popitem(last=False)
+        return result
+
+    if executor == "sequential":
+        for reference, first_name, last_name, phone, email in contacts:
+            stats["leads"] += 1
+            key = background_key(f"{first_name} {last_name}".strip(), phone, email)
+            result = finished.get(key)
+            if result is None:
+                stats["verified"] += 1
+                result = remember(key, verify_lead(first_name, last_name, phone, email, verifier))
+            yield reference, result
+        return
+
+    max_in_flight = max(1, max_in_flight)
+    runner = _ThreadRunner(verifier, max_in_flight) if executor == "threads" else _AsyncioRunner(verifier, max_in_flight)
+    in_flight: Dict[Hashable, Any] = {}
+    waiting: Dict[Any, Tuple[Hashable, List[Any]]] = {}
+
+    def complete(done) -> Iterator[Tuple[Any, Dict]]:
+        for future in done:
+            key, references = waiting.pop(future)
+            del in_flight[key]
+            result = remember(key, future.result())
+            for reference in references:
+                yield reference, result
+
+    try:
+        for reference, first_name, last_name, phone, email in contacts:
+            stats["leads"] += 1
+            key = background_key(f"{first_name} {last_name}".strip(), phone, email)
+            if key in finished:
+                yield reference, finished[key]
+                continue
+            if key in in_flight:
+                waiting[in_flight[key]][1].append(reference)
+                continue
+
+            # Only read more contacts once there is room, so memory stays bounded
+            while len(waiting) >= max_in_flight:
+                yield from complete(runner.wait_any(list(waiting)))
+
+            stats["verified"] += 1
+            future = runner.submit(first_name, last_name, phone, email)
+            in_flight[key] = future
+            waiting[future] = (key, [reference])
+
+        while waiting:
+            yield from complete(runner.wait_any(list(waiting)))
+    finally:
+        runner.close()
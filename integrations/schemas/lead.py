@@ -1,25 +1,63 @@
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Iterable, Iterator, Sequence, Union
 from datetime import datetime
+from functools import partial
 
-@dataclass
 class Lead:
-    """Base lead schema that all integrations must convert to/from"""
-    id: str
-    first_name: str
-    last_name: str
-    email: str
-    phone: str
-    source: str
-    created_at: datetime
-    metadata: Dict[str, Any]
-    raw_data: Dict[str, Any]  # Original data from source
-    
-    # Verification results
-    verification_status: Optional[Dict[str, Any]] = None
-    risk_score: Optional[float] = None
-    risk_factors: Optional[List[str]] = None
-    
+    """
+    Base lead schema that all integrations must convert to/from.
+
+    Slotted rather than a dataclass, so each lead carries no per-instance
+    __dict__. raw_data may be passed as a zero-argument callable, in which
+    case the original source row is only built when raw_data is first read.
+    """
+
+    __slots__ = ("id", "first_name", "last_name", "email", "phone", "source", "created_at", "metadata",
+                 "_raw_data", "verification_status", "risk_score", "risk_factors")
+
+    def __init__(self, id: str, first_name: str, last_name: str, email: str, phone: str, source: str,
+                 created_at: datetime, metadata: Dict[str, Any],
+                 raw_data: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+                 verification_status: Optional[Dict[str, Any]] = None, risk_score: Optional[float] = None,
+                 risk_factors: Optional[List[str]] = None):
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.email = email
+        self.phone = phone
+        self.source = source
+        self.created_at = created_at
+        self.metadata = metadata
+        self._raw_data = raw_data  # Original data from source, or a loader for it
+
+        # Verification results
+        self.verification_status = verification_status
+        self.risk_score = risk_score
+        self.risk_factors = risk_factors
+
+    @property
+    def raw_data(self) -> Dict[str, Any]:
+        if callable(self._raw_data):
+            self._raw_data = self._raw_data()
+        return self._raw_data
+
+    @raw_data.setter
+    def raw_data(self, value: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]) -> None:
+        self._raw_data = value
+
+    def _fields(self) -> tuple:
+        return (self.id, self.first_name, self.last_name, self.email, self.phone, self.source, self.created_at,
+                self.metadata, self.raw_data, self.verification_status, self.risk_score, self.risk_factors)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        return (f"Lead(id={self.id!r}, first_name={self.first_name!r}, last_name={self.last_name!r}, "
+                f"email={self.email!r}, phone={self.phone!r}, source={self.source!r}, "
+                f"risk_score={self.risk_score!r})")
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert lead to dictionary format"""
         return {
@@ -35,7 +73,7 @@ class Lead:
             "risk_score": self.risk_score,
             "risk_factors": self.risk_factors
         }
-    
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Lead':
         """Create lead from dictionary format"""
@@ -52,4 +90,149 @@ class Lead:
             verification_status=data.get("verification_status"),
             risk_score=data.get("risk_score"),
             risk_factors=data.get("risk_factors")
-        ) 
\ No newline at end of file
+        )
+
+class LeadBatch:
+    """
+    Columnar container for many leads from one source.
+
+    Each field is stored as a parallel list, every lead shares the batch's
+    created_at, and the raw source rows are kept by reference to whatever
+    the batch was built from (a list of row dicts, a DataFrame or a row
+    loader) and only turned into dicts when a lead's raw_data is read.
+
+    lead(i) and iteration build Lead objects on demand. They are copies:
+    record verification results with set_verification, not on the Lead.
+    """
+
+    def __init__(self, source: str, ids: List[str], first_names: List[str], last_names: List[str],
+                 emails: List[str], phones: List[str], created_at: Optional[datetime] = None,
+                 raw: Any = None, metadata: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            source: Source name shared by every lead
+            ids, first_names, last_names, emails, phones: Field columns, all the same length
+            created_at: Timestamp shared by every lead (default: now)
+            raw: Original rows by position - a sequence of dicts, a DataFrame or a
+                 callable taking a row index. None means no raw data is kept.
+            metadata: Optional per-lead metadata dicts; leads get {} when omitted
+        """
+        columns = (ids, first_names, last_names, emails, phones)
+        if any(len(column) != len(ids) for column in columns) or (metadata is not None and len(metadata) != len(ids)):
+            raise ValueError("All LeadBatch columns must have the same length")
+        self.source = source
+        self.ids = ids
+        self.first_names = first_names
+        self.last_names = last_names
+        self.emails = emails
+        self.phones = phones
+        self.created_at = created_at or datetime.now()
+        self.raw = raw
+        self.metadata = metadata
+
+        # Verification results, filled in by set_verification
+        self.verification_status: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+        self.risk_scores: List[Optional[float]] = [None] * len(ids)
+        self.risk_factors: List[Optional[List[str]]] = [None] * len(ids)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]], source: str,
+                     created_at: Optional[datetime] = None) -> 'LeadBatch':
+        """Build a batch from row dicts with id, first_name, last_name, email and phone keys"""
+        return cls(
+            source,
+            [str(record.get("id", "")) for record in records],
+            [str(record.get("first_name", "")) for record in records],
+            [str(record.get("last_name", "")) for record in records],
+            [str(record.get("email", "")) for record in records],
+            [str(record.get("phone", "")) for record in records],
+            created_at=created_at,
+            raw=records
+        )
+
+    @classmethod
+    def from_leads(cls, leads: Iterable[Lead], source: Optional[str] = None) -> 'LeadBatch':
+        """Pack Lead objects into a batch, keeping their raw data and verification results"""
+        leads = list(leads)
+        batch = cls(
+            source if source is not None else (leads[0].source if leads else ""),
+            [lead.id for lead in leads],
+            [lead.first_name for lead in leads],
+            [lead.last_name for lead in leads],
+            [lead.email for lead in leads],
+            [lead.phone for lead in leads],
+            created_at=leads[0].created_at if leads else None,
+            raw=[lead.raw_data for lead in leads],
+            metadata=[lead.metadata for lead in leads]
+        )
+        for index, lead in enumerate(leads):
+            batch.verification_status[index] = lead.verification_status
+            batch.risk_scores[index] = lead.risk_score
+            batch.risk_factors[index] = lead.risk_factors
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Lead]:
+        for index in range(len(self)):
+            yield self.lead(index)
+
+    def raw_row(self, index: int) -> Dict[str, Any]:
+        """Original source row of one lead"""
+        if self.raw is None:
+            return {}
+        if callable(self.raw):
+            return self.raw(index)
+        if hasattr(self.raw, "iloc"):
+            return self.raw.iloc[index].to_dict()
+        return self.raw[index]
+
+    def lead(self, index: int) -> Lead:
+        """Build the Lead at a position; its raw_data is loaded on first access"""
+        return Lead(
+            id=self.ids[index],
+            first_name=self.first_names[index],
+            last_name=self.last_names[index],
+            email=self.emails[index],
+            phone=self.phones[index],
+            source=self.source,
+            created_at=self.created_at,
+            metadata=self.metadata[index] if self.metadata is not None else {},
+            raw_data=partial(self.raw_row, index),
+            verification_status=self.verification_status[index],
+            risk_score=self.risk_scores[index],
+            risk_factors=self.risk_factors[index]
+        )
+
+    def to_leads(self) -> List[Lead]:
+        return list(self)
+
+    def append(self, lead: Lead) -> None:
+        """
+        Add a Lead at the end of the batch, keeping its raw data and verification results.
+
+        Appending to a batch whose raw data is a DataFrame or a row loader
+        first copies the existing raw rows into a list.
+        """
+        if not isinstance(self.raw, list):
+            self.raw = [self.raw_row(index) for index in range(len(self))]
+        if self.metadata is None and lead.metadata:
+            self.metadata = [{} for _ in range(len(self))]
+        self.ids.append(lead.id)
+        self.first_names.append(lead.first_name)
+        self.last_names.append(lead.last_name)
+        self.emails.append(lead.email)
+        self.phones.append(lead.phone)
+        self.raw.append(lead.raw_data)
+        if self.metadata is not None:
+            self.metadata.append(lead.metadata)
+        self.verification_status.append(lead.verification_status)
+        self.risk_scores.append(lead.risk_score)
+        self.risk_factors.append(lead.risk_factors)
+
+    def set_verification(self, index: int, verification_result: Dict[str, Any]) -> None:
+        """Record a verify_lead result for the lead at a position"""
+        self.verification_status[index] = verification_result
+        self.risk_scores[index] = verification_result.get("risk_score")
+        self.risk_factors[index] = verification_result.get("risk_factors")
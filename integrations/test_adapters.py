@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import types
+import unittest
+
+import pandas as pd
+
+from integrations.adapters.csv_adapter import CSVAdapter
+from integrations.schemas.lead import Lead
+
+class TestConvertTable(unittest.TestCase):
+    def setUp(self):
+        self.adapter = CSVAdapter()
+
+    def test_rejects_rows_missing_required_fields(self):
+        table = {
+            "id": ["1", "2", "3"],
+            "first_name": ["John", "  ", "Jane"],
+            "last_name": ["Doe", "Roe", None],
+            "email": ["john@example.com", "x@example.com", "jane@example.com"],
+            "phone": ["2125551234", "3105550000", "6464440000"]
+        }
+        batch, errors = self.adapter.convert_table(table)
+        self.assertEqual(batch.ids, ["1"])
+        self.assertEqual(errors, [{"row": 1, "missing": ["first_name"]}, {"row": 2, "missing": ["last_name"]}])
+
+    def test_missing_column_rejects_every_row(self):
+        batch, errors = self.adapter.convert_table({"first_name": ["John"], "last_name": ["Doe"], "email": ["j@x.com"]})
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(errors, [{"row": 0, "missing": ["phone"]}])
+
+    def test_numeric_columns_with_blanks_keep_whole_numbers(self):
+        csv_text = (
+            "id,first_name,last_name,email,phone\n"
+            "1,John,Doe,john@example.com,2125551234\n"
+            ",Jane,Roe,jane@example.com,3105550000\n"
+            "3,Ann,Lee,ann@example.com,\n"
+        )
+        frame = pd.read_csv(io.StringIO(csv_text))
+        # Blank cells make pandas read both columns as float64
+        self.assertEqual(frame["phone"].dtype, "float64")
+        self.assertEqual(frame["id"].dtype, "float64")
+
+        batch, errors = self.adapter.convert_table(frame)
+        self.assertEqual(batch.phones, ["2125551234", "3105550000"])
+        self.assertEqual(batch.ids, ["1", ""])
+        self.assertEqual(errors, [{"row": 2, "missing": ["phone"]}])
+
+    def test_fractional_floats_are_kept(self):
+        table = {"id": [1.5], "first_name": ["John"], "last_name": ["Doe"], "email": ["j@x.com"], "phone": ["1"]}
+        batch, _ = self.adapter.convert_table(table)
+        self.assertEqual(batch.ids, ["1.5"])
+
+class TestCSVStreaming(unittest.TestCase):
+    def setUp(self):
+        self.adapter = CSVAdapter()
+        self.tmpdir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmpdir, "leads.csv")
+        with open(self.source, "w", newline="") as f:
+            f.write("id,first_name,last_name,email,phone,company\n")
+            f.write("1,John,Doe,john@example.com,2125551234,Example Co\n")
+            f.write("2,Jane,,jane@example.com,3105550000,\n")
+            f.write("3,Ann,Lee,ann@example.com,6464440000,Other Co\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_iter_leads_streams_valid_rows(self):
+        errors = []
+        leads = self.adapter.iter_leads(self.source, errors)
+        self.assertIsInstance(leads, types.GeneratorType)
+        leads = list(leads)
+        self.assertEqual([lead.id for lead in leads], ["1", "3"])
+        self.assertEqual(leads[0].raw_data["company"], "Example Co")
+        self.assertIs(leads[0].created_at, leads[1].created_at)
+        self.assertEqual(errors, [{"row": 1, "missing": ["last_name"]}])
+
+    def test_iter_leads_agrees_with_convert_table(self):
+        rows = [
+            {"id": "1", "first_name": "John", "last_name": "Doe", "email": "john@example.com", "phone": "2125551234"},
+            {"id": "2", "first_name": "Jane", "last_name": "Roe", "email": "jane@example.com", "phone": "   "},
+            {"id": "3", "first_name": "Ann", "last_name": float("nan"), "email": "ann@example.com", "phone": "1"}
+        ]
+        errors = []
+        leads = list(self.adapter.iter_leads(rows, errors))
+        batch, table_errors = self.adapter.convert_table(pd.DataFrame(rows))
+
+        self.assertEqual([lead.id for lead in leads], batch.ids)
+        self.assertEqual(errors, table_errors)
+        self.assertEqual(errors, [{"row": 1, "missing": ["phone"]}, {"row": 2, "missing": ["last_name"]}])
+        self.assertEqual([self.adapter.validate_source_data(row) for row in rows], [True, False, False])
+
+    def test_round_trip_through_files(self):
+        leads = list(self.adapter.iter_leads(self.source))
+        leads[0].verification_status = {"risk_score": 0.2, "risk_factors": ["invalid_email"]}
+        leads[0].risk_score = 0.2
+        leads[0].risk_factors = ["invalid_email"]
+
+        destination = os.path.join(self.tmpdir, "verified.csv")
+        self.assertEqual(self.adapter.export_stream(iter(leads), destination), 2)
+
+        with open(destination, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["id"] for row in rows], ["1", "3"])
+        self.assertEqual(rows[0]["phone"], "2125551234")
+        self.assertEqual(json.loads(rows[0]["risk_factors"]), ["invalid_email"])
+        self.assertEqual(json.loads(rows[0]["verification_status"])["risk_score"], 0.2)
+        self.assertEqual(rows[1]["risk_score"], "")
+
+        # The exported file reads back as the same leads
+        again = list(self.adapter.iter_leads(destination))
+        self.assertEqual([(lead.id, lead.email, lead.phone) for lead in again],
+                         [(lead.id, lead.email, lead.phone) for lead in leads])
+
+    def test_streams_open_files_and_row_dicts(self):
+        with open(self.source, newline="") as f:
+            leads = list(self.adapter.iter_leads(f))
+        self.assertEqual(len(leads), 2)
+        rows = [{"first_name": "John", "last_name": "Doe", "email": "j@x.com", "phone": "1"}]
+        self.assertIsInstance(next(self.adapter.iter_leads(rows)), Lead)
+
+        out = io.StringIO()
+        self.assertEqual(self.adapter.export_stream(leads, out), 2)
+        self.assertTrue(out.getvalue().startswith("id,first_name,last_name,email,phone"))
+        self.assertEqual(self.adapter.export_stream([], io.StringIO()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from integrations.schemas.lead import Lead, LeadBatch
+
+CREATED_AT = datetime(2024, 1, 2, 3, 4, 5)
+
+def make_lead(**overrides) -> Lead:
+    fields = dict(id="1", first_name="John", last_name="Doe", email="john@example.com", phone="2125551234",
+                  source="csv", created_at=CREATED_AT, metadata={}, raw_data={"id": "1"})
+    fields.update(overrides)
+    return Lead(**fields)
+
+class TestLead(unittest.TestCase):
+    def test_has_no_instance_dict(self):
+        lead = make_lead()
+        self.assertFalse(hasattr(lead, "__dict__"))
+        with self.assertRaises(AttributeError):
+            lead.nickname = "Johnny"
+
+    def test_raw_data_loader_runs_once_on_first_read(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return {"id": "1", "company": "Example Co"}
+
+        lead = make_lead(raw_data=load)
+        self.assertEqual(calls, [])
+        self.assertEqual(lead.raw_data["company"], "Example Co")
+        self.assertEqual(lead.raw_data["company"], "Example Co")
+        self.assertEqual(len(calls), 1)
+
+    def test_equality_compares_fields_and_loaded_raw_data(self):
+        self.assertEqual(make_lead(), make_lead(raw_data=lambda: {"id": "1"}))
+        self.assertNotEqual(make_lead(), make_lead(risk_score=0.5))
+        self.assertNotEqual(make_lead(), "not a lead")
+
+    def test_dict_round_trip(self):
+        lead = make_lead(verification_status={"risk_score": 0.2}, risk_score=0.2, risk_factors=["invalid_email"])
+        data = lead.to_dict()
+        self.assertEqual(data["created_at"], CREATED_AT.isoformat())
+        self.assertNotIn("raw_data", data)
+
+        restored = Lead.from_dict(data)
+        self.assertEqual(restored.to_dict(), data)
+        self.assertEqual(restored.raw_data, {})
+
+class TestLeadBatch(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            {"id": 1, "first_name": "John", "last_name": "Doe", "email": "john@example.com", "phone": "2125551234"},
+            {"id": 2, "first_name": "Jane", "last_name": "Roe", "email": "jane@example.com", "phone": "3105550000",
+             "company": "Example Co"}
+        ]
+        self.batch = LeadBatch.from_records(self.rows, "csv", created_at=CREATED_AT)
+
+    def test_columns_from_records(self):
+        self.assertEqual(len(self.batch), 2)
+        self.assertEqual(self.batch.ids, ["1", "2"])
+        self.assertEqual(self.batch.first_names, ["John", "Jane"])
+        self.assertEqual(self.batch.phones, ["2125551234", "3105550000"])
+        self.assertEqual(self.batch.risk_scores, [None, None])
+
+    def test_lead_access_shares_created_at_and_keeps_raw_row(self):
+        lead = self.batch.lead(1)
+        self.assertEqual((lead.id, lead.email, lead.source), ("2", "jane@example.com", "csv"))
+        self.assertIs(lead.created_at, self.batch.created_at)
+        self.assertIs(lead.raw_data, self.rows[1])
+        self.assertEqual(lead.metadata, {})
+
+    def test_iteration_yields_leads_in_order(self):
+        self.assertEqual([lead.first_name for lead in self.batch], ["John", "Jane"])
+        self.assertEqual(self.batch.to_leads(), list(self.batch))
+
+    def test_set_verification_updates_columns(self):
+        self.batch.set_verification(0, {"risk_score": 0.7, "risk_factors": ["invalid_phone"]})
+        self.assertEqual(self.batch.risk_scores, [0.7, None])
+        self.assertEqual(self.batch.risk_factors[0], ["invalid_phone"])
+        lead = self.batch.lead(0)
+        self.assertEqual(lead.risk_score, 0.7)
+        self.assertEqual(lead.verification_status["risk_factors"], ["invalid_phone"])
+
+    def test_from_leads_keeps_verification_and_metadata(self):
+        leads = [make_lead(risk_score=0.3, metadata={"owner": "a"}), make_lead(id="2", source="csv")]
+        batch = LeadBatch.from_leads(leads)
+        self.assertEqual(batch.source, "csv")
+        self.assertEqual(batch.risk_scores, [0.3, None])
+        self.assertEqual(batch.to_leads(), leads)
+
+    def test_append_extends_every_column(self):
+        lead = make_lead(id="3", risk_score=0.4, metadata={"owner": "b"}, raw_data={"id": "3"})
+        self.batch.append(lead)
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(self.batch.ids, ["1", "2", "3"])
+        self.assertEqual(self.batch.risk_scores, [None, None, 0.4])
+        self.assertEqual(self.batch.metadata, [{}, {}, {"owner": "b"}])
+        appended = self.batch.lead(2)
+        self.assertEqual(appended.raw_data, {"id": "3"})
+        # Appended leads take the batch's timestamp
+        self.assertEqual(appended.created_at, CREATED_AT)
+        self.assertIs(self.batch.lead(0).raw_data, self.rows[0])
+
+    def test_append_to_dataframe_batch_copies_raw_rows(self):
+        batch = LeadBatch("csv", ["1"], ["John"], ["Doe"], ["j@x.com"], ["1"], raw=pd.DataFrame(self.rows[:1]))
+        batch.append(make_lead(id="2"))
+        self.assertEqual(batch.raw_row(0)["email"], "john@example.com")
+        self.assertEqual(batch.raw_row(1), {"id": "1"})
+        self.assertIsNone(batch.metadata)
+
+    def test_raw_rows_from_dataframe_and_loader(self):
+        frame = pd.DataFrame(self.rows)
+        batch = LeadBatch("csv", ["1", "2"], ["John", "Jane"], ["Doe", "Roe"], ["j@x.com", "k@x.com"],
+                          ["1", "2"], raw=frame)
+        self.assertEqual(batch.raw_row(1)["company"], "Example Co")
+
+        loaded = LeadBatch("csv", ["1"], ["John"], ["Doe"], ["j@x.com"], ["1"], raw=lambda index: {"row": index})
+        self.assertEqual(loaded.lead(0).raw_data, {"row": 0})
+        self.assertEqual(LeadBatch("csv", [], [], [], [], []).to_leads(), [])
+
+    def test_rejects_uneven_columns(self):
+        with self.assertRaises(ValueError):
+            LeadBatch("csv", ["1", "2"], ["John"], ["Doe", "Roe"], ["a", "b"], ["1", "2"])
+        with self.assertRaises(ValueError):
+            LeadBatch("csv", ["1"], ["John"], ["Doe"], ["a"], ["1"], metadata=[{}, {}])
+
+if __name__ == '__main__':
+    unittest.main()
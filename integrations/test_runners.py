@@ -0,0 +1,225 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from integrations import runners
+from integrations.adapters.csv_adapter import CSVAdapter
+from integrations.manager import IntegrationManager
+from integrations.runners import verify_contacts
+from free_lead_verification import LeadVerifier
+
+class StubVerifier(LeadVerifier):
+    """LeadVerifier whose checks answer locally, with per-phone delays and failures"""
+
+    def __init__(self, delays=None, failing=(), **kwargs):
+        super().__init__(time_budget=0, **kwargs)
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.phones_checked = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def verify_phone(self, phone_number):
+        with self.lock:
+            self.phones_checked.append(phone_number)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delays.get(phone_number, 0))
+            if phone_number in self.failing:
+                raise RuntimeError(f"lookup failed for {phone_number}")
+            return {"valid": not phone_number.startswith("000")}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def verify_email(self, email):
+        return {"result": "valid"}
+
+    def check_background(self, name, phone, email):
+        return {"status": "ok"}
+
+def contact(reference, phone, name="John Doe"):
+    first_name, last_name = name.split()
+    return reference, first_name, last_name, phone, f"{first_name.lower()}@example.com"
+
+class TestVerifyContacts(unittest.TestCase):
+    def test_sequential_keeps_input_order(self):
+        verifier = StubVerifier()
+        contacts = [contact(index, f"212555{index:04d}") for index in range(5)]
+        results = list(verify_contacts(contacts, verifier, "sequential"))
+        self.assertEqual([reference for reference, _ in results], [0, 1, 2, 3, 4])
+        self.assertTrue(all(result["phone_valid"] for _, result in results))
+
+    def test_concurrent_executors_yield_in_completion_order(self):
+        for executor in ("threads", "asyncio"):
+            with self.subTest(executor=executor):
+                verifier = StubVerifier(delays={"2125550000": 0.3})
+                contacts = [contact(index, f"212555{index:04d}") for index in range(4)]
+                results = list(verify_contacts(contacts, verifier, executor, max_in_flight=4))
+                references = [reference for reference, _ in results]
+                self.assertEqual(sorted(references), [0, 1, 2, 3])
+                # The slow first lead doesn't hold up the others
+                self.assertEqual(references[-1], 0)
+
+    def test_max_in_flight_bounds_concurrency(self):
+        for executor in ("threads", "asyncio"):
+            with self.subTest(executor=executor):
+                phones = [f"212555{index:04d}" for index in range(10)]
+                verifier = StubVerifier(delays={phone: 0.02 for phone in phones})
+                contacts = [contact(index, phone) for index, phone in enumerate(phones)]
+                results = list(verify_contacts(contacts, verifier, executor, max_in_flight=3))
+                self.assertEqual(len(results), 10)
+                self.assertLessEqual(verifier.peak, 3)
+                self.assertGreater(verifier.peak, 1)
+
+    def test_duplicates_are_verified_once(self):
+        for executor in runners.EXECUTORS:
+            with self.subTest(executor=executor):
+                verifier = StubVerifier(delays={"2125551234": 0.05})
+                contacts = [
+                    contact("a", "2125551234"),
+                    contact("b", "(212) 555-1234"),  # same contact while "a" is in flight
+                    contact("c", "3105550000", "Jane Roe"),
+                    contact("d", "212-555-1234")     # same contact after "a" finished
+                ]
+                stats = {}
+                results = dict(verify_contacts(contacts, verifier, executor, max_in_flight=2, stats=stats))
+                self.assertEqual(sorted(results), ["a", "b", "c", "d"])
+                self.assertIs(results["a"], results["b"])
+                self.assertIs(results["a"], results["d"])
+                self.assertEqual(stats, {"leads": 4, "verified": 2})
+                self.assertEqual(sorted(verifier.phones_checked), ["2125551234", "3105550000"])
+
+    def test_dedupe_window_forgets_old_results(self):
+        verifier = StubVerifier()
+        contacts = [contact(0, "2125551234"), contact(1, "3105550000", "Jane Roe"), contact(2, "2125551234")]
+        stats = {}
+        with patch.object(runners, "DEDUPE_WINDOW", 1):
+            list(verify_contacts(contacts, verifier, "sequential", stats=stats))
+        self.assertEqual(stats["verified"], 3)
+
+    def test_errors_propagate(self):
+        for executor in runners.EXECUTORS:
+            with self.subTest(executor=executor):
+                verifier = StubVerifier(failing={"2125550001"})
+                contacts = [contact(index, f"212555{index:04d}") for index in range(3)]
+                with self.assertRaisesRegex(RuntimeError, "2125550001"):
+                    list(verify_contacts(contacts, verifier, executor, max_in_flight=2))
+
+    def test_rejects_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            list(verify_contacts([], StubVerifier(), "processes"))
+        with self.assertRaises(ValueError):
+            IntegrationManager(executor="processes")
+
+def sync_ids(manager, rows):
+    """Ids of the leads sync_stream exports from rows"""
+    sink = io.StringIO()
+    manager.sync_stream("csv", iter(rows), sink)
+    return [row["id"] for row in csv.DictReader(io.StringIO(sink.getvalue()))]
+
+class TestIntegrationManagerStreams(unittest.TestCase):
+    def setUp(self):
+        self.verifier = None
+
+        def make_verifier(**kwargs):
+            self.verifier = StubVerifier(**kwargs)
+            return self.verifier
+
+        patcher = patch("integrations.manager.LeadVerifier", side_effect=make_verifier)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def manager(self, executor):
+        manager = IntegrationManager(executor=executor, max_in_flight=4)
+        manager.register_adapter(CSVAdapter())
+        return manager
+
+    def test_process_stream_verifies_rows_and_reports_errors(self):
+        rows = [
+            {"id": "1", "first_name": "John", "last_name": "Doe", "email": "john@example.com", "phone": "2125551234"},
+            {"id": "2", "first_name": "Jane"},
+            {"id": "3", "first_name": "John", "last_name": "Doe", "email": "john@example.com", "phone": "2125551234"},
+            {"id": "4", "first_name": "Ann", "last_name": "Lee", "email": "ann@example.com", "phone": "0005550000"}
+        ]
+        for executor in runners.EXECUTORS:
+            with self.subTest(executor=executor):
+                manager = self.manager(executor)
+                leads = {lead.id: lead for lead in manager.process_stream("csv", iter(rows))}
+                self.assertEqual(sorted(leads), ["1", "3", "4"])
+                self.assertEqual(leads["1"].risk_score, 0.0)
+                self.assertEqual(leads["4"].risk_factors, ["invalid_phone"])
+                self.assertEqual(manager.last_batch_errors, [
+                    {"row": 1, "missing": ["last_name", "email", "phone"]}
+                ])
+                self.assertEqual(manager.last_batch_report,
+                                 {"rows": 3, "unique_contacts": 2, "duplicates_reused": 1})
+
+    def test_process_stream_reads_lazily(self):
+        read = []
+
+        def rows():
+            for index in range(100):
+                read.append(index)
+                yield {"id": str(index), "first_name": "John", "last_name": f"Doe{index}",
+                       "email": f"john{index}@example.com", "phone": f"212555{index:04d}"}
+
+        stream = self.manager("threads").process_stream("csv", rows())
+        next(stream)
+        # Only the in-flight window has been read, not the whole source
+        self.assertLess(len(read), 10)
+        stream.close()
+    def test_every_entry_point_rejects_the_same_rows(self):
+        rows = [
+            {"id": "1", "first_name": "John", "last_name": "Doe", "email": "john@example.com", "phone": "2125551234"},
+            {"id": "2", "first_name": "Jane", "last_name": "Roe", "email": "", "phone": "3105550000"},
+            {"id": "3", "first_name": "Ann", "last_name": "Lee", "email": "ann@example.com", "phone": "  "},
+            {"id": "4", "first_name": "Bob", "last_name": None, "email": "bob@example.com", "phone": "6464440000"}
+        ]
+        expected = [{"row": 1, "missing": ["email"]}, {"row": 2, "missing": ["phone"]},
+                    {"row": 3, "missing": ["last_name"]}]
+        manager = self.manager("sequential")
+        entry_points = {
+            "process_batch": lambda: [lead.id for lead in manager.process_batch("csv", rows)],
+            "process_stream": lambda: [lead.id for lead in manager.process_stream("csv", iter(rows))],
+            "process_table": lambda: manager.process_table("csv", pd.DataFrame(rows)).ids,
+            "sync_stream": lambda: sync_ids(manager, rows)
+        }
+        for name, run in entry_points.items():
+            with self.subTest(entry_point=name):
+                self.assertEqual(run(), ["1"])
+                self.assertEqual(manager.last_batch_errors, expected)
+
+    def test_sync_stream_csv_to_csv(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        source = os.path.join(tmpdir, "leads.csv")
+        destination = os.path.join(tmpdir, "verified.csv")
+        with open(source, "w", newline="") as f:
+            f.write("id,first_name,last_name,email,phone\n")
+            f.write("1,John,Doe,john@example.com,2125551234\n")
+            f.write("2,Jane,Roe,,3105550000\n")
+            f.write("3,Ann,Lee,ann@example.com,0005550000\n")
+
+        manager = self.manager("threads")
+        self.assertEqual(manager.sync_stream("csv", source, destination), 2)
+        self.assertEqual(manager.last_batch_errors, [{"row": 1, "missing": ["email"]}])
+        with open(destination, newline="") as f:
+            rows = {row["id"]: row for row in csv.DictReader(f)}
+        self.assertEqual(float(rows["1"]["risk_score"]), 0.0)
+        self.assertEqual(rows["3"]["risk_factors"], '["invalid_phone"]')
+        # The stream shares one bounded coalescer across its leads
+        self.assertEqual(self.verifier.coalescer.max_entries, 3 * runners.DEDUPE_WINDOW)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-import { VerificationResult, Verification, HistoryResponse, VerificationFormData } from './types';
+import { VerificationResult, Verification, HistoryResponse, VerificationFormData, BatchJobResponse, JobResultEvent, JobSummary } from './types';
 
 // Type declarations for DOM elements
 interface DOMElements {
@@ -16,6 +16,12 @@ interface DOMElements {
     modalContent: HTMLDivElement | null;
     closeModal: HTMLElement | null;
     recentVerifications: HTMLTableSectionElement | null;
+    prevPage: HTMLButtonElement | null;
+    nextPage: HTMLButtonElement | null;
+    batchForm: HTMLFormElement | null;
+    batchProgress: HTMLDivElement | null;
+    batchStatus: HTMLElement | null;
+    batchResults: HTMLTableSectionElement | null;
 }
 
 // Get DOM elements with type safety
@@ -33,9 +39,26 @@ const getDOMElements = (): DOMElements => ({
     detailModal: document.getElementById('detailModal') as HTMLDivElement,
     modalContent: document.getElementById('modalContent') as HTMLDivElement,
     closeModal: document.getElementById('closeModal'),
-    recentVerifications: document.getElementById('recentVerifications') as HTMLTableSectionElement
+    recentVerifications: document.getElementById('recentVerifications') as HTMLTableSectionElement,
+    prevPage: document.getElementById('prevPage') as HTMLButtonElement,
+    nextPage: document.getElementById('nextPage') as HTMLButtonElement,
+    batchForm: document.getElementById('batchForm') as HTMLFormElement,
+    batchProgress: document.getElementById('batchProgress') as HTMLDivElement,
+    batchStatus: document.getElementById('batchStatus'),
+    batchResults: document.getElementById('batchResults') as HTMLTableSectionElement
 });
 
+// List views leave out the provider payload; the details modal fetches it per row
+const LIST_FIELDS = 'first_name,last_name,email,phone,status,risk_score,timestamp';
+const HISTORY_PAGE_SIZE = 50;
+
+// Cursors of the pages before the current one, and of the page after it
+const historyPages: { previous: (number | null)[]; current: number | null; next: number | null } = {
+    previous: [],
+    current: null,
+    next: null
+};
+
 // Dashboard functionality
 document.addEventListener('DOMContentLoaded', (): void => {
     const elements = getDOMElements();
@@ -71,16 +94,112 @@ document.addEventListener('DOMContentLoaded', (): void => {
         });
     }
     
+    if (elements.batchForm) {
+        elements.batchForm.addEventListener('submit', async (e: Event): Promise<void> => {
+            e.preventDefault();
+            
+            try {
+                const response = await fetch('/api/verify/batch', {
+                    method: 'POST',
+                    body: new FormData(elements.batchForm as HTMLFormElement)
+                });
+                const data = await response.json();
+                if (!response.ok) {
+                    alert(data.error || 'The lead list could not be read.');
+                    return;
+                }
+                followBatchJob(data as BatchJobResponse);
+            } catch (error) {
+                console.error('Error:', error);
+                alert('An error occurred while starting the batch.');
+            }
+        });
+    }
+    
     // History page functionality
     if (elements.searchInput && elements.filterStatus) {
-        elements.searchInput.addEventListener('input', debounce(updateHistory, 300));
-        elements.filterStatus.addEventListener('change', updateHistory);
+        const resetHistory = (): void => {
+            historyPages.previous = [];
+            historyPages.current = null;
+            updateHistory();
+        };
+        elements.searchInput.addEventListener('input', debounce(resetHistory, 300));
+        elements.filterStatus.addEventListener('change', resetHistory);
+        
+        elements.nextPage?.addEventListener('click', (): void => {
+            if (historyPages.next === null) return;
+            historyPages.previous.push(historyPages.current);
+            historyPages.current = historyPages.next;
+            updateHistory();
+        });
+        elements.prevPage?.addEventListener('click', (): void => {
+            if (historyPages.previous.length === 0) return;
+            historyPages.current = historyPages.previous.pop() ?? null;
+            updateHistory();
+        });
         
         // Initial load
         updateHistory();
     }
 });
 
+// Show a batch job's results as the server streams them; EventSource resends
+// Last-Event-ID on reconnect, so no result is shown twice or missed
+const followBatchJob = (job: BatchJobResponse): void => {
+    const elements = getDOMElements();
+    if (!elements.batchProgress || !elements.batchStatus || !elements.batchResults) return;
+    
+    const batchStatus = elements.batchStatus;
+    const batchResults = elements.batchResults;
+    elements.batchProgress.classList.remove('hidden');
+    batchResults.innerHTML = '';
+    let processed = 0;
+    batchStatus.textContent = `Verifying ${job.total} leads...`;
+    
+    const events = new EventSource(`/api/jobs/${job.job_id}/events`);
+    
+    events.addEventListener('result', (event: MessageEvent): void => {
+        const data: JobResultEvent = JSON.parse(event.data);
+        // Leads that failed to verify carry the error and the submitted lead instead
+        const failed = 'error' in data.result;
+        const verification = 'error' in data.result ? data.result.lead : data.result;
+        processed += 1;
+        batchStatus.textContent = `Verified ${processed} of ${job.total} leads...`;
+        
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td class="px-6 py-4 whitespace-nowrap">${verification.first_name} ${verification.last_name}</td>
+            <td class="px-6 py-4 whitespace-nowrap">${verification.email}</td>
+            <td class="px-6 py-4 whitespace-nowrap">${verification.phone}</td>
+            <td class="px-6 py-4 whitespace-nowrap">
+                <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full 
+                    ${data.verified ? 'bg-green-100 text-green-800' : 'bg-red-100 text-red-800'}">
+                    ${data.verified ? 'verified' : failed ? 'error' : 'flagged'}
+                </span>
+            </td>
+        `;
+        batchResults.appendChild(row);
+    });
+    
+    events.addEventListener('summary', (event: MessageEvent): void => {
+        const summary: JobSummary = JSON.parse(event.data);
+        events.close();
+        batchStatus.textContent = summary.status === 'failed'
+            ? `Batch failed after ${summary.processed} leads: ${summary.error}`
+            : `Done: ${summary.verified} verified, ${summary.flagged} flagged in ${summary.elapsed_seconds}s`;
+        updateRecentVerifications();
+    });
+    
+    // The job stopped making progress, e.g. because the server restarted mid-job
+    events.addEventListener('stalled', (event: MessageEvent): void => {
+        const summary: JobSummary = JSON.parse(event.data);
+        events.close();
+        batchStatus.textContent = `Batch stalled after ${summary.processed} of ${summary.total} leads; ` +
+            `it may need to be submitted again`;
+        updateRecentVerifications();
+    });
+};
+
 const displayResults = (result: VerificationResult): void => {
     const elements = getDOMElements();
     
@@ -128,8 +247,19 @@ const updateHistory = async (): Promise<void> => {
     const statusFilter = elements.filterStatus?.value || '';
     
     try {
-        const response = await fetch(`/api/history?search=${encodeURIComponent(searchTerm)}&status=${encodeURIComponent(statusFilter)}`);
+        const params = new URLSearchParams({
+            search: searchTerm,
+            status: statusFilter,
+            limit: HISTORY_PAGE_SIZE.toString(),
+            fields: LIST_FIELDS
+        });
+        if (historyPages.current !== null) params.set('after', historyPages.current.toString());
+        
+        const response = await fetch(`/api/history?${params.toString()}`);
         const data: HistoryResponse = await response.json();
+        historyPages.next = data.next_cursor;
+        if (elements.prevPage) elements.prevPage.disabled = historyPages.previous.length === 0;
+        if (elements.nextPage) elements.nextPage.disabled = data.next_cursor === null;
         
         const verificationHistory = elements.verificationHistory;
         if (!verificationHistory) return;
@@ -217,7 +347,7 @@ const updateRecentVerifications = async (): Promise<void> => {
     const elements = getDOMElements();
     
     try {
-        const response = await fetch('/api/history?limit=5');
+        const response = await fetch(`/api/history?limit=5&fields=${LIST_FIELDS}`);
         const data: HistoryResponse = await response.json();
         
         const recentVerifications = elements.recentVerifications;
@@ -3,6 +3,8 @@ export interface VerificationResult {
     email_valid: boolean;
     risk_score: number;
     risk_factors?: string[];
+    unavailable_providers?: string[];
+    missing_checks?: string[];
     phone_details?: string;
     email_details?: string;
 }
@@ -16,12 +18,13 @@ export interface Verification {
     status: 'valid' | 'invalid' | 'risky';
     risk_score: number;
     timestamp: string;
-    details: VerificationResult;
+    details?: VerificationResult;
 }
 
 export interface HistoryResponse {
     verifications: Verification[];
     total: number;
+    next_cursor: number | null;
 }
 
 export interface VerificationFormData {
@@ -29,4 +32,40 @@ export interface VerificationFormData {
     last_name: string;
     email: string;
     phone: string;
-} 
\ No newline at end of file
+}
+
+export interface BatchJobResponse {
+    job_id: string;
+    total: number;
+    status_url: string;
+}
+
+// A lead whose verification raised an error, recorded as flagged
+export interface JobLeadError {
+    error: string;
+    lead: {
+        first_name: string;
+        last_name: string;
+        phone: string;
+        email: string;
+    };
+}
+
+export interface JobResultEvent {
+    seq: number;
+    row: number;
+    verified: boolean;
+    result: Verification | JobLeadError;
+}
+
+export interface JobSummary {
+    id: string;
+    status: 'queued' | 'running' | 'completed' | 'failed';
+    total: number;
+    processed: number;
+    verified: number;
+    flagged: number;
+    elapsed_seconds: number;
+    leads_per_second: number;
+    error: string | null;
+}
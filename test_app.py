@@ -0,0 +1,225 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# The app opens its SQLite stores on import, so point them at a scratch database first
+_tmpdir = tempfile.mkdtemp()
+with patch.dict(os.environ, {"VERIFICATION_DB_PATH": os.path.join(_tmpdir, "verifications.sqlite3")}):
+    import app
+
+def tearDownModule():
+    app.job_runner.shutdown()
+    app.jobs.close()
+    app.store.close()
+    shutil.rmtree(_tmpdir)
+
+def fake_verify_lead(first_name, last_name, phone, email, verifier=None):
+    good = "good" in email
+    return {
+        "phone_valid": True,
+        "email_valid": good,
+        "risk_score": 0.0 if good else 0.2,
+        "risk_factors": [] if good else ["invalid_email"],
+        "unavailable_providers": [],
+        "missing_checks": [],
+        "details": {}
+    }
+
+def lead(n, email=None):
+    return {"first_name": f"First{n}", "last_name": f"Last{n}", "phone": "2125551234",
+            "email": email or f"good{n}@example.com"}
+
+class AppTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+        patcher = patch.object(app, "verify_lead", side_effect=fake_verify_lead)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wait_for_job(self, job_id, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.client.get(f"/api/jobs/{job_id}").get_json()
+            if job["status"] in ("completed", "failed"):
+                return job
+            time.sleep(0.02)
+        self.fail(f"Job {job_id} did not finish")
+
+class TestBatchJobEndpoints(AppTestCase):
+    def test_json_batch_runs_in_background(self):
+        response = self.client.post("/api/verify/batch", json=[lead(1), lead(2, "bad@example.com"), lead(3)])
+        self.assertEqual(response.status_code, 202)
+        body = response.get_json()
+        self.assertEqual(body["total"], 3)
+        self.assertEqual(body["status_url"], f"/api/jobs/{body['job_id']}")
+
+        job = self.wait_for_job(body["job_id"])
+        self.assertEqual((job["status"], job["processed"], job["verified"], job["flagged"]), ("completed", 3, 2, 1))
+        self.assertEqual(sorted(result["row"] for result in job["results"]), [0, 1, 2])
+        self.assertEqual(job["next_cursor"], 3)
+
+    def test_csv_upload(self):
+        csv_file = io.BytesIO(b"first_name,last_name,phone,email\nJohn,Doe,2125551234,good@example.com\n")
+        response = self.client.post("/api/verify/batch", data={"file": (csv_file, "leads.csv")},
+                                    content_type="multipart/form-data")
+        self.assertEqual(response.status_code, 202)
+        job = self.wait_for_job(response.get_json()["job_id"])
+        self.assertEqual(job["results"][0]["result"]["first_name"], "John")
+
+    def test_rejects_invalid_batches(self):
+        for payload, error in [
+            ({"not": "a list"}, "Send a CSV file upload or a JSON array of leads"),
+            ([], "No leads to verify"),
+            ([lead(1), {"first_name": "Jane"}], "Lead 2 is missing last_name, phone, email")
+        ]:
+            with self.subTest(payload=payload):
+                response = self.client.post("/api/verify/batch", json=payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json()["error"], error)
+
+    def test_job_results_are_paged_by_cursor(self):
+        job_id = self.client.post("/api/verify/batch", json=[lead(n) for n in range(5)]).get_json()["job_id"]
+        self.wait_for_job(job_id)
+
+        first = self.client.get(f"/api/jobs/{job_id}?limit=2").get_json()
+        self.assertEqual([r["seq"] for r in first["results"]], [1, 2])
+        rest = self.client.get(f"/api/jobs/{job_id}?after={first['next_cursor']}&limit=10").get_json()
+        self.assertEqual([r["seq"] for r in rest["results"]], [3, 4, 5])
+
+    def test_job_limit_must_be_positive(self):
+        job_id = self.client.post("/api/verify/batch", json=[lead(1)]).get_json()["job_id"]
+        self.wait_for_job(job_id)
+        for limit in ("-1", "0", "ten"):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.client.get(f"/api/jobs/{job_id}?limit={limit}").status_code, 400)
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get("/api/jobs/missing").status_code, 404)
+
+    def test_failing_lead_does_not_fail_the_job(self):
+        def flaky(first_name, last_name, phone, email, verifier=None):
+            if first_name == "First1":
+                raise RuntimeError("provider outage")
+            return fake_verify_lead(first_name, last_name, phone, email)
+
+        with patch.object(app, "verify_lead", side_effect=flaky):
+            job_id = self.client.post("/api/verify/batch", json=[lead(n) for n in range(3)]).get_json()["job_id"]
+            job = self.wait_for_job(job_id)
+        self.assertEqual((job["status"], job["verified"], job["flagged"]), ("completed", 2, 1))
+        errors = [r["result"] for r in job["results"] if "error" in r["result"]]
+        self.assertEqual(errors, [{"error": "provider outage", "lead": lead(1)}])
+
+class TestHistoryEndpoint(AppTestCase):
+    def verify(self, count, tag):
+        for n in range(count):
+            self.client.post("/api/verify", json=lead(n, f"good{n}.{tag}@example.com"))
+
+    def test_pages_newest_first(self):
+        self.verify(5, "paging")
+        first = self.client.get("/api/history?search=paging&limit=2").get_json()
+        self.assertEqual([v["email"] for v in first["verifications"]],
+                         ["good4.paging@example.com", "good3.paging@example.com"])
+
+        rest = self.client.get(f"/api/history?search=paging&limit=10&after={first['next_cursor']}").get_json()
+        self.assertEqual([v["email"] for v in rest["verifications"]],
+                         ["good2.paging@example.com", "good1.paging@example.com", "good0.paging@example.com"])
+        self.assertIsNone(rest["next_cursor"])
+
+    def test_invalid_paging(self):
+        for query in ("limit=0", "limit=-5", "limit=ten", "after=x"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/api/history?{query}").status_code, 400)
+
+    def test_fields(self):
+        self.verify(1, "fields")
+        body = self.client.get("/api/history?search=fields&fields=first_name,status").get_json()
+        self.assertEqual(set(body["verifications"][0]), {"id", "first_name", "status"})
+
+        response = self.client.get("/api/history?fields=first_name,password")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Unknown fields: password")
+
+    def test_etag_revalidation(self):
+        self.verify(1, "etag")
+        response = self.client.get("/api/history?search=etag")
+        etag = response.headers["ETag"]
+        self.assertIsNotNone(response.last_modified)
+
+        self.assertEqual(self.client.get("/api/history?search=etag", headers={"If-None-Match": etag}).status_code, 304)
+        # The same version of a different page is a different resource
+        other = self.client.get("/api/history?search=etag&limit=1", headers={"If-None-Match": etag})
+        self.assertEqual(other.status_code, 200)
+
+        self.verify(1, "etag")
+        changed = self.client.get("/api/history?search=etag", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.get_json()["verifications"]), 2)
+
+    def test_if_modified_since_alone_is_not_trusted(self):
+        self.verify(1, "modified")
+        last_modified = self.client.get("/api/history?search=modified").headers["Last-Modified"]
+        # A change within the same second leaves Last-Modified unchanged
+        self.verify(1, "modified")
+        response = self.client.get("/api/history?search=modified", headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["verifications"]), 2)
+
+def parse_events(body):
+    """(event, id, data) for each Server-Sent Event in a response body"""
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":") and ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+class TestJobEvents(AppTestCase):
+    def finished_job(self, count):
+        job_id = self.client.post("/api/verify/batch", json=[lead(n) for n in range(count)]).get_json()["job_id"]
+        self.wait_for_job(job_id)
+        return job_id
+
+    def test_stream_ends_with_summary(self):
+        job_id = self.finished_job(3)
+        response = self.client.get(f"/api/jobs/{job_id}/events")
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = parse_events(response.get_data(as_text=True))
+
+        self.assertEqual([(event, event_id) for event, event_id, _ in events],
+                         [("result", "1"), ("result", "2"), ("result", "3"), ("summary", None)])
+        self.assertEqual(sorted(data["row"] for _, _, data in events[:3]), [0, 1, 2])
+        self.assertEqual((events[-1][2]["status"], events[-1][2]["processed"]), ("completed", 3))
+
+    def test_resume_after_last_event_id(self):
+        job_id = self.finished_job(3)
+        for query, headers in (("", {"Last-Event-ID": "2"}), ("?last_event_id=2", {})):
+            with self.subTest(query=query, headers=headers):
+                response = self.client.get(f"/api/jobs/{job_id}/events{query}", headers=headers)
+                events = parse_events(response.get_data(as_text=True))
+                self.assertEqual([(event, event_id) for event, event_id, _ in events], [("result", "3"), ("summary", None)])
+
+    def test_invalid_last_event_id(self):
+        job_id = self.finished_job(1)
+        response = self.client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get("/api/jobs/missing/events").status_code, 404)
+
+    def test_orphaned_job_ends_with_stalled(self):
+        # A job left running by a runner that went away never finishes on its own
+        job_id = app.jobs.create_job(2)
+        app.jobs.start_job(job_id)
+        with patch.object(app, "JOB_EVENTS_POLL_SECONDS", 0.01), patch.object(app, "JOB_EVENTS_MAX_IDLE_SECONDS", 0.05):
+            events = parse_events(self.client.get(f"/api/jobs/{job_id}/events").get_data(as_text=True))
+
+        self.assertEqual([event for event, _, _ in events], ["stalled"])
+        self.assertEqual((events[0][2]["status"], events[0][2]["processed"]), ("running", 0))
+
+if __name__ == '__main__':
+    unittest.main()